@@ -40,6 +40,27 @@ fileConfig(config.config_file_name)
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Objects created by raw DDL in migrations and not in Base.metadata: the FTS5
+# virtual table with its shadow tables (SQLite), and the generated tsvector
+# column with its GIN index (PostgreSQL). Autogenerate must not drop them;
+# add trigger- or DDL-backed objects here when a migration creates them.
+DATABASE_ONLY_TABLE_PREFIXES = ("properties_fts",)
+DATABASE_ONLY_COLUMNS = {("properties", "search_vector")}
+DATABASE_ONLY_INDEXES = {"ix_properties_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if not reflected or compare_to is not None:
+        return True
+    if type_ == "table":
+        return not name.startswith(DATABASE_ONLY_TABLE_PREFIXES)
+    if type_ == "column":
+        return (object.table.name, name) not in DATABASE_ONLY_COLUMNS
+    if type_ == "index":
+        return name not in DATABASE_ONLY_INDEXES
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -62,6 +83,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -84,7 +106,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
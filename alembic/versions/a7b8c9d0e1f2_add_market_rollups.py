@@ -0,0 +1,60 @@
+"""Add market_rollups histogram table for /properties/stats
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from app.models.market_rollup import rebuild_market_rollups
+
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, Sequence[str], None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if "market_rollups" not in inspect(conn).get_table_names():
+        op.create_table(
+            "market_rollups",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("city", sa.String(length=100), nullable=False),
+            sa.Column("state", sa.String(length=100), nullable=False),
+            sa.Column("property_type", sa.String(length=20), nullable=False),
+            sa.Column("listing_type", sa.String(length=20), nullable=False),
+            sa.Column("currency", sa.String(length=3), nullable=False),
+            sa.Column("metric", sa.String(length=20), nullable=False),
+            sa.Column("bucket", sa.Integer(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint(
+                "city",
+                "state",
+                "property_type",
+                "listing_type",
+                "currency",
+                "metric",
+                "bucket",
+                name="uq_market_rollups_key",
+            ),
+        )
+        op.create_index(
+            op.f("ix_market_rollups_id"), "market_rollups", ["id"], unique=False
+        )
+
+    # Backfill from existing listings
+    rebuild_market_rollups(conn)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_market_rollups_id"), table_name="market_rollups")
+    op.drop_table("market_rollups")
@@ -0,0 +1,66 @@
+"""Add saved_searches table for new-listing alerts
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, Sequence[str], None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if "saved_searches" not in inspect(conn).get_table_names():
+        op.create_table(
+            "saved_searches",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("filters", sa.JSON(), nullable=False),
+            sa.Column("city_key", sa.String(length=100), nullable=False),
+            sa.Column("property_type", sa.String(length=20), nullable=False),
+            sa.Column("price_band_low", sa.Integer(), nullable=True),
+            sa.Column("price_band_high", sa.Integer(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            op.f("ix_saved_searches_id"), "saved_searches", ["id"], unique=False
+        )
+        op.create_index(
+            op.f("ix_saved_searches_user_id"),
+            "saved_searches",
+            ["user_id"],
+            unique=False,
+        )
+        op.create_index(
+            "ix_saved_searches_match_key",
+            "saved_searches",
+            ["city_key", "property_type", "price_band_low"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_searches_match_key", table_name="saved_searches")
+    op.drop_index(op.f("ix_saved_searches_user_id"), table_name="saved_searches")
+    op.drop_index(op.f("ix_saved_searches_id"), table_name="saved_searches")
+    op.drop_table("saved_searches")
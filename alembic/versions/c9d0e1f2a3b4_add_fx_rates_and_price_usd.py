@@ -0,0 +1,97 @@
+"""Add fx_rates table and indexed properties.price_usd
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+
+    if "fx_rates" not in insp.get_table_names():
+        op.create_table(
+            "fx_rates",
+            sa.Column("currency", sa.String(length=3), nullable=False),
+            sa.Column("usd_rate", sa.Float(), nullable=False),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("currency"),
+        )
+
+    columns = [c["name"] for c in insp.get_columns("properties")]
+    if "price_usd" not in columns:
+        op.add_column("properties", sa.Column("price_usd", sa.Float(), nullable=True))
+
+    # Backfill: USD listings are already in USD; other currencies get a price
+    # once their rate is set (PUT /admin/fx-rates)
+    properties = sa.table(
+        "properties",
+        sa.column("price", sa.Float),
+        sa.column("currency", sa.String),
+        sa.column("price_usd", sa.Float),
+    )
+    conn.execute(
+        properties.update()
+        .where(
+            sa.or_(
+                properties.c.currency.is_(None),
+                sa.func.upper(properties.c.currency) == "USD",
+            )
+        )
+        .values(price_usd=properties.c.price)
+    )
+
+    indexes = [i["name"] for i in insp.get_indexes("properties")]
+    if "ix_properties_price_usd" not in indexes:
+        op.create_index("ix_properties_price_usd", "properties", ["price_usd"])
+
+    # Saved searches pinned to a currency no longer carry (USD) price bands
+    saved_searches = sa.table(
+        "saved_searches",
+        sa.column("id", sa.Integer),
+        sa.column("filters", sa.JSON),
+        sa.column("price_band_low", sa.Integer),
+        sa.column("price_band_high", sa.Integer),
+    )
+    pinned = [
+        row.id
+        for row in conn.execute(sa.select(saved_searches.c.id, saved_searches.c.filters))
+        if (row.filters or {}).get("currency")
+    ]
+    if pinned:
+        conn.execute(
+            saved_searches.update()
+            .where(saved_searches.c.id.in_(pinned))
+            .values(price_band_low=None, price_band_high=None)
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    indexes = [i["name"] for i in insp.get_indexes("properties")]
+    if "ix_properties_price_usd" in indexes:
+        op.drop_index("ix_properties_price_usd", table_name="properties")
+    columns = [c["name"] for c in insp.get_columns("properties")]
+    if "price_usd" in columns:
+        op.drop_column("properties", "price_usd")
+    if "fx_rates" in insp.get_table_names():
+        op.drop_table("fx_rates")
@@ -0,0 +1,40 @@
+"""Add property_view_counts table for buffered listing views
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if "property_view_counts" not in inspect(conn).get_table_names():
+        op.create_table(
+            "property_view_counts",
+            sa.Column("property_id", sa.Integer(), nullable=False),
+            sa.Column("view_count", sa.BigInteger(), nullable=False),
+            sa.Column("last_viewed_at", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["property_id"], ["properties.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("property_id"),
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if "property_view_counts" in inspect(conn).get_table_names():
+        op.drop_table("property_view_counts")
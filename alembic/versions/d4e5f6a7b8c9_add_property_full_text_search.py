@@ -0,0 +1,74 @@
+"""Add full-text search on property title/description
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "postgresql":
+        # Generated column: filled for existing rows now, maintained on write
+        op.execute(
+            "ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_properties_search_vector "
+            "ON properties USING GIN (search_vector)"
+        )
+    elif dialect_name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5("
+            "title, description, content='properties', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN "
+            "INSERT INTO properties_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN "
+            "INSERT INTO properties_fts(properties_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS properties_fts_au "
+            "AFTER UPDATE OF title, description ON properties BEGIN "
+            "INSERT INTO properties_fts(properties_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO properties_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        # Backfill existing rows
+        op.execute("INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    if dialect_name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_properties_search_vector")
+        op.execute("ALTER TABLE properties DROP COLUMN IF EXISTS search_vector")
+    elif dialect_name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS properties_fts_ai")
+        op.execute("DROP TABLE IF EXISTS properties_fts")
@@ -0,0 +1,64 @@
+"""Add orphaned_assets table for background Cloudinary deletes
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, Sequence[str], None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if "orphaned_assets" not in inspect(conn).get_table_names():
+        op.create_table(
+            "orphaned_assets",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("public_id", sa.String(length=500), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column(
+                "next_attempt_at",
+                sa.DateTime(timezone=True),
+                nullable=True,
+                server_default=sa.func.now(),
+            ),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("public_id"),
+        )
+        op.create_index(
+            op.f("ix_orphaned_assets_id"), "orphaned_assets", ["id"], unique=False
+        )
+        op.create_index(
+            op.f("ix_orphaned_assets_next_attempt_at"),
+            "orphaned_assets",
+            ["next_attempt_at"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if "orphaned_assets" in inspect(conn).get_table_names():
+        op.drop_index(
+            op.f("ix_orphaned_assets_next_attempt_at"), table_name="orphaned_assets"
+        )
+        op.drop_index(op.f("ix_orphaned_assets_id"), table_name="orphaned_assets")
+        op.drop_table("orphaned_assets")
@@ -0,0 +1,68 @@
+"""Add geo_cell and lat/lon indexes to properties
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from app.utils.geo import encode_cell
+
+
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, Sequence[str], None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    columns = [c["name"] for c in insp.get_columns("properties")]
+    if "geo_cell" not in columns:
+        op.add_column("properties", sa.Column("geo_cell", sa.BigInteger(), nullable=True))
+
+    # Backfill existing listings
+    properties = sa.table(
+        "properties",
+        sa.column("id", sa.Integer),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+        sa.column("geo_cell", sa.BigInteger),
+    )
+    rows = conn.execute(
+        sa.select(properties.c.id, properties.c.latitude, properties.c.longitude).where(
+            properties.c.latitude.isnot(None), properties.c.longitude.isnot(None)
+        )
+    ).all()
+    if rows:
+        conn.execute(
+            properties.update()
+            .where(properties.c.id == sa.bindparam("_id"))
+            .values(geo_cell=sa.bindparam("_cell")),
+            [{"_id": r.id, "_cell": encode_cell(r.latitude, r.longitude)} for r in rows],
+        )
+
+    indexes = [i["name"] for i in insp.get_indexes("properties")]
+    if "ix_properties_geo_cell" not in indexes:
+        op.create_index("ix_properties_geo_cell", "properties", ["geo_cell"])
+    if "ix_properties_lat_lon" not in indexes:
+        op.create_index("ix_properties_lat_lon", "properties", ["latitude", "longitude"])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = inspect(conn)
+    indexes = [i["name"] for i in insp.get_indexes("properties")]
+    if "ix_properties_lat_lon" in indexes:
+        op.drop_index("ix_properties_lat_lon", table_name="properties")
+    if "ix_properties_geo_cell" in indexes:
+        op.drop_index("ix_properties_geo_cell", table_name="properties")
+    columns = [c["name"] for c in insp.get_columns("properties")]
+    if "geo_cell" in columns:
+        op.drop_column("properties", "geo_cell")
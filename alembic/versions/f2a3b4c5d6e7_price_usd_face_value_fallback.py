@@ -0,0 +1,43 @@
+"""Give listings in currencies without an FX rate their face-value price_usd
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, Sequence[str], None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    columns = {c["name"] for c in inspect(conn).get_columns("properties")}
+    if "price_usd" not in columns:
+        return
+
+    # Listings whose currency has no rate had price_usd NULL, which dropped
+    # them from price-filtered searches; they now compare at face value
+    properties = sa.table(
+        "properties",
+        sa.column("price", sa.Float),
+        sa.column("price_usd", sa.Float),
+    )
+    op.execute(
+        properties.update()
+        .where(properties.c.price_usd.is_(None), properties.c.price.isnot(None))
+        .values(price_usd=properties.c.price)
+    )
+
+
+def downgrade() -> None:
+    # Face-value prices cannot be told apart from converted ones; keep them
+    pass
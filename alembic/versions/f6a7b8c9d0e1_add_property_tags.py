@@ -0,0 +1,63 @@
+"""Add tag dictionary and property_tags association for features/amenities
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from app.models.tag import rebuild_property_tags
+
+
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, Sequence[str], None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    tables = inspect(conn).get_table_names()
+
+    if "tags" not in tables:
+        op.create_table(
+            "tags",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("kind", sa.String(length=20), nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("kind", "name", name="uq_tags_kind_name"),
+        )
+        op.create_index(op.f("ix_tags_id"), "tags", ["id"], unique=False)
+    if "property_tags" not in tables:
+        op.create_table(
+            "property_tags",
+            sa.Column("tag_id", sa.Integer(), nullable=False),
+            sa.Column("property_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(
+                ["property_id"], ["properties.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("tag_id", "property_id"),
+        )
+        op.create_index(
+            op.f("ix_property_tags_property_id"),
+            "property_tags",
+            ["property_id"],
+            unique=False,
+        )
+
+    # Backfill from the JSON columns
+    rebuild_property_tags(conn)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_property_tags_property_id"), table_name="property_tags")
+    op.drop_table("property_tags")
+    op.drop_index(op.f("ix_tags_id"), table_name="tags")
+    op.drop_table("tags")
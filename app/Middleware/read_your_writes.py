@@ -0,0 +1,33 @@
+import time
+
+from fastapi import Request
+
+from app import database
+from app.config import settings
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Pin a client that just wrote to the primary for its next reads.
+
+    A successful unsafe request sets a short-lived cookie holding the time
+    until which ``read_session`` sends that client's reads to the primary
+    instead of a replica that may not have replayed the write yet. Only
+    active when read replicas are configured; read-only POSTs (see
+    ``database.mark_read_only``) write nothing and set no cookie.
+    """
+    response = await call_next(request)
+    if (
+        database.replicas
+        and request.method not in database.SAFE_METHODS
+        and not database.is_read_only(request)
+        and response.status_code < 400
+    ):
+        window = settings.READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            database.PRIMARY_UNTIL_COOKIE,
+            f"{time.time() + window:.3f}",
+            max_age=max(1, int(window + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -7,6 +7,24 @@ class Settings(BaseSettings):
     # Use absolute path for SQLite (default to /home/ubuntu/luxestate/luxestate.db)
     # Can be overridden with DATABASE_URL in .env
     DATABASE_URL: str = "sqlite:////home/ubuntu/luxestate/luxestate.db"
+    # PostgreSQL connections per worker process (pool size + overflow each):
+    # sync engine 15 + 5 and async engine 5 + 5 on the primary, 30 in total;
+    # every replica adds its own sync and async pools of REPLICA_POOL_* each
+    DB_POOL_SIZE: int = 15
+    DB_MAX_OVERFLOW: int = 5
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 5
+    REPLICA_POOL_SIZE: int = 5
+    REPLICA_MAX_OVERFLOW: int = 5
+    # Read replicas of DATABASE_URL, comma-separated (empty: reads use the primary)
+    DATABASE_REPLICA_URLS: str = ""
+    # Replicas further behind than this are skipped until they catch up
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    # Replica lag is re-measured this often; an unreachable one is retried later
+    REPLICA_CHECK_SECONDS: float = 5
+    REPLICA_RETRY_SECONDS: float = 30
+    # After a write, that client's reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS: float = 10
 
     # JWT
     SECRET_KEY: str = "test-secret-key"
@@ -38,6 +56,42 @@ class Settings(BaseSettings):
     STRIPE_CANCEL_URL: str = "https://example.com/cancel"
     STRIPE_WEBHOOK_SECRET: str = ""
 
+    # In-memory columnar listing index for /properties/search (per worker)
+    LISTING_INDEX_ENABLED: bool = False
+    LISTING_INDEX_MAX_AGE_SECONDS: int = 300
+    # Shared copy-on-write file behind the listing and autocomplete indexes, so
+    # workers on a host share one copy (empty: each worker loads its own)
+    LISTING_SNAPSHOT_PATH: str = ""
+    LISTING_SNAPSHOT_MAX_AGE_SECONDS: int = 300
+
+    # Feature matrix behind /properties/{id}/similar (per worker)
+    SIMILAR_LISTINGS_MAX_AGE_SECONDS: int = 300
+
+    # Prefix index behind /properties/autocomplete (per worker)
+    AUTOCOMPLETE_MAX_AGE_SECONDS: int = 300
+
+    # Full rebuild interval of the /properties/stats rollups (0 disables)
+    MARKET_STATS_REBUILD_SECONDS: int = 86400
+
+    # LRU cache of /properties/search result pages (per worker)
+    SEARCH_CACHE_ENABLED: bool = False
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: int = 30
+    # Free-text searches stop counting total hits here (reported as estimated)
+    SEARCH_COUNT_LIMIT: int = 10000
+
+    # Listing views are buffered per worker and written in batches this often
+    VIEW_COUNTS_FLUSH_SECONDS: float = 10
+    # /properties/trending: views count half as much after this long
+    TRENDING_HALF_LIFE_SECONDS: float = 6 * 3600
+    TRENDING_MAX_LISTINGS: int = 10000
+
+    # Deleted images are removed from Cloudinary in the background this often
+    ASSET_CLEANUP_SECONDS: float = 30
+    # Failed deletions back off exponentially; after this many the asset is
+    # left in orphaned_assets
+    ASSET_CLEANUP_MAX_ATTEMPTS: int = 8
+
     model_config = ConfigDict(env_file=".env")
 
 
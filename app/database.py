@@ -1,8 +1,19 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from typing import List, Optional
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
 import os
 
+logger = logging.getLogger(__name__)
+
 # Safety check: Prevent accidental production database usage in tests
 if os.getenv("TESTING") == "true" and not settings.DATABASE_URL.startswith("sqlite"):
     import warnings
@@ -34,11 +45,13 @@ else:
     connect_args = {
         "connect_timeout": 10,  # 10 second connection timeout
     }
-    # PostgreSQL connection pooling - important for performance
+    # PostgreSQL connection pooling - important for performance. The primary's
+    # per-worker budget (30 by default) is split between this sync pool and
+    # the async one below; see DB_POOL_SIZE and friends in config
     engine_kwargs = {
         "connect_args": connect_args,
-        "pool_size": 20,  # Number of connections to maintain
-        "max_overflow": 10,  # Additional connections when pool is exhausted
+        "pool_size": settings.DB_POOL_SIZE,  # Number of connections to maintain
+        "max_overflow": settings.DB_MAX_OVERFLOW,  # Extra when pool is exhausted
         "pool_pre_ping": True,  # Verify connections before using
         "pool_recycle": 3600,  # Recycle connections after 1 hour
         "pool_timeout": 30,  # Wait up to 30 seconds for connection from pool
@@ -48,3 +61,209 @@ else:
 engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def async_database_url(url: str):
+    """DATABASE_URL with an async driver: aiosqlite for SQLite, asyncpg for PostgreSQL."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend in ("postgresql", "postgres"):
+        # asyncpg takes ssl=<mode> rather than libpq's sslmode=<mode>
+        query = dict(url.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return url.set(drivername="postgresql+asyncpg", query=query)
+    return url
+
+
+# Async engine for the async routers (same database, non-blocking driver)
+if settings.DATABASE_URL.startswith("sqlite"):
+    async_engine_kwargs = {"poolclass": NullPool, "echo": False}
+else:
+    async_engine_kwargs = {
+        **engine_kwargs,
+        "pool_size": settings.DB_ASYNC_POOL_SIZE,
+        "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW,
+        "connect_args": {
+            "timeout": 10,
+            # The Supabase pooler runs in transaction mode, where server-side
+            # prepared statements cannot be reused across transactions
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL), **async_engine_kwargs
+)
+# expire_on_commit=False: attributes must not lazy-load once a request has
+# committed, since that would need I/O outside an await
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+# ---------- Read replicas ----------
+
+# Seconds of replay lag; 0 when the replica has applied everything it received
+# (an idle primary would otherwise look like growing lag)
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+# Epoch time until which a client that wrote keeps reading from the primary
+PRIMARY_UNTIL_COOKIE = "primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def _replica_pool(kwargs: dict) -> dict:
+    """``kwargs`` with the (smaller) per-replica pool sizes."""
+    if "pool_size" not in kwargs:
+        return kwargs
+    return {
+        **kwargs,
+        "pool_size": settings.REPLICA_POOL_SIZE,
+        "max_overflow": settings.REPLICA_MAX_OVERFLOW,
+    }
+
+
+class Replica:
+    """One read replica: engines, session factories and its last health check."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, **_replica_pool(engine_kwargs))
+        self.async_engine = create_async_engine(
+            async_database_url(url), **_replica_pool(async_engine_kwargs)
+        )
+        self.SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        self.AsyncSessionLocal = async_sessionmaker(
+            self.async_engine, autoflush=False, expire_on_commit=False
+        )
+        self.usable = False
+        self.checked_at: Optional[float] = None
+        self.retry_at = 0.0
+
+    def _lag_sql(self):
+        if self.engine.dialect.name == "postgresql":
+            return REPLICA_LAG_SQL
+        return text("SELECT 0")
+
+    def _due(self, now: float) -> bool:
+        if self.checked_at is None:
+            return True
+        if not self.usable and self.retry_at:
+            return now >= self.retry_at
+        return now - self.checked_at >= settings.REPLICA_CHECK_SECONDS
+
+    def _record(self, now: float, lag: Optional[float]):
+        self.checked_at = now
+        if lag is None:
+            self.usable = False
+            self.retry_at = now + settings.REPLICA_RETRY_SECONDS
+            return
+        self.retry_at = 0.0
+        self.usable = float(lag) <= settings.REPLICA_MAX_LAG_SECONDS
+        if not self.usable:
+            logger.warning("Replica %s is %.1fs behind", self.engine.url, lag)
+
+    def check(self) -> bool:
+        now = time.monotonic()
+        if self._due(now):
+            try:
+                with self.engine.connect() as conn:
+                    lag = conn.scalar(self._lag_sql())
+            except (DBAPIError, OSError) as exc:
+                logger.warning("Replica %s unreachable: %s", self.engine.url, exc)
+                lag = None
+            self._record(now, lag)
+        return self.usable
+
+    async def check_async(self) -> bool:
+        now = time.monotonic()
+        if self._due(now):
+            try:
+                async with self.async_engine.connect() as conn:
+                    lag = await conn.scalar(self._lag_sql())
+            except (DBAPIError, OSError) as exc:
+                logger.warning("Replica %s unreachable: %s", self.engine.url, exc)
+                lag = None
+            self._record(now, lag)
+        return self.usable
+
+
+class ReplicaSet:
+    """Round robin over the replicas that are up and caught up."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._turn = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def _in_turn(self) -> List[Replica]:
+        start = next(self._turn)
+        count = len(self.replicas)
+        return [self.replicas[(start + i) % count] for i in range(count)]
+
+    def pick(self) -> Optional[Replica]:
+        return next((r for r in self._in_turn() if r.check()), None)
+
+    async def pick_async(self) -> Optional[Replica]:
+        for replica in self._in_turn():
+            if await replica.check_async():
+                return replica
+        return None
+
+
+replicas = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+)
+
+
+def mark_read_only(request):
+    """Flag an unsafe-method request (a search given as a POST body) as a read."""
+    request.state.read_only = True
+
+
+def is_read_only(request) -> bool:
+    return getattr(request.state, "read_only", False)
+
+
+def wants_primary(request=None) -> bool:
+    """Whether this request (or the client's recent write) must read the primary."""
+    if request is None:
+        return False
+    if request.method not in SAFE_METHODS and not is_read_only(request):
+        return True
+    try:
+        return float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_session(request=None):
+    """
+    Session for read-only work: a healthy replica, or the primary when there
+    is none or the client has just written (read-your-writes).
+    """
+    if replicas and not wants_primary(request):
+        replica = replicas.pick()
+        if replica is not None:
+            return replica.SessionLocal()
+    return SessionLocal()
+
+
+async def async_read_session(request=None):
+    """AsyncSession counterpart of ``read_session``."""
+    if replicas and not wants_primary(request):
+        replica = await replicas.pick_async()
+        if replica is not None:
+            return replica.AsyncSessionLocal()
+    return AsyncSessionLocal()
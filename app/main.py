@@ -12,10 +12,15 @@ from starlette import status
 from app.database import Base, SessionLocal, engine
 from app.config import settings
 from app.Middleware.audit_middleware import audit_log_middleware
+from app.Middleware.read_your_writes import read_your_writes_middleware
 from app import models
 from app.limits import limiter, RateLimitExceeded, SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded as _RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
+from app.services.market_stats import rebuild_periodically
+from app.services.view_counter import flush_periodically
+from app.services.asset_cleanup import clean_up_periodically
+import asyncio
 import logging
 import os
 
@@ -38,11 +43,13 @@ from app.routers import (
     stripe_checkout,
     subscription,
     announcements,
+    saved_searches,
 )
 
 app = FastAPI()
 # Base.metadata.create_all(bind=engine)
 app.middleware("http")(audit_log_middleware)
+app.middleware("http")(read_your_writes_middleware)
 
 # CORS (permissive for development; tighten in production)
 app.add_middleware(
@@ -115,6 +122,43 @@ if settings.DATABASE_URL.startswith("sqlite") and os.getenv("TESTING") != "true"
     Base.metadata.create_all(bind=engine)
 
 
+# Periodic full rebuild of the /properties/stats rollups (kept current
+# incrementally in between); tests rebuild explicitly.
+if settings.MARKET_STATS_REBUILD_SECONDS > 0 and os.getenv("TESTING") != "true":
+
+    @app.on_event("startup")
+    async def schedule_market_stats_rebuild():
+        app.state.market_stats_rebuild = asyncio.create_task(
+            rebuild_periodically(SessionLocal, settings.MARKET_STATS_REBUILD_SECONDS)
+        )
+
+
+# Buffered listing view counts; tests flush explicitly.
+if os.getenv("TESTING") != "true":
+
+    @app.on_event("startup")
+    async def schedule_view_count_flush():
+        app.state.view_count_flush = asyncio.create_task(
+            flush_periodically(SessionLocal, settings.VIEW_COUNTS_FLUSH_SECONDS)
+        )
+
+    @app.on_event("shutdown")
+    async def flush_view_counts():
+        # Cancelling runs one last flush so buffered views are not lost
+        app.state.view_count_flush.cancel()
+        await asyncio.gather(app.state.view_count_flush, return_exceptions=True)
+
+
+# Cloudinary deletions queued by image/listing deletes; tests run it explicitly.
+if os.getenv("TESTING") != "true":
+
+    @app.on_event("startup")
+    async def schedule_asset_cleanup():
+        app.state.asset_cleanup = asyncio.create_task(
+            clean_up_periodically(SessionLocal, settings.ASSET_CLEANUP_SECONDS)
+        )
+
+
 @app.get("/healthy", status_code=status.HTTP_200_OK)
 def health_check():
     return {"status": "Healthy"}
@@ -135,6 +179,7 @@ app.include_router(admin.router)
 app.include_router(user.router)
 app.include_router(properties.router)
 app.include_router(favorites.router)
+app.include_router(saved_searches.router)
 app.include_router(images.router)
 app.include_router(websocket.router)
 app.include_router(chat.router)
@@ -1,8 +1,14 @@
 # Import all models so they're registered with Base.metadata
 from app.models.user import User
+from app.models.fx_rate import FxRate
 from app.models.property import Property
+from app.models.property_view_count import PropertyViewCount
+from app.models.tag import Tag, property_tags
+from app.models.market_rollup import MarketRollup
 from app.models.property_images import PropertyImage
+from app.models.orphaned_asset import OrphanedAsset
 from app.models.favorite import Favorite
+from app.models.saved_search import SavedSearch
 from app.models.chat import Conversation, Message
 from app.models.notification import Notification, UserPushToken
 from app.models.ticket import Ticket, TicketMessage
@@ -13,9 +19,16 @@ from app.models.audit_log import AuditLog
 
 __all__ = [
     "User",
+    "FxRate",
     "Property",
+    "PropertyViewCount",
+    "Tag",
+    "property_tags",
+    "MarketRollup",
     "PropertyImage",
+    "OrphanedAsset",
     "Favorite",
+    "SavedSearch",
     "Conversation",
     "Message",
     "Notification",
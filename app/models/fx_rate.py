@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import Column, DateTime, Float, String, select
+from sqlalchemy.sql import func
+from app.database import Base
+
+# Listing prices are normalised to this currency (Property.price_usd)
+BASE_CURRENCY = "USD"
+
+
+class FxRate(Base):
+    """USD value of one unit of ``currency``, maintained locally by admins."""
+
+    __tablename__ = "fx_rates"
+
+    currency = Column(String(3), primary_key=True)
+    usd_rate = Column(Float, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+def usd_rates(connection, currencies: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """currency -> usd_rate for ``currencies`` (all when None), USD included."""
+    query = select(FxRate.currency, FxRate.usd_rate)
+    if currencies is not None:
+        query = query.where(FxRate.currency.in_(set(currencies)))
+    rates = dict(connection.execute(query).all())
+    rates[BASE_CURRENCY] = 1.0
+    return rates
+
+
+def to_usd(
+    price: Optional[float], currency: Optional[str], rates: Dict[str, float]
+) -> Optional[float]:
+    """
+    ``price`` in USD. A currency with no rate yet is taken at face value, so
+    its listings stay in price-filtered searches until an admin sets one.
+    """
+    if price is None:
+        return None
+    return price * rates.get((currency or BASE_CURRENCY).upper(), 1.0)
+
+
+def price_field(currency: Optional[str]) -> str:
+    """
+    Column the min_price/max_price filters compare: the listing's own price
+    once a currency filter pins one currency, otherwise the USD price so
+    listings in every currency are compared on one scale.
+    """
+    return "price" if currency else "price_usd"
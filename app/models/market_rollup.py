@@ -0,0 +1,253 @@
+import math
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    UniqueConstraint,
+    delete,
+    event,
+    inspect,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from app.database import Base
+from app.models.property import Property
+
+# Price and price per square foot are bucketed on a log scale: 40 buckets per
+# power of ten, so each bucket spans ~6% and percentiles interpolate within it.
+BUCKETS_PER_DECADE = 40
+LOG_METRICS = ("price", "price_per_sqft")
+# Listing date, bucketed by day (date.toordinal); days on market is then
+# today minus the bucket, so the rollup never needs ageing.
+LISTED_METRIC = "listed_on"
+
+GROUP_COLUMNS = ("city", "state", "property_type", "listing_type", "currency")
+ROLLUP_FIELDS = (
+    *GROUP_COLUMNS,
+    "price",
+    "square_feet",
+    "created_at",
+    "is_active",
+    "status",
+)
+
+
+class MarketRollup(Base):
+    """
+    Histogram counts of on-market listings per (city, state, type, listing
+    type, currency), metric and bucket, maintained on every listing write.
+    """
+
+    __tablename__ = "market_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    city = Column(String(100), nullable=False)
+    state = Column(String(100), nullable=False)
+    property_type = Column(String(20), nullable=False)
+    listing_type = Column(String(20), nullable=False)
+    currency = Column(String(3), nullable=False)
+    metric = Column(String(20), nullable=False)
+    bucket = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            *GROUP_COLUMNS, "metric", "bucket", name="uq_market_rollups_key"
+        ),
+    )
+
+
+def value_bucket(value: float) -> int:
+    return math.floor(math.log10(value) * BUCKETS_PER_DECADE)
+
+
+def bucket_bounds(bucket: int):
+    return (
+        10 ** (bucket / BUCKETS_PER_DECADE),
+        10 ** ((bucket + 1) / BUCKETS_PER_DECADE),
+    )
+
+
+def _plain(value):
+    return getattr(value, "value", value)
+
+
+def rollup_keys(values) -> list:
+    """Rollup keys (group + metric + bucket) one listing contributes to."""
+    if not values["is_active"] or _plain(values["status"]) not in (None, "available"):
+        return []
+    group = (
+        values["city"],
+        values["state"],
+        _plain(values["property_type"]),
+        _plain(values["listing_type"]),
+        (values["currency"] or "USD").upper(),
+    )
+    keys = []
+    price, square_feet = values["price"], values["square_feet"]
+    if price and price > 0:
+        keys.append(group + ("price", value_bucket(price)))
+        if square_feet and square_feet > 0:
+            keys.append(group + ("price_per_sqft", value_bucket(price / square_feet)))
+    listed = values["created_at"] or datetime.now(timezone.utc)
+    keys.append(group + (LISTED_METRIC, listed.toordinal()))
+    return keys
+
+
+def apply_rollup_deltas(connection, deltas: Counter):
+    """Add ``deltas`` (rollup key -> +/- count) to the rollup table."""
+    rows = [
+        dict(zip((*GROUP_COLUMNS, "metric", "bucket"), key), count=n)
+        for key, n in deltas.items()
+        if n
+    ]
+    if not rows:
+        return
+    table = MarketRollup.__table__
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        module = postgresql if dialect == "postgresql" else sqlite
+        stmt = module.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[*GROUP_COLUMNS, "metric", "bucket"],
+            set_={"count": table.c.count + stmt.excluded.count},
+        )
+        connection.execute(stmt, rows)
+        return
+    for row in rows:
+        key = [table.c[c] == row[c] for c in (*GROUP_COLUMNS, "metric", "bucket")]
+        result = connection.execute(
+            update(table).where(*key).values(count=table.c.count + row["count"])
+        )
+        if not result.rowcount:
+            connection.execute(insert(table), row)
+
+
+def add_listing_rollups(connection, listings):
+    """Count new listings (mappings or objects with ROLLUP_FIELDS) in."""
+    deltas = Counter()
+    for listing in listings:
+        deltas.update(rollup_keys(_values(listing)))
+    apply_rollup_deltas(connection, deltas)
+
+
+def compute_market_rollups(connection, batch_size: int = 5000) -> Counter:
+    """Rollup counts (rollup key -> count) recomputed from the properties table."""
+    properties = Property.__table__
+    counts = Counter()
+    result = connection.execute(select(*(properties.c[f] for f in ROLLUP_FIELDS)))
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            counts.update(rollup_keys(row._mapping))
+    return counts
+
+
+def set_market_rollups(connection, counts: Counter):
+    """
+    Make the rollup table hold exactly ``counts``: absolute values are
+    upserted (never added to) and rows for keys not in ``counts`` deleted, so
+    writing the same counts twice leaves the same table.
+    """
+    table = MarketRollup.__table__
+    key_columns = (*GROUP_COLUMNS, "metric", "bucket")
+    rows = [dict(zip(key_columns, key), count=n) for key, n in counts.items() if n]
+    dialect = connection.dialect.name
+    if rows and dialect in ("postgresql", "sqlite"):
+        module = postgresql if dialect == "postgresql" else sqlite
+        stmt = module.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={"count": stmt.excluded.count},
+        )
+        connection.execute(stmt, rows)
+    elif rows:
+        for row in rows:
+            key = [table.c[c] == row[c] for c in key_columns]
+            result = connection.execute(
+                update(table).where(*key).values(count=row["count"])
+            )
+            if not result.rowcount:
+                connection.execute(insert(table), row)
+    wanted = {tuple(row[c] for c in key_columns) for row in rows}
+    stale = [
+        row.id
+        for row in connection.execute(
+            select(table.c.id, *(table.c[c] for c in key_columns))
+        )
+        if tuple(row[1:]) not in wanted
+    ]
+    for start in range(0, len(stale), 5000):
+        connection.execute(
+            delete(table).where(table.c.id.in_(stale[start : start + 5000]))
+        )
+
+
+def rebuild_market_rollups(connection, batch_size: int = 5000):
+    """
+    Recompute every rollup row from the properties table. On PostgreSQL the
+    rollup table is locked against writers first (until the transaction
+    ends), so no listing write's delta lands between the recount and the
+    swap; writes that were already in flight commit before the recount.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("LOCK TABLE market_rollups IN EXCLUSIVE MODE"))
+    set_market_rollups(connection, compute_market_rollups(connection, batch_size))
+
+
+def _values(listing) -> dict:
+    if hasattr(listing, "_mapping"):
+        return dict(listing._mapping)
+    return {f: getattr(listing, f) for f in ROLLUP_FIELDS}
+
+
+def _listed_on(connection, target):
+    # created_at is a server default, so a fresh INSERT may not have loaded it
+    created_at = inspect(target).dict.get("created_at")
+    if created_at is None and target.id is not None:
+        created_at = connection.scalar(
+            select(Property.created_at).where(Property.id == target.id)
+        )
+    return created_at
+
+
+def _current(connection, target) -> dict:
+    values = {f: getattr(target, f) for f in ROLLUP_FIELDS if f != "created_at"}
+    values["created_at"] = _listed_on(connection, target)
+    return values
+
+
+@event.listens_for(Property, "after_insert")
+def _insert_rollups(mapper, connection, target):
+    apply_rollup_deltas(connection, Counter(rollup_keys(_current(connection, target))))
+
+
+@event.listens_for(Property, "after_update")
+def _update_rollups(mapper, connection, target):
+    state = inspect(target)
+    changed = [f for f in ROLLUP_FIELDS if state.attrs[f].history.has_changes()]
+    if not changed:
+        return
+    after = _current(connection, target)
+    before = dict(after)
+    for f in changed:
+        deleted = state.attrs[f].history.deleted
+        before[f] = deleted[0] if deleted else None
+    deltas = Counter(rollup_keys(after))
+    deltas.subtract(rollup_keys(before))
+    apply_rollup_deltas(connection, deltas)
+
+
+@event.listens_for(Property, "before_delete")
+def _delete_rollups(mapper, connection, target):
+    deltas = Counter()
+    deltas.subtract(rollup_keys(_current(connection, target)))
+    apply_rollup_deltas(connection, deltas)
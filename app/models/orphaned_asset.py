@@ -0,0 +1,44 @@
+from typing import Iterable
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class OrphanedAsset(Base):
+    """
+    A Cloudinary asset whose database row is gone and which still has to be
+    deleted remotely (see asset_cleanup). Rows the cleanup gave up on keep
+    ``next_attempt_at`` NULL and stay here as a record of the orphan.
+    """
+
+    __tablename__ = "orphaned_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    public_id = Column(String(500), nullable=False, unique=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), nullable=True, index=True, server_default=func.now()
+    )
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def queue_asset_deletes(db: Session, public_ids: Iterable[str]) -> int:
+    """
+    Add ``public_ids`` to the cleanup queue in ``db``'s transaction, so they
+    are queued exactly when the rows that referenced them are deleted.
+    Returns the number of newly queued assets.
+    """
+    wanted = {public_id for public_id in public_ids if public_id}
+    if not wanted:
+        return 0
+    queued = set(
+        db.execute(
+            select(OrphanedAsset.public_id).where(OrphanedAsset.public_id.in_(wanted))
+        ).scalars()
+    )
+    new = sorted(wanted - queued)
+    db.add_all(OrphanedAsset(public_id=public_id) for public_id in new)
+    return len(new)
@@ -1,5 +1,7 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Index,
     Integer,
     String,
     Text,
@@ -10,9 +12,12 @@ from sqlalchemy import (
     JSON,
     Enum,
 )
+from sqlalchemy import DDL, event, inspect
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.fx_rate import BASE_CURRENCY, to_usd, usd_rates
+from app.utils.geo import encode_cell
 import enum
 
 
@@ -48,6 +53,9 @@ class Property(Base):
     description = Column(Text, nullable=True)
     price = Column(Float, nullable=False)
     currency = Column(String(3), default="USD")
+    # price converted at the fx_rates table (NULL while the currency has no
+    # rate), so price filters and sorting compare one scale through an index
+    price_usd = Column(Float, nullable=True, index=True)
 
     # Location
     address = Column(String(500), nullable=False)
@@ -57,6 +65,8 @@ class Property(Base):
     country = Column(String(100), default="USA")
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    # Integer geohash of (latitude, longitude), set on every write
+    geo_cell = Column(BigInteger, nullable=True, index=True)
 
     # Property Details
     property_type = Column(Enum(PropertyType), nullable=False)
@@ -92,3 +102,88 @@ class Property(Base):
         "PropertyImage", back_populates="property", cascade="all, delete-orphan"
     )
     favorites = relationship("Favorite", back_populates="property")
+
+    __table_args__ = (Index("ix_properties_lat_lon", "latitude", "longitude"),)
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_geo_cell(mapper, connection, target):
+    if target.latitude is None or target.longitude is None:
+        target.geo_cell = None
+    else:
+        target.geo_cell = encode_cell(target.latitude, target.longitude)
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_price_usd(mapper, connection, target):
+    state = inspect(target)
+    if state.has_identity and not (
+        state.attrs.price.history.has_changes()
+        or state.attrs.currency.history.has_changes()
+    ):
+        return
+    currency = (target.currency or BASE_CURRENCY).upper()
+    target.price_usd = to_usd(target.price, currency, usd_rates(connection, [currency]))
+
+
+def collapse_spaces(value: str) -> str:
+    return " ".join(value.split())
+
+
+def fold_place(value: str) -> str:
+    """
+    The form city/state/country filters are compared in: spacing collapsed
+    and lower-cased. The SQL filters match ``lower(collapse_spaces(value))``
+    against ``lower(column)``; the listing index, the search cache and saved
+    searches fold the same way.
+    """
+    return collapse_spaces(value).lower()
+
+
+# ---------- Full-text search on title/description ----------
+# SQLite (local/dev): external-content FTS5 table kept in sync by triggers.
+# PostgreSQL: generated tsvector column with a GIN index.
+# Production schemas get the same objects from the Alembic migration.
+FTS_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5("
+    "title, description, content='properties', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN "
+    "INSERT INTO properties_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS properties_fts_au "
+    "AFTER UPDATE OF title, description ON properties BEGIN "
+    "INSERT INTO properties_fts(properties_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO properties_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+FTS_POSTGRES_DDL = [
+    "ALTER TABLE properties ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_properties_search_vector "
+    "ON properties USING GIN (search_vector)",
+]
+
+for _statement in FTS_SQLITE_DDL:
+    event.listen(
+        Property.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in FTS_POSTGRES_DDL:
+    event.listen(
+        Property.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    Property.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS properties_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,76 @@
+from typing import Mapping
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from app.database import Base
+from app.models.property import Property
+
+
+class PropertyViewCount(Base):
+    """
+    Total detail-page views per listing. Kept out of ``properties`` so the
+    batched increments never rewrite (or re-index) the wide listing rows.
+    """
+
+    __tablename__ = "property_view_counts"
+
+    property_id = Column(
+        Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True
+    )
+    view_count = Column(BigInteger, nullable=False, default=0)
+    last_viewed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+def add_views(connection, counts: Mapping[int, int], viewed_at) -> int:
+    """
+    Add ``counts`` (property id -> new views) to the totals in one batched
+    upsert; views of listings deleted meanwhile are dropped. Returns the
+    number of listings updated.
+    """
+    existing = set(
+        connection.execute(
+            select(Property.id).where(Property.id.in_(list(counts)))
+        ).scalars()
+    )
+    rows = [
+        {"property_id": pid, "view_count": n, "last_viewed_at": viewed_at}
+        for pid, n in counts.items()
+        if n and pid in existing
+    ]
+    if not rows:
+        return 0
+    table = PropertyViewCount.__table__
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        module = postgresql if dialect == "postgresql" else sqlite
+        stmt = module.insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["property_id"],
+            set_={
+                "view_count": table.c.view_count + stmt.excluded.view_count,
+                "last_viewed_at": stmt.excluded.last_viewed_at,
+            },
+        )
+        connection.execute(stmt, rows)
+        return len(rows)
+    for row in rows:
+        result = connection.execute(
+            update(table)
+            .where(table.c.property_id == row["property_id"])
+            .values(
+                view_count=table.c.view_count + row["view_count"],
+                last_viewed_at=row["last_viewed_at"],
+            )
+        )
+        if not result.rowcount:
+            connection.execute(insert(table), row)
+    return len(rows)
@@ -0,0 +1,71 @@
+import math
+from typing import Mapping, Optional
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.property import fold_place
+
+# Prices are banded on a log scale, 4 bands per power of ten (~78% wide), so a
+# saved price range becomes an integer interval the match query can compare.
+PRICE_BANDS_PER_DECADE = 4
+# Stored for "any" in the inverted-index key columns, so a lookup is IN (value, '')
+ANY = ""
+
+
+class SavedSearch(Base):
+    """
+    A user's saved property search. ``filters`` holds the normalised
+    PropertySearchParams; the key columns below duplicate its most selective
+    filters so new listings are matched through an index instead of a scan.
+    """
+
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name = Column(String(100), nullable=False)
+    filters = Column(JSON, nullable=False)
+    # Inverted-index key: folded city and property type ('' = any), price bands
+    city_key = Column(String(100), nullable=False, default=ANY)
+    property_type = Column(String(20), nullable=False, default=ANY)
+    price_band_low = Column(Integer, nullable=True)
+    price_band_high = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_saved_searches_match_key",
+            "city_key",
+            "property_type",
+            "price_band_low",
+        ),
+    )
+
+
+def price_band(price: Optional[float]) -> Optional[int]:
+    if price is None or price <= 0:
+        return None
+    return math.floor(math.log10(price) * PRICE_BANDS_PER_DECADE)
+
+
+def fold_city(city: Optional[str]) -> str:
+    return fold_place(city) if city else ANY
+
+
+def match_key(filters: Mapping[str, object]) -> dict:
+    """
+    Key column values for a saved search's normalised filters. Bands are on
+    the USD price; a search pinned to one currency compares that currency's
+    prices, which have no fixed USD band, so it is matched on city and type.
+    """
+    in_usd = not filters.get("currency")
+    return {
+        "city_key": fold_city(filters.get("city")),
+        "property_type": filters.get("property_type") or ANY,
+        "price_band_low": price_band(filters.get("min_price")) if in_usd else None,
+        "price_band_high": price_band(filters.get("max_price")) if in_usd else None,
+    }
@@ -0,0 +1,156 @@
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    UniqueConstraint,
+    delete,
+    event,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from app.database import Base
+from app.models.property import Property
+
+# Property JSON columns mirrored into the tag tables
+TAG_KINDS = ("features", "amenities")
+
+
+class Tag(Base):
+    """Dictionary of feature/amenity names; ``kind`` is the Property column."""
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)
+    name = Column(String(255), nullable=False)
+
+    __table_args__ = (UniqueConstraint("kind", "name", name="uq_tags_kind_name"),)
+
+
+# (tag_id, property_id) primary key: every tag's posting list is one index range,
+# so "has pool AND garage AND gym" is an intersection of three ranges.
+property_tags = Table(
+    "property_tags",
+    Base.metadata,
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column(
+        "property_id",
+        Integer,
+        ForeignKey("properties.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+)
+
+
+def _clean(names) -> list:
+    if not isinstance(names, list):
+        return []
+    return sorted({n for n in names if isinstance(n, str) and n})
+
+
+def tag_ids(connection, pairs) -> dict:
+    """Ids for (kind, name) pairs, creating missing dictionary entries."""
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    tags = Tag.__table__
+
+    def lookup(wanted):
+        found = {}
+        for kind in {k for k, _ in wanted}:
+            names = [n for k, n in wanted if k == kind]
+            for i in range(0, len(names), 500):
+                rows = connection.execute(
+                    select(tags.c.name, tags.c.id).where(
+                        tags.c.kind == kind, tags.c.name.in_(names[i : i + 500])
+                    )
+                )
+                found.update({(kind, name): tag_id for name, tag_id in rows})
+        return found
+
+    ids = lookup(pairs)
+    missing = pairs - ids.keys()
+    if missing:
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(tags).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(tags).on_conflict_do_nothing()
+        else:
+            stmt = insert(tags)
+        connection.execute(stmt, [{"kind": k, "name": n} for k, n in sorted(missing)])
+        ids.update(lookup(missing))
+    return ids
+
+
+def sync_property_tags(connection, property_id: int, values: dict):
+    """Replace a listing's tag rows with the tags in ``values`` (kind -> names)."""
+    connection.execute(
+        delete(property_tags).where(property_tags.c.property_id == property_id)
+    )
+    pairs = [(kind, name) for kind in TAG_KINDS for name in _clean(values.get(kind))]
+    ids = tag_ids(connection, pairs)
+    if ids:
+        connection.execute(
+            insert(property_tags),
+            [{"tag_id": i, "property_id": property_id} for i in ids.values()],
+        )
+
+
+def add_property_tags(connection, listings):
+    """Insert tag rows for new listings given as (property_id, {kind: names})."""
+    per_listing = [
+        (property_id, [(k, n) for k in TAG_KINDS for n in _clean(values.get(k))])
+        for property_id, values in listings
+    ]
+    ids = tag_ids(connection, [p for _, pairs in per_listing for p in pairs])
+    links = [
+        {"tag_id": ids[p], "property_id": property_id}
+        for property_id, pairs in per_listing
+        for p in pairs
+    ]
+    if links:
+        connection.execute(insert(property_tags), links)
+
+
+def rebuild_property_tags(connection, batch_size: int = 5000):
+    """Recreate every tag row from the JSON columns (backfill / bulk loads)."""
+    connection.execute(delete(property_tags))
+    properties = Property.__table__
+    result = connection.execute(
+        select(properties.c.id, *(properties.c[k] for k in TAG_KINDS))
+    )
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        add_property_tags(connection, [(row.id, row._mapping) for row in rows])
+
+
+@event.listens_for(Property, "after_insert")
+def _insert_tags(mapper, connection, target):
+    sync_property_tags(
+        connection, target.id, {k: getattr(target, k) for k in TAG_KINDS}
+    )
+
+
+@event.listens_for(Property, "after_update")
+def _update_tags(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[k].history.has_changes() for k in TAG_KINDS):
+        sync_property_tags(
+            connection, target.id, {k: getattr(target, k) for k in TAG_KINDS}
+        )
+
+
+@event.listens_for(Property, "before_delete")
+def _delete_tags(mapper, connection, target):
+    # SQLite does not enforce the ON DELETE CASCADE without PRAGMA foreign_keys
+    connection.execute(
+        delete(property_tags).where(property_tags.c.property_id == target.id)
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from starlette import status
-from app.database import SessionLocal
+from app.database import SessionLocal, read_session
 from app.models.user import User
 from typing import Annotated, Optional, List
 from datetime import datetime, timedelta
@@ -9,6 +9,9 @@ from app.dependencies import db_dependency, require_permission, Permission
 from app.services.audit_log_service import AuditLogService
 from app.services.auth_service import get_current_user
 from app.schemas.user import UserResponse
+from app.schemas.fx_rate import FxRateResponse, FxRatesUpdate, FxRatesUpdateResult
+from app.services.fx_rates import FxRateService
+from app.services.search_cache import search_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -21,10 +24,22 @@ def get_db():
         db.close()
 
 
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 db_dependency = Annotated[Session, Depends(get_db)]
+read_db_dependency = Annotated[Session, Depends(get_read_db)]
 user_dependency = Annotated[dict, Depends(require_permission(Permission.MANAGE_USERS))]
 admin_dependency = Annotated[dict, Depends(require_permission(Permission.MANAGE_USERS))]
 current_user_dependency = Annotated[dict, Depends(get_current_user)]
+analytics_dependency = Annotated[
+    dict, Depends(require_permission(Permission.VIEW_ANALYTICS))
+]
 
 
 @router.get("/users", response_model=List[UserResponse], status_code=status.HTTP_200_OK)
@@ -142,7 +157,7 @@ async def unsuspend_user(
 # Audit Logs
 @router.get("/audit-logs", status_code=status.HTTP_200_OK)
 def get_audit_logs(
-    db: db_dependency,
+    db: read_db_dependency,
     admin: admin_dependency,
     user_id: Optional[int] = None,
     resource_type: Optional[str] = None,
@@ -169,7 +184,7 @@ def get_audit_logs(
 
 @router.get("/audit-logs/user/{user_id}", status_code=status.HTTP_200_OK)
 def get_user_audit_logs(
-    db: db_dependency,
+    db: read_db_dependency,
     admin: admin_dependency,
     user_id: int,
     days: int = 30,
@@ -182,7 +197,7 @@ def get_user_audit_logs(
     "/audit-logs/resource/{resource_type}/{resource_id}", status_code=status.HTTP_200_OK
 )
 def get_resource_audit_logs(
-    db: db_dependency,
+    db: read_db_dependency,
     admin: admin_dependency,
     resource_type: str,
     resource_id: int,
@@ -195,7 +210,7 @@ def get_resource_audit_logs(
 
 @router.get("/audit-logs/security", status_code=status.HTTP_200_OK)
 def get_security_audit_logs(
-    db: db_dependency,
+    db: read_db_dependency,
     admin: admin_dependency,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -214,9 +229,52 @@ def get_security_audit_logs(
 
 @router.get("/users/audit-logs/me", status_code=status.HTTP_200_OK)
 def get_my_audit_logs(
-    db: db_dependency,
+    db: read_db_dependency,
     user: current_user_dependency,
     days: int = 30,
 ):
     """Users can view their own audit logs (privacy/transparency)"""
     return AuditLogService().get_user_activity(db=db, user_id=user.get("id"), days=days)
+
+
+@router.get("/search-cache", status_code=status.HTTP_200_OK)
+def get_search_cache_stats(admin: analytics_dependency):
+    """Hit/miss/eviction counters of this worker's property search cache"""
+    return search_cache.stats()
+
+
+# FX rates behind Property.price_usd
+@router.get(
+    "/fx-rates", response_model=List[FxRateResponse], status_code=status.HTTP_200_OK
+)
+def get_fx_rates(db: read_db_dependency, admin: admin_dependency):
+    """USD value of one unit of each listing currency"""
+    return FxRateService(db).get_rates()
+
+
+@router.put(
+    "/fx-rates", response_model=FxRatesUpdateResult, status_code=status.HTTP_200_OK
+)
+def set_fx_rates(
+    db: db_dependency, admin: admin_dependency, body: FxRatesUpdate, http_req: Request
+):
+    """Set FX rates and reprice the listings in every changed currency"""
+    service = FxRateService(db)
+    repriced = service.set_rates(body.rates)
+    AuditLogService().create_log(
+        db=db,
+        action="fx_rates.update",
+        resource_type="fx_rate",
+        resource_id=None,
+        user_id=admin.get("id"),
+        changes={"rates": body.rates, "repriced": repriced},
+        status="success",
+        status_code=status.HTTP_200_OK,
+        request_method=http_req.method,
+        request_path=http_req.url.path,
+    )
+    return FxRatesUpdateResult(
+        rates=[FxRateResponse.model_validate(rate) for rate in service.get_rates()],
+        repriced=repriced,
+    )
+
@@ -1,5 +1,5 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.services.announcement import AnnouncementService
@@ -9,6 +9,12 @@ from app.schemas.announcement import (
     AnnouncementResponse,
 )
 from app.dependencies import require_permission, Permission
+from app.utils.conditional import (
+    is_not_modified,
+    not_modified,
+    set_validators,
+    validators,
+)
 
 router = APIRouter(prefix="/announcements", tags=["announcements"])
 
@@ -40,8 +46,13 @@ def create_announcement(
 
 
 @router.get("/", status_code=status.HTTP_200_OK, response_model=list[AnnouncementResponse])
-def get_announcements(db: db_dependency):
-    return AnnouncementService(db).get_announcements()
+def get_announcements(db: db_dependency, request: Request, response: Response):
+    service = AnnouncementService(db)
+    current = validators(service.get_announcement_versions())
+    if is_not_modified(request, current, by_date=False):
+        return not_modified(current)
+    set_validators(response, current)
+    return service.get_announcements()
 
 
 @router.put("/{announcement_id}", status_code=status.HTTP_200_OK, response_model=AnnouncementResponse)
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from typing import Annotated, List
 from app.database import SessionLocal
 from app.models.favorite import Favorite
+from app.models.orphaned_asset import queue_asset_deletes
 from app.models.property import Property
 from app.models.property_images import PropertyImage
 from app.schemas.favorite import FavoriteCreate, FavoriteResponse
@@ -108,7 +109,8 @@ async def delete_image(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Image with id {image_id} not found",
         )
-    await ImageService().delete_image(image.file_key)
+    # The Cloudinary asset is deleted in the background (asset_cleanup)
+    queue_asset_deletes(db, [image.file_key])
     db.delete(image)
     db.commit()
 
@@ -1,9 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from typing import Annotated, List, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from typing import Annotated, List, Optional, Union
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from starlette import status
-from app.database import SessionLocal
+from app.database import (
+    SessionLocal,
+    async_read_session,
+    mark_read_only,
+    read_session,
+)
 from app.models.user import User
 from app.models.property import PropertyType, PropertyStatus, ListingType
 from app.schemas.property import (
@@ -12,6 +28,16 @@ from app.schemas.property import (
     PropertyUpdate,
     PropertyResponse,
     PropertySearchParams,
+    PropertyPage,
+    SearchPage,
+    PropertyFacets,
+    MarketStats,
+    MapViewport,
+    PlaceSuggestion,
+    PropertyImportResult,
+    PropertyBatchItem,
+    PropertyBatchResponse,
+    TrendingProperty,
 )
 
 from app.dependencies import (
@@ -20,9 +46,28 @@ from app.dependencies import (
     Permission,
     require_subscription,
 )
-from app.services.property_service import PropertyService
+from app.services.property_service import (
+    VERSION_COLUMNS,
+    AsyncPropertyService,
+    PropertyService,
+)
 from app.models.subscription import SubscriptionStatus
 from app.services.audit_log_service import AuditLogService
+from app.services.autocomplete import PLACE_KINDS, place_index
+from app.services.export import ENCODERS, MEDIA_TYPES
+from app.services.fulltext import resolve_sort_by
+from app.services.listing_import import detect_format, read_listings
+from app.services.market_stats import market_stats
+from app.services.view_counter import view_counter
+from app.utils.conditional import (
+    is_conditional,
+    is_not_modified,
+    not_modified,
+    set_validators,
+    validators,
+)
+from app.utils.fieldsets import fields_query, fieldset_response, parse_fields
+from app.utils.pagination import next_cursor
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
@@ -35,13 +80,86 @@ def get_db():
         db.close()
 
 
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_only_post_db(request: Request):
+    # A read sent as POST (the body holds the query): replica, and no
+    # read-your-writes cookie
+    mark_read_only(request)
+    yield from get_read_db(request)
+
+
+async def get_async_read_db(request: Request):
+    async with await async_read_session(request) as db:
+        yield db
+
+
+async def get_async_read_only_post_db(request: Request):
+    mark_read_only(request)
+    async with await async_read_session(request) as db:
+        yield db
+
+
 db_dependency = Annotated[Session, Depends(get_db)]
+# Read-only endpoints go to a replica when one is configured and caught up
+read_db_dependency = Annotated[Session, Depends(get_read_db)]
+read_post_db_dependency = Annotated[Session, Depends(get_read_only_post_db)]
+# ...and the hot ones wait on the database without blocking the event loop
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_read_db)]
+async_read_post_db_dependency = Annotated[
+    AsyncSession, Depends(get_async_read_only_post_db)
+]
 user_dependency = Annotated[
     dict, Depends(require_permission(Permission.CREATE_PROPERTIES))
 ]
 subscription_dependency = Annotated[
     dict, Depends(require_subscription(SubscriptionStatus.PAID))
 ]
+cursor_query = Query(
+    None,
+    description="Keyset cursor: pass an empty value for the first page, "
+    "then the next_cursor of the previous response",
+)
+include_total_query = Query(
+    False,
+    description="Wrap results as {items, next_cursor, total, total_exact}; "
+    "free-text totals stop counting early and are then flagged as estimates",
+)
+
+
+def _page(properties, cursor, limit, sort_by, sort_order, fields=None, total=None):
+    """
+    Plain list for offset paging, PropertyPage once a cursor is in play and
+    SearchPage when a ``total`` HitCount was asked for. With ``fields`` (rows
+    selected by the service for that field set) the JSON is encoded directly
+    instead of going through response_model.
+    """
+    if total is not None:
+        following = None
+        if cursor is not None:
+            following = next_cursor(properties, limit, sort_by, sort_order)
+        if fields:
+            return fieldset_response(properties, fields, following, total)
+        return SearchPage(
+            items=properties,
+            next_cursor=following,
+            total=total.total,
+            total_exact=total.exact,
+        )
+    if cursor is None:
+        if fields:
+            return fieldset_response(properties, fields)
+        return properties
+    following = next_cursor(properties, limit, sort_by, sort_order)
+    if fields:
+        return fieldset_response(properties, fields, following)
+    return PropertyPage(items=properties, next_cursor=following)
 
 
 @router.post("/", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
@@ -71,17 +189,124 @@ async def create_property(
     return result
 
 
+@router.post("/import", response_model=PropertyImportResult)
+async def import_properties(
+    db: db_dependency,
+    current_user: subscription_dependency,
+    request: Request,
+    file: UploadFile = File(..., description="CSV (with header) or NDJSON listings"),
+    format: Optional[str] = Query(
+        None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"
+    ),
+):
+    """
+    Create many listings from one CSV or NDJSON upload.
+
+    Every row is validated like `POST /properties/`; valid rows are inserted
+    in batches and invalid ones (or rows past the subscription's listing
+    limit) are returned in `errors` with their row number.
+    """
+    rows = read_listings(file.file, detect_format(file.filename, format))
+    result = await PropertyService().import_properties(
+        db=db, rows=rows, agent_id=current_user.get("id")
+    )
+    AuditLogService().create_log(
+        db=db,
+        action="property.import",
+        resource_type="property",
+        resource_id=None,
+        user_id=current_user.get("id"),
+        status="success" if result.created else "failure",
+        status_code=status.HTTP_200_OK,
+        ip_address=request.headers.get("x-forwarded-for")
+        or (request.client.host if request.client else None),
+        user_agent=request.headers.get("user-agent"),
+        request_method=request.method,
+        request_path=request.url.path,
+    )
+    return result
+
+
+def search_filters(
+    city: Optional[str] = Query(None, description="Filter by city (partial match)"),
+    state: Optional[str] = Query(None, description="Filter by state (partial match)"),
+    country: Optional[str] = Query(None, description="Filter by country (partial match)"),
+    zip_code: Optional[str] = Query(None, description="Filter by exact zip code"),
+    min_price: Optional[float] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[float] = Query(None, ge=0, description="Maximum price"),
+    currency: Optional[str] = Query(None, description="Currency code (e.g., USD)"),
+    property_type: Optional[PropertyType] = Query(None, description="Type of property"),
+    status: Optional[PropertyStatus] = Query(None, description="Property status"),
+    listing_type: Optional[ListingType] = Query(None, description="Listing type (sell, rent, lease)"),
+    min_bedrooms: Optional[int] = Query(None, ge=0, description="Minimum number of bedrooms"),
+    max_bedrooms: Optional[int] = Query(None, ge=0, description="Maximum number of bedrooms"),
+    min_bathrooms: Optional[float] = Query(None, ge=0, description="Minimum number of bathrooms"),
+    max_bathrooms: Optional[float] = Query(None, ge=0, description="Maximum number of bathrooms"),
+    min_square_feet: Optional[int] = Query(None, ge=0, description="Minimum square footage"),
+    max_square_feet: Optional[int] = Query(None, ge=0, description="Maximum square footage"),
+    min_lot_size: Optional[float] = Query(None, ge=0, description="Minimum lot size"),
+    max_lot_size: Optional[float] = Query(None, ge=0, description="Maximum lot size"),
+    min_year_built: Optional[int] = Query(None, description="Minimum year built"),
+    max_year_built: Optional[int] = Query(None, description="Maximum year built"),
+    features: Optional[List[str]] = Query(None, description="Required features (e.g., pool, garage)"),
+    amenities: Optional[List[str]] = Query(None, description="Required amenities (e.g., gym, concierge)"),
+    search_query: Optional[str] = Query(None, description="Search in title and description"),
+    is_featured: Optional[bool] = Query(None, description="Filter featured properties"),
+    is_active: Optional[bool] = Query(None, description="Filter active properties"),
+) -> PropertySearchParams:
+    """The filter part of the /search query string, for endpoints that only filter."""
+    return PropertySearchParams.model_construct(
+        city=city,
+        state=state,
+        country=country,
+        zip_code=zip_code,
+        min_price=min_price,
+        max_price=max_price,
+        currency=currency,
+        property_type=property_type,
+        status=status,
+        listing_type=listing_type,
+        min_bedrooms=min_bedrooms,
+        max_bedrooms=max_bedrooms,
+        min_bathrooms=min_bathrooms,
+        max_bathrooms=max_bathrooms,
+        min_square_feet=min_square_feet,
+        max_square_feet=max_square_feet,
+        min_lot_size=min_lot_size,
+        max_lot_size=max_lot_size,
+        min_year_built=min_year_built,
+        max_year_built=max_year_built,
+        features=features,
+        amenities=amenities,
+        search_query=search_query,
+        is_featured=is_featured,
+        is_active=is_active,
+    )
+
+
 @router.get("/", status_code=status.HTTP_200_OK)
-async def get_properties(db: db_dependency):
-    return await PropertyService().get_properties(db)
+async def get_properties(
+    db: async_db_dependency,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of records to return"
+    ),
+    cursor: Optional[str] = cursor_query,
+):
+    properties = await AsyncPropertyService().get_properties(
+        db, skip=skip, limit=limit, cursor=cursor
+    )
+    return _page(properties, cursor, limit, "id", "asc")
 
 
 # ==================== SEARCH ENDPOINTS ====================
 
 
-@router.get("/search", response_model=List[PropertyResponse])
+@router.get(
+    "/search", response_model=Union[List[PropertyResponse], SearchPage, PropertyPage]
+)
 async def search_properties(
-    db: db_dependency,
+    db: async_db_dependency,
     # Location filters
     city: Optional[str] = Query(None, description="Filter by city (partial match)"),
     state: Optional[str] = Query(None, description="Filter by state (partial match)"),
@@ -131,12 +356,15 @@ async def search_properties(
         100, ge=1, le=1000, description="Maximum number of records to return"
     ),
     # Sorting
-    sort_by: str = Query(
-        "created_at",
-        pattern="^(created_at|updated_at|price|title|bedrooms|bathrooms|square_feet)$",
-        description="Field to sort by",
+    sort_by: Optional[str] = Query(
+        None,
+        pattern="^(relevance|created_at|updated_at|price|title|bedrooms|bathrooms|square_feet)$",
+        description="Field to sort by (default: relevance with search_query, else created_at)",
     ),
     sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order"),
+    cursor: Optional[str] = cursor_query,
+    fields: Optional[str] = fields_query,
+    include_total: bool = include_total_query,
 ):
     """
     Comprehensive property search with multiple filter options.
@@ -146,12 +374,16 @@ async def search_properties(
     - Price range and currency
     - Property details (type, bedrooms, bathrooms, square footage, etc.)
     - Features and amenities
-    - Text search in title and description
+    - Full-text search in title and description (ranked by relevance)
     - Special filters (featured, active status)
 
     All filters are optional and can be combined for precise searches.
+    Pass `cursor` to switch to keyset pagination (`{items, next_cursor}`),
+    `fields` to return (and load) only some columns of each listing and
+    `include_total` to add the number of matching listings.
     """
-    return await PropertyService().search_properties(
+    fields = parse_fields(fields)
+    result = await AsyncPropertyService().search_properties(
         db=db,
         city=city,
         state=state,
@@ -182,12 +414,30 @@ async def search_properties(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        fields=fields,
+        include_total=include_total,
+    )
+    properties, total = result if include_total else (result, None)
+    return _page(
+        properties,
+        cursor,
+        limit,
+        resolve_sort_by(sort_by, search_query),
+        sort_order,
+        fields,
+        total,
     )
 
 
-@router.post("/search", response_model=List[PropertyResponse])
+@router.post(
+    "/search", response_model=Union[List[PropertyResponse], SearchPage, PropertyPage]
+)
 async def search_properties_with_body(
-    db: db_dependency, search_params: PropertySearchParams
+    db: async_read_post_db_dependency,
+    search_params: PropertySearchParams,
+    fields: Optional[str] = fields_query,
+    include_total: bool = include_total_query,
 ):
     """
     Search properties using a request body with search parameters.
@@ -195,14 +445,98 @@ async def search_properties_with_body(
     This endpoint accepts a JSON body with all search parameters,
     which is useful for complex searches or when you have many parameters.
     """
-    return await PropertyService().search_properties_with_params(
-        db=db, search_params=search_params
+    fields = parse_fields(fields)
+    result = await AsyncPropertyService().search_properties_with_params(
+        db=db, search_params=search_params, fields=fields, include_total=include_total
+    )
+    properties, total = result if include_total else (result, None)
+    return _page(
+        properties,
+        search_params.cursor,
+        search_params.limit,
+        resolve_sort_by(search_params.sort_by, search_params.search_query),
+        search_params.sort_order,
+        fields,
+        total,
+    )
+
+
+@router.get("/search/facets", response_model=PropertyFacets)
+async def get_search_facets(
+    db: read_db_dependency,
+    search_params: Annotated[PropertySearchParams, Depends(search_filters)],
+    top_tags: int = Query(10, ge=1, le=100, description="Features/amenities to return"),
+):
+    """
+    Counts per property type, listing type, status, bedroom bucket, price
+    bucket and the most common features/amenities for a search.
+
+    Accepts the same filters as `/properties/search`; paging and sorting
+    parameters are ignored.
+    """
+    return await PropertyService().get_search_facets(db, search_params, top_tags)
+
+
+@router.post("/search/facets", response_model=PropertyFacets)
+async def get_search_facets_with_body(
+    db: read_post_db_dependency,
+    search_params: PropertySearchParams,
+    top_tags: int = Query(10, ge=1, le=100, description="Features/amenities to return"),
+):
+    """Facet counts for a search given as a JSON body."""
+    return await PropertyService().get_search_facets(db, search_params, top_tags)
+
+
+export_format_query = Query(
+    "ndjson", pattern="^(ndjson|csv)$", description="ndjson (one JSON object per line) or csv"
+)
+
+
+def _export(db: Session, search_params: PropertySearchParams, format: str):
+    batches = PropertyService().stream_search(db, search_params)
+    return StreamingResponse(
+        ENCODERS[format](batches),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="properties.{format}"'},
+    )
+
+
+@router.get("/export")
+def export_properties(
+    db: read_db_dependency,
+    search_params: Annotated[PropertySearchParams, Depends(search_filters)],
+    format: str = export_format_query,
+    sort_by: Optional[str] = Query(
+        None,
+        pattern="^(relevance|created_at|updated_at|price|title|bedrooms|bathrooms|square_feet)$",
+        description="Field to sort by (default: relevance with search_query, else created_at)",
+    ),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order"),
+):
+    """
+    Stream every listing matching the `/properties/search` filters as NDJSON
+    or CSV. There is no paging: rows are read through a server-side cursor
+    and written as they arrive, so any result size can be exported.
+    """
+    search_params = search_params.model_copy(
+        update={"sort_by": sort_by, "sort_order": sort_order}
     )
+    return _export(db, search_params, format)
+
+
+@router.post("/export")
+def export_properties_with_body(
+    db: read_post_db_dependency,
+    search_params: PropertySearchParams,
+    format: str = export_format_query,
+):
+    """Stream a search given as a JSON body; skip, limit and cursor are ignored."""
+    return _export(db, search_params, format)
 
 
 @router.get("/search/location", response_model=List[PropertyLocationResponse])
 async def search_properties_by_location(
-    db: db_dependency,
+    db: read_db_dependency,
     latitude: float = Query(..., description="Latitude coordinate"),
     longitude: float = Query(..., description="Longitude coordinate"),
     radius_km: float = Query(
@@ -223,43 +557,223 @@ async def search_properties_by_location(
     )
 
 
+@router.get("/autocomplete", response_model=List[PlaceSuggestion])
+async def autocomplete_places(
+    db: read_db_dependency,
+    prefix: str = Query(..., min_length=1, max_length=100, description="Typed text"),
+    kind: Optional[str] = Query(
+        None,
+        pattern=f"^({'|'.join(PLACE_KINDS)})$",
+        description="Only suggest this kind of value",
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions"),
+):
+    """
+    Cities, states, countries and zip codes starting with ``prefix``, ranked
+    by their number of active listings; served from memory.
+    """
+    place_index.ensure_fresh(db)
+    return place_index.suggest(prefix, limit=limit, kind=kind)
+
+
+@router.get("/map", response_model=MapViewport)
+async def get_map_markers(
+    db: read_db_dependency,
+    search_params: Annotated[PropertySearchParams, Depends(search_filters)],
+    min_lat: float = Query(..., ge=-90, le=90, description="South edge of the viewport"),
+    max_lat: float = Query(..., ge=-90, le=90, description="North edge of the viewport"),
+    min_lon: float = Query(..., ge=-180, le=180, description="West edge of the viewport"),
+    max_lon: float = Query(
+        ...,
+        ge=-180,
+        le=180,
+        description="East edge of the viewport (less than min_lon across the antimeridian)",
+    ),
+    zoom: int = Query(..., ge=0, le=22, description="Web map zoom level"),
+):
+    """
+    Markers for a map viewport: clustered (count, centroid and price range
+    per grid cell) when zoomed out or dense, individual listings otherwise.
+    Accepts the /search filters.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not be greater than max_lat",
+        )
+    return await PropertyService().get_map_markers(
+        db, min_lat, max_lat, min_lon, max_lon, zoom, search_params
+    )
+
+
+@router.get("/stats", response_model=MarketStats)
+async def get_market_stats(
+    db: read_db_dependency,
+    city: Optional[str] = Query(None, description="City (case-insensitive)"),
+    state: Optional[str] = Query(None, description="State (case-insensitive)"),
+    property_type: Optional[PropertyType] = Query(None, description="Type of property"),
+    listing_type: Optional[ListingType] = Query(None, description="Listing type (sell, rent, lease)"),
+    currency: str = Query("USD", min_length=3, max_length=3, description="Price currency"),
+):
+    """
+    Price, price per square foot and days-on-market percentiles and
+    histograms for active, available listings, from precomputed rollups.
+    """
+    return market_stats(
+        db,
+        city=city,
+        state=state,
+        property_type=property_type,
+        listing_type=listing_type,
+        currency=currency,
+    )
+
+
 @router.get("/featured", response_model=List[PropertyResponse])
 async def get_featured_properties(
-    db: db_dependency,
+    db: async_db_dependency,
+    request: Request,
+    response: Response,
     limit: int = Query(
         10, ge=1, le=50, description="Maximum number of featured properties to return"
     ),
+    fields: Optional[str] = fields_query,
 ):
     """
     Get featured properties for homepage display.
 
     Returns properties that are marked as featured, active, and available.
+    Supports If-None-Match: the ETag covers the ids and versions on the page.
+    """
+    fields = parse_fields(fields)
+    service = AsyncPropertyService()
+    current = validators(await service.get_featured_versions(db, limit), fields)
+    if is_not_modified(request, current, by_date=False):
+        return not_modified(current)
+    properties = await service.get_featured_properties(
+        db=db, limit=limit, fields=fields
+    )
+    page = _page(properties, None, limit, "created_at", "desc", fields)
+    set_validators(page if isinstance(page, Response) else response, current)
+    return page
+
+
+@router.get("/trending", response_model=List[TrendingProperty])
+async def get_trending_properties(
+    db: async_db_dependency,
+    limit: int = Query(10, ge=1, le=50, description="Number of listings to return"),
+):
+    """
+    Listings viewed most lately: views decay with a half-life of
+    TRENDING_HALF_LIFE_SECONDS. Ranked in memory from this worker's views.
     """
-    return await PropertyService().get_featured_properties(db=db, limit=limit)
+    return await AsyncPropertyService().get_trending_properties(db, limit)
 
 
-@router.get("/agent/{agent_id}", response_model=List[PropertyResponse])
+@router.get(
+    "/agent/{agent_id}", response_model=Union[List[PropertyResponse], PropertyPage]
+)
 async def get_properties_by_agent(
-    db: db_dependency,
+    db: async_db_dependency,
     agent_id: int,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(
         100, ge=1, le=1000, description="Maximum number of records to return"
     ),
+    cursor: Optional[str] = cursor_query,
+    fields: Optional[str] = fields_query,
 ):
     """
     Get all properties for a specific agent.
 
     Returns all properties created by the specified agent, ordered by creation date.
     """
-    return await PropertyService().get_properties_by_agent(
-        db=db, agent_id=agent_id, skip=skip, limit=limit
+    fields = parse_fields(fields)
+    properties = await AsyncPropertyService().get_properties_by_agent(
+        db=db, agent_id=agent_id, skip=skip, limit=limit, cursor=cursor, fields=fields
+    )
+    return _page(properties, cursor, limit, "created_at", "desc", fields)
+
+
+BATCH_MAX_IDS = 300
+
+
+@router.get("/batch", response_model=PropertyBatchResponse)
+async def get_properties_batch(
+    db: async_db_dependency,
+    ids: List[str] = Query(
+        ..., description=f"Property ids, comma-separated or repeated (max {BATCH_MAX_IDS})"
+    ),
+):
+    """
+    Fetch several properties with their images at once. Items follow the
+    order of `ids`; unknown ids come back with `found: false` instead of a 404.
+    """
+    try:
+        property_ids = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be integers",
+        )
+    if not property_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="No ids given"
+        )
+    if len(property_ids) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_IDS} ids per request",
+        )
+
+    found = await AsyncPropertyService().get_properties_batch(db, property_ids)
+    return PropertyBatchResponse(
+        items=[
+            PropertyBatchItem(id=pid, found=prop is not None, property=prop)
+            for pid, prop in found
+        ]
     )
 
 
 @router.get("/{property_id}", status_code=status.HTTP_200_OK)
-async def get_property(db: db_dependency, property_id: int):
-    return await PropertyService().get_property(db, property_id)
+async def get_property(
+    db: async_db_dependency, property_id: int, request: Request, response: Response
+):
+    """
+    One listing. Conditional requests (If-None-Match / If-Modified-Since) are
+    answered from the row's timestamps alone, without loading it; other
+    requests load the row once. Full responses count as a view (buffered in
+    memory, written in batches).
+    """
+    service = AsyncPropertyService()
+    if is_conditional(request):
+        current = validators([await service.get_property_version(db, property_id)])
+        if is_not_modified(request, current):
+            return not_modified(current)
+    property = await service.get_property(db, property_id)
+    view_counter.record(property_id)
+    # Versioned from the row actually returned, in case it changed meanwhile
+    version = tuple(getattr(property, c.key) for c in VERSION_COLUMNS)
+    set_validators(response, validators([version]))
+    return property
+
+
+@router.get("/{property_id}/similar", response_model=List[PropertyResponse])
+async def get_similar_properties(
+    db: async_db_dependency,
+    property_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Number of listings to return"),
+    fields: Optional[str] = fields_query,
+):
+    """
+    Active listings most like this one (price, size, rooms, age, location,
+    type and tags), nearest first.
+    """
+    fields = parse_fields(fields)
+    properties = await AsyncPropertyService().get_similar_properties(
+        db, property_id, limit=limit, fields=fields
+    )
+    return fieldset_response(properties, fields)
 
 
 @router.patch("/{property_id}", status_code=status.HTTP_200_OK)
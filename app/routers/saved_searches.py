@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import Annotated, List
+from app.database import SessionLocal
+from app.schemas.saved_search import (
+    SavedSearchCreate,
+    SavedSearchUpdate,
+    SavedSearchResponse,
+)
+from app.services.auth_service import get_current_user
+from app.services.saved_searches import SavedSearchService
+
+router = APIRouter(prefix="/saved-searches", tags=["saved-searches"])
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+db_dependency = Annotated[Session, Depends(get_db)]
+user_dependency = Annotated[dict, Depends(get_current_user)]
+
+
+@router.post(
+    "/", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED
+)
+def create_saved_search(
+    data: SavedSearchCreate, db: db_dependency, current_user: user_dependency
+):
+    """Save a search; new listings matching it are sent as notifications."""
+    return SavedSearchService(db).create_saved_search(data, current_user["id"])
+
+
+@router.get("/", response_model=List[SavedSearchResponse])
+def list_saved_searches(db: db_dependency, current_user: user_dependency):
+    return SavedSearchService(db).get_saved_searches(current_user["id"])
+
+
+@router.get("/{search_id}", response_model=SavedSearchResponse)
+def get_saved_search(search_id: int, db: db_dependency, current_user: user_dependency):
+    return SavedSearchService(db).get_saved_search(search_id, current_user["id"])
+
+
+@router.patch("/{search_id}", response_model=SavedSearchResponse)
+def update_saved_search(
+    search_id: int,
+    data: SavedSearchUpdate,
+    db: db_dependency,
+    current_user: user_dependency,
+):
+    return SavedSearchService(db).update_saved_search(
+        search_id, data, current_user["id"]
+    )
+
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    search_id: int, db: db_dependency, current_user: user_dependency
+):
+    SavedSearchService(db).delete_saved_search(search_id, current_user["id"])
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.models.fx_rate import BASE_CURRENCY
+
+
+class FxRatesUpdate(BaseModel):
+    # currency code -> USD value of one unit, e.g. {"NGN": 0.00065}
+    rates: Dict[str, float] = Field(..., min_length=1)
+
+    @field_validator("rates")
+    @classmethod
+    def _check_rates(cls, rates: Dict[str, float]) -> Dict[str, float]:
+        checked = {}
+        for currency, rate in rates.items():
+            code = currency.strip().upper()
+            if len(code) != 3 or not code.isalpha():
+                raise ValueError(f"Invalid currency code: {currency!r}")
+            if not rate > 0:
+                raise ValueError(f"Rate for {code} must be positive")
+            if code == BASE_CURRENCY and rate != 1:
+                raise ValueError(f"{BASE_CURRENCY} is the base currency; its rate is 1")
+            checked[code] = rate
+        return checked
+
+
+class FxRateResponse(BaseModel):
+    currency: str
+    usd_rate: float
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FxRatesUpdateResult(BaseModel):
+    rates: list[FxRateResponse]
+    # Listings whose price_usd was recomputed
+    repriced: int
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, ConfigDict
+from typing import Optional
 from datetime import datetime
 
 
@@ -18,7 +19,7 @@ class ImageResponse(BaseModel):
     created_at: datetime
     is_primary: bool
     order_index: int
-    alt_text: str
-    file_url: str
+    alt_text: Optional[str] = None
+    file_url: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
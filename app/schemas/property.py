@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.models.property import PropertyType, PropertyStatus, ListingType
+from app.schemas.image import ImageResponse
 
 
 class PropertySearchParams(BaseModel):
@@ -48,11 +49,14 @@ class PropertySearchParams(BaseModel):
     # Pagination
     skip: int = Field(0, ge=0)
     limit: int = Field(100, ge=1, le=1000)
+    # Keyset pagination: "" for the first page, then the returned next_cursor
+    cursor: Optional[str] = None
 
     # Sorting
-    sort_by: str = Field(
-        "created_at",
-        pattern="^(created_at|updated_at|price|title|bedrooms|bathrooms|square_feet)$",
+    # Defaults to relevance when search_query is set, created_at otherwise
+    sort_by: Optional[str] = Field(
+        None,
+        pattern="^(relevance|created_at|updated_at|price|title|bedrooms|bathrooms|square_feet)$",
     )
     sort_order: str = Field("desc", pattern="^(asc|desc)$")
 
@@ -121,9 +125,89 @@ class PropertyResponse(PropertyBase):
     updated_at: Optional[datetime] = None
     listing_type: ListingType
     overview_image: Optional[str] = None
+    # price at the stored FX rates; null while the currency has no rate
+    price_usd: Optional[float] = None
     model_config = ConfigDict(from_attributes=True)
 
 
+class PropertyWithImages(PropertyResponse):
+    images: List[ImageResponse] = []
+
+
+class TrendingProperty(PropertyResponse):
+    # All-time detail views, including this worker's not yet flushed ones
+    views: int
+    # Recent views, each decayed by its age (TRENDING_HALF_LIFE_SECONDS)
+    trending_score: float
+
+
+class PropertyBatchItem(BaseModel):
+    """One requested id; ``property`` is null when ``found`` is false."""
+
+    id: int
+    found: bool
+    property: Optional[PropertyWithImages] = None
+
+
+class PropertyBatchResponse(BaseModel):
+    items: List[PropertyBatchItem]
+
+
+class PropertyPage(BaseModel):
+    """Cursor-paginated list of properties."""
+
+    items: List[PropertyResponse]
+    next_cursor: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchPage(PropertyPage):
+    """A search page with the total hit count (``include_total=true``)."""
+
+    total: int
+    total_exact: bool = Field(
+        ..., description="False when counting stopped early and total is a lower bound"
+    )
+
+
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
+
+class PriceBucket(BaseModel):
+    min_price: float
+    max_price: Optional[float] = None  # open-ended top bucket
+    count: int
+
+
+class PropertyFacets(BaseModel):
+    """Counts per facet for the listings matching a search."""
+
+    total: int
+    property_type: Dict[str, int]
+    listing_type: Dict[str, int]
+    status: Dict[str, int]
+    bedrooms: Dict[str, int]
+    price: List[PriceBucket]
+    features: List[FacetBucket]
+    amenities: List[FacetBucket]
+
+
+class PropertyImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class PropertyImportResult(BaseModel):
+    """Outcome of a bulk import; rows are numbered from 1 (CSV header excluded)."""
+
+    created: int
+    failed: int
+    property_ids: List[int]
+    errors: List[PropertyImportError]
+
+
 class PropertyLocationResponse(BaseModel):
     id: int
     title: str
@@ -154,3 +238,73 @@ class PropertyLocationResponse(BaseModel):
     distance: float  # ✅ include computed field
     listing_type: ListingType
     model_config = ConfigDict(from_attributes=True)
+
+
+class HistogramBin(BaseModel):
+    """``lower`` <= value < ``upper``; an open upper bound is None."""
+
+    lower: float
+    upper: Optional[float] = None
+    count: int
+
+
+class MetricStats(BaseModel):
+    count: int
+    percentiles: Dict[str, float]
+    histogram: List[HistogramBin]
+
+
+class MarketStats(BaseModel):
+    """Distributions over on-market (active, available) listings."""
+
+    count: int
+    currency: str
+    price: Optional[MetricStats] = None
+    price_per_sqft: Optional[MetricStats] = None
+    days_on_market: Optional[MetricStats] = None
+
+
+class MapCluster(BaseModel):
+    """
+    Listings in one grid cell of the viewport. Prices are in USD, or in the
+    filtered currency when the request sets one.
+    """
+
+    cell: int
+    count: int
+    latitude: float
+    longitude: float
+    min_price: float
+    max_price: float
+
+
+class MapListing(BaseModel):
+    id: int
+    title: str
+    price: float
+    currency: Optional[str] = None
+    latitude: float
+    longitude: float
+    property_type: PropertyType
+    listing_type: ListingType
+    overview_image: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MapViewport(BaseModel):
+    """
+    Markers for a map viewport: ``clusters`` when zoomed out or dense,
+    otherwise every matching listing in ``listings``.
+    """
+
+    zoom: int
+    level: int
+    total: int
+    clusters: List[MapCluster] = []
+    listings: List[MapListing] = []
+
+
+class PlaceSuggestion(BaseModel):
+    kind: str = Field(..., description="city, state, country or zip_code")
+    value: str
+    count: int = Field(..., description="Active listings with this value")
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.schemas.property import PropertySearchParams
+
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    # Pagination and sorting fields are ignored; only the filters are kept
+    filters: PropertySearchParams
+
+
+class SavedSearchUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    filters: Optional[PropertySearchParams] = None
+
+
+class SavedSearchResponse(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    filters: Dict[str, Any]
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
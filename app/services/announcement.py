@@ -39,13 +39,22 @@ class AnnouncementService:
         )
         return new_announcement
 
-    def get_announcements(self):
+    def _current(self, *columns):
         return (
-            self.db.query(Announcement)
+            self.db.query(*columns)
             .filter(Announcement.expires_at > datetime.now())
-            .all()
+            .order_by(Announcement.id)
         )
 
+    def get_announcements(self):
+        return self._current(Announcement).all()
+
+    def get_announcement_versions(self):
+        """(id, updated_at, created_at) of the current announcements, for ETags."""
+        return self._current(
+            Announcement.id, Announcement.updated_at, Announcement.created_at
+        ).all()
+
     def update_announcement(
         self,
         announcement_id: int,
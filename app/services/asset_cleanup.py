@@ -0,0 +1,104 @@
+"""
+Background deletion of Cloudinary assets.
+
+Deleting an image or a listing only queues the assets' public_ids in
+orphaned_assets, in the same transaction as the row deletion, so the request
+never waits on Cloudinary. ``clean_up_assets`` runs every
+ASSET_CLEANUP_SECONDS and deletes the due assets in batches of BATCH_SIZE
+(the Admin API's limit per call). An asset that fails is retried after
+RETRY_BASE_SECONDS, doubling per attempt up to RETRY_MAX_SECONDS. After
+ASSET_CLEANUP_MAX_ATTEMPTS it is kept in the table with no next attempt.
+
+Due rows are claimed with FOR UPDATE SKIP LOCKED (where the database has it),
+so several workers can run the cleanup without sending the same batch twice.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.orphaned_asset import OrphanedAsset
+from app.services.image_service import ImageService
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 3600
+# Outcomes that leave nothing to delete
+DONE = ("deleted", "not_found")
+
+
+def retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _failed(asset: OrphanedAsset, error: str, now: datetime):
+    asset.attempts += 1
+    asset.last_error = error[:1000]
+    if asset.attempts >= settings.ASSET_CLEANUP_MAX_ATTEMPTS:
+        asset.next_attempt_at = None
+        logger.warning(
+            "Giving up on Cloudinary asset %s after %d attempts: %s",
+            asset.public_id,
+            asset.attempts,
+            error,
+        )
+    else:
+        asset.next_attempt_at = now + timedelta(seconds=retry_delay(asset.attempts))
+
+
+def clean_up_assets(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete every due asset, a batch per API call; returns how many went."""
+    now = now or datetime.now(timezone.utc)
+    service = ImageService()
+    deleted = 0
+    while True:
+        batch = (
+            db.execute(
+                select(OrphanedAsset)
+                .where(OrphanedAsset.next_attempt_at <= now)
+                .order_by(OrphanedAsset.id)
+                .limit(BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        if not batch:
+            return deleted
+        try:
+            outcome = service.delete_images([asset.public_id for asset in batch])
+        except Exception as exc:
+            logger.warning("Cloudinary batch delete failed: %s", exc)
+            outcome = {}
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            error = "no result"
+        for asset in batch:
+            result = outcome.get(asset.public_id)
+            if result in DONE:
+                db.delete(asset)
+                deleted += 1
+            else:
+                _failed(asset, result or error, now)
+        db.commit()
+
+
+async def clean_up_periodically(session_factory, interval_seconds: float):
+    """Run ``clean_up_assets`` every ``interval_seconds``."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        session = session_factory()
+        try:
+            await asyncio.to_thread(clean_up_assets, session)
+        except Exception:
+            logger.exception("Cloudinary asset cleanup failed")
+            session.rollback()
+        finally:
+            session.close()
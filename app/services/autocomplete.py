@@ -0,0 +1,190 @@
+"""
+In-memory prefix index behind /properties/autocomplete.
+
+Distinct city, state, country and zip code values of active listings are kept
+in one array sorted by their case-folded text, with a parallel NumPy array of
+active-listing counts. A prefix is a bisect range of that array, and the best
+suggestions are an argpartition over the counts in the range, so typing
+never reaches the database.
+
+The index is per process. PropertyService applies each write as a before/after
+pair of listing snapshots, and the index is rebuilt once it is older than
+AUTOCOMPLETE_MAX_AGE_SECONDS so writes from other workers are picked up.
+With LISTING_SNAPSHOT_PATH set it is loaded from the shared listing snapshot
+instead, so a worker never queries for it (see listing_snapshot).
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.property import Property
+from app.services.listing_snapshot import listing_snapshots
+
+PLACE_KINDS = ("city", "state", "country", "zip_code")
+
+Row = Mapping[str, object]
+
+
+def _clean(value: Optional[str]) -> str:
+    return " ".join(value.split()) if value else ""
+
+
+def _places(row: Optional[Row]):
+    """(kind, value) pairs an active listing contributes."""
+    if row is None or not row["is_active"]:
+        return []
+    return [(kind, _clean(row[kind])) for kind in PLACE_KINDS if _clean(row[kind])]
+
+
+class PlaceIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._snapshot = None
+        self._reset()
+
+    def _reset(self):
+        # Parallel arrays ordered by (folded value, kind)
+        self._keys: List[tuple] = []
+        self._folded: List[str] = []
+        self._values: List[str] = []
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    # ---------- Maintenance ----------
+
+    @property
+    def is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        age = time.monotonic() - self._built_at
+        return age > settings.AUTOCOMPLETE_MAX_AGE_SECONDS
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._counts))
+
+    def _load_from(self, db: Session):
+        totals: Dict[tuple, int] = {}
+        spelling: Dict[tuple, str] = {}
+        for kind in PLACE_KINDS:
+            column = getattr(Property, kind)
+            rows = db.execute(
+                select(column, func.count())
+                .where(Property.is_active == True, column.isnot(None))
+                .group_by(column)
+            )
+            for value, count in rows:
+                value = _clean(value)
+                if value:
+                    key = (value.casefold(), kind)
+                    totals[key] = totals.get(key, 0) + count
+                    spelling.setdefault(key, value)
+
+        keys = sorted(totals)
+        with self._lock:
+            self._keys = keys
+            self._folded = [folded for folded, _ in keys]
+            self._values = [spelling[key] for key in keys]
+            self._counts = np.array([totals[key] for key in keys], dtype=np.int64)
+            self._built_at = time.monotonic()
+
+    def rebuild(self, db: Session):
+        """Reload the distinct values and their counts from the database."""
+        if listing_snapshots.enabled:
+            self._attach_snapshot(listing_snapshots.rebuild(db))
+        else:
+            self._load_from(db)
+
+    def ensure_fresh(self, db: Session):
+        if listing_snapshots.enabled:
+            snapshot = listing_snapshots.current(db)
+            if snapshot is not self._snapshot:
+                self._attach_snapshot(snapshot)
+        elif self.is_stale:
+            self.rebuild(db)
+
+    # ---------- Shared snapshot section ----------
+
+    def export(self, db: Session) -> Tuple[Dict[str, np.ndarray], dict]:
+        index = PlaceIndex()
+        index._load_from(db)
+        meta = {"keys": index._keys, "values": index._values}
+        return {"counts": index._counts}, meta
+
+    def attach(self, arrays: Dict[str, np.ndarray], meta: dict):
+        keys = [tuple(key) for key in meta["keys"]]
+        with self._lock:
+            self._keys = keys
+            self._folded = [folded for folded, _ in keys]
+            self._values = list(meta["values"])
+            # Small, and replaced on every insert anyway: a private copy
+            self._counts = np.array(arrays["counts"])
+            self._built_at = time.monotonic()
+
+    def _attach_snapshot(self, snapshot):
+        self.attach(*snapshot.sections["place_index"])
+        self._snapshot = snapshot
+
+    def apply(self, before: Optional[Row], after: Optional[Row]):
+        """Move a listing's counts from its ``before`` to its ``after`` snapshot."""
+        if self._built_at is None:
+            return
+        with self._lock:
+            for kind, value in _places(before):
+                self._add(kind, value, -1)
+            for kind, value in _places(after):
+                self._add(kind, value, 1)
+
+    def _add(self, kind: str, value: str, delta: int):
+        key = (value.casefold(), kind)
+        pos = bisect.bisect_left(self._keys, key)
+        if pos == len(self._keys) or self._keys[pos] != key:
+            if delta < 0:
+                return
+            self._keys.insert(pos, key)
+            self._folded.insert(pos, key[0])
+            self._values.insert(pos, value)
+            self._counts = np.insert(self._counts, pos, 0)
+        self._counts[pos] = max(self._counts[pos] + delta, 0)
+
+    # ---------- Querying ----------
+
+    def suggest(
+        self, prefix: str, limit: int = 10, kind: Optional[str] = None
+    ) -> List[dict]:
+        """Values starting with ``prefix`` (case-insensitive), most listings first."""
+        needle = _clean(prefix).casefold()
+        with self._lock:
+            low = bisect.bisect_left(self._folded, needle)
+            high = bisect.bisect_left(self._folded, needle + "\U0010ffff", low)
+            counts = self._counts[low:high]
+            if kind is not None:
+                counts = np.where(
+                    [k == kind for _, k in self._keys[low:high]], counts, 0
+                )
+            candidates = np.flatnonzero(counts)
+            if limit < len(candidates):
+                top = np.argpartition(-counts[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            # Most listings first, then alphabetical
+            candidates = sorted(
+                candidates.tolist(), key=lambda i: (-counts[i], self._folded[low + i])
+            )
+            return [
+                {
+                    "kind": self._keys[low + i][1],
+                    "value": self._values[low + i],
+                    "count": int(counts[i]),
+                }
+                for i in candidates
+            ]
+
+
+place_index = PlaceIndex()
+listing_snapshots.register("place_index", place_index)
@@ -0,0 +1,59 @@
+"""
+NDJSON / CSV encoding for /properties/export.
+
+The encoders take the row batches yielded by PropertyService.stream_search
+and return one text chunk per batch for a StreamingResponse.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterable, Iterator, Sequence
+
+from app.schemas.property import PropertyResponse
+
+# Same fields, in the same order, as a PropertyResponse
+EXPORT_COLUMNS = tuple(PropertyResponse.model_fields)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # str-mixin enums would otherwise render as "PropertyType.HOUSE" in CSV
+    return getattr(value, "value", value)
+
+
+def ndjson_chunks(batches: Iterable[Sequence]) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(
+                {name: _plain(value) for name, value in zip(EXPORT_COLUMNS, row)},
+                separators=(",", ":"),
+            )
+            + "\n"
+            for row in rows
+        )
+
+
+def csv_chunks(batches: Iterable[Sequence]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in batches:
+        for row in rows:
+            writer.writerow(
+                # Lists (features, amenities) as "a|b|c"
+                "|".join(value) if isinstance(value, list) else _plain(value)
+                for value in row
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+ENCODERS = {"ndjson": ndjson_chunks, "csv": csv_chunks}
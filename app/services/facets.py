@@ -0,0 +1,75 @@
+"""
+Facet buckets for /properties/search/facets.
+
+Both the SQL path and the in-memory listing index produce the same raw
+counts (enum member -> n, bucket index -> n, tag -> n); build_facets turns
+them into the PropertyFacets response.
+"""
+
+from collections import Counter
+from typing import Dict, Mapping
+
+from app.models.property import ListingType, PropertyStatus, PropertyType
+from app.schemas.property import FacetBucket, PriceBucket, PropertyFacets
+
+# Lower edges of the price histogram buckets; the last bucket is open-ended.
+PRICE_BUCKET_EDGES = (
+    0,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    750_000,
+    1_000_000,
+    2_000_000,
+    5_000_000,
+)
+
+# Bedroom buckets are 0..BEDROOMS_CAP, the last one meaning "CAP or more".
+BEDROOMS_CAP = 5
+
+ENUM_FACETS = {
+    "property_type": PropertyType,
+    "listing_type": ListingType,
+    "status": PropertyStatus,
+}
+TAG_FACETS = ("features", "amenities")
+
+
+def empty_counts() -> Dict:
+    names = (*ENUM_FACETS, "bedrooms", "price", *TAG_FACETS)
+    counts = {name: Counter() for name in names}
+    counts["total"] = 0
+    return counts
+
+
+def _top(counter: Mapping[str, int], n: int):
+    ranked = sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [FacetBucket(value=tag, count=count) for tag, count in ranked[:n]]
+
+
+def build_facets(counts: Mapping[str, Mapping], top_tags: int = 10) -> PropertyFacets:
+    bedrooms = {
+        (f"{i}+" if i == BEDROOMS_CAP else str(i)): counts["bedrooms"].get(i, 0)
+        for i in range(BEDROOMS_CAP + 1)
+    }
+    price = [
+        PriceBucket(
+            min_price=low,
+            max_price=(
+                PRICE_BUCKET_EDGES[i + 1] if i + 1 < len(PRICE_BUCKET_EDGES) else None
+            ),
+            count=counts["price"].get(i, 0),
+        )
+        for i, low in enumerate(PRICE_BUCKET_EDGES)
+    ]
+    return PropertyFacets(
+        total=counts["total"],
+        **{
+            name: {member.value: counts[name].get(member, 0) for member in enum}
+            for name, enum in ENUM_FACETS.items()
+        },
+        bedrooms=bedrooms,
+        price=price,
+        **{name: _top(counts[name], top_tags) for name in TAG_FACETS},
+    )
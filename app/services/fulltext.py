@@ -0,0 +1,101 @@
+"""
+Full-text search over property title/description.
+
+SQLite uses the ``properties_fts`` FTS5 table, PostgreSQL the generated
+``properties.search_vector`` column (see app.models.property). Both match
+every word of the query as a prefix and expose a relevance score where
+higher is better.
+
+Backfill / rebuild the index for existing rows with:
+    python -m app.services.fulltext
+"""
+
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, cast, func, literal_column, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.property import Property, FTS_POSTGRES_DDL, FTS_SQLITE_DDL
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def resolve_sort_by(sort_by: Optional[str], search_query: Optional[str]) -> str:
+    """Default to relevance ordering for text searches, created_at otherwise."""
+    if sort_by is None or (sort_by == "relevance" and not search_query):
+        return "relevance" if search_query else "created_at"
+    return sort_by
+
+
+def apply_fulltext(db: Session, query, search_query: str) -> Tuple[object, object]:
+    """
+    Restrict ``query`` (a select over Property) to rows matching
+    ``search_query`` and return it along with a relevance expression.
+    """
+    words = _WORD.findall(search_query.lower())
+    dialect = db.get_bind().dialect.name
+
+    if words and dialect == "sqlite":
+        match = " ".join(f'"{w}"*' for w in words)
+        hits = (
+            select(
+                literal_column("rowid").label("id"),
+                # bm25() is lower-is-better; flip it so relevance sorts like ts_rank
+                (-func.bm25(literal_column("properties_fts"))).label("relevance"),
+            )
+            .select_from(text("properties_fts"))
+            .where(text("properties_fts MATCH :fts_match").bindparams(fts_match=match))
+            .subquery()
+        )
+        query = query.join(hits, hits.c.id == Property.id)
+        return query, hits.c.relevance
+
+    if words and dialect == "postgresql":
+        tsquery = func.to_tsquery("english", " & ".join(f"{w}:*" for w in words))
+        vector = literal_column("properties.search_vector")
+        query = query.where(vector.op("@@")(tsquery))
+        # float8 so the value round-trips exactly through keyset cursors
+        return query, cast(func.ts_rank_cd(vector, tsquery), Float)
+
+    # No indexable words (or another backend): plain substring match
+    needle = func.lower(search_query)
+    query = query.where(
+        or_(
+            func.lower(Property.title).contains(needle),
+            func.lower(Property.description).contains(needle),
+        )
+    )
+    return query, literal_column("0.0")
+
+
+def matching_ids(db: Session, search_query: str):
+    """Uncorrelated select of the ids matching ``search_query``, for IN (...)."""
+    query, _ = apply_fulltext(db, select(Property.id), search_query)
+    return query.correlate(None)
+
+
+def rebuild(db: Session):
+    """Create the full-text objects if missing and index every existing row."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in FTS_SQLITE_DDL:
+            db.execute(text(statement))
+        db.execute(text("INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        # The generated column is filled for existing rows when it is added.
+        for statement in FTS_POSTGRES_DDL:
+            db.execute(text(statement))
+    db.commit()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rebuild(session)
+        count = session.execute(select(func.count(Property.id))).scalar()
+        print(f"Full-text index rebuilt for {count} properties")
+    finally:
+        session.close()
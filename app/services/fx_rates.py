@@ -0,0 +1,145 @@
+"""
+Local FX rate table and the USD prices derived from it.
+
+Every listing stores ``price_usd`` (price times its currency's rate), set on
+write by a mapper event. When rates change, ``FxRateService.set_rates``
+reprices the listings in just the changed currencies with one UPDATE, so the
+indexed column never has to be converted per row at query time. Currencies
+without a rate are compared at face value (see ``to_usd``).
+
+The worker handling the change drops its listing index and search caches at
+once; every other worker notices through ``rate_watcher`` within
+RATES_CHECK_SECONDS of its next search.
+"""
+
+import threading
+import time
+from datetime import timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.fx_rate import BASE_CURRENCY, FxRate
+from app.models.property import Property
+from app.services.listing_index import listing_index
+from app.services.search_cache import hit_counts, search_cache
+
+# How often a worker compares the rate table with the rates it last saw
+RATES_CHECK_SECONDS = 1.0
+
+
+def _drop_price_caches(changed_at: Optional[float] = None):
+    """
+    Every cached price comparison may be off now. The index reloads on its
+    next use rather than here.
+    """
+    listing_index.mark_stale(changed_at)
+    search_cache.clear()
+    hit_counts.clear()
+
+
+class RateWatcher:
+    """
+    Rates this worker's listing index and search caches were built with.
+    ``check`` runs before they are used and drops them when the rate table
+    (one row per currency) no longer matches, i.e. another worker changed it.
+    """
+
+    def __init__(self):
+        self._rates: Optional[Dict[str, float]] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _read(db: Session) -> Tuple[Dict[str, float], Optional[float]]:
+        """The rate table and when it last changed (a time.time())."""
+        rows = db.execute(
+            select(FxRate.currency, FxRate.usd_rate, FxRate.updated_at)
+        ).all()
+        stamps = [
+            (stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)).timestamp()
+            for _, _, stamp in rows
+            if stamp is not None
+        ]
+        # Stamps have whole-second precision: round up past the change
+        changed_at = max(stamps) + 1 if stamps else None
+        return {currency: rate for currency, rate, _ in rows}, changed_at
+
+    def remember(self, db: Session):
+        """Record the current rates (after this worker changed them)."""
+        rates, _ = self._read(db)
+        with self._lock:
+            self._rates = rates
+            self._checked_at = time.monotonic()
+
+    def check(self, db: Session):
+        if not (settings.SEARCH_CACHE_ENABLED or settings.LISTING_INDEX_ENABLED):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < RATES_CHECK_SECONDS:
+                return
+            self._checked_at = now
+        rates, changed_at = self._read(db)
+        with self._lock:
+            seen, self._rates = self._rates, rates
+        if seen is not None and seen != rates:
+            # Workers that notice later still accept an index snapshot built
+            # after the change, so only one of them rebuilds it
+            _drop_price_caches(changed_at)
+
+
+rate_watcher = RateWatcher()
+
+
+class FxRateService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_rates(self):
+        return self.db.query(FxRate).order_by(FxRate.currency).all()
+
+    def set_rates(self, rates: Dict[str, float]) -> int:
+        """
+        Insert or update ``rates`` (currency -> USD per unit) and recompute
+        price_usd for listings in the currencies whose rate changed. Returns
+        the number of listings repriced.
+        """
+        current = {rate.currency: rate for rate in self.get_rates()}
+        changed = []
+        for currency, usd_rate in rates.items():
+            if currency == BASE_CURRENCY:
+                continue
+            existing = current.get(currency)
+            if existing is None:
+                self.db.add(FxRate(currency=currency, usd_rate=usd_rate))
+            elif existing.usd_rate != usd_rate:
+                existing.usd_rate = usd_rate
+            else:
+                continue
+            changed.append(currency)
+        if not changed:
+            return 0
+        self.db.flush()
+
+        # The USD price is part of the listing's representation, so repricing
+        # bumps updated_at like any edit: Last-Modified has to move with it
+        listing_currency = func.upper(Property.currency)
+        rate = (
+            select(FxRate.usd_rate)
+            .where(FxRate.currency == listing_currency)
+            .scalar_subquery()
+        )
+        result = self.db.execute(
+            update(Property)
+            .where(listing_currency.in_(changed))
+            .values(price_usd=Property.price * rate, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+        _drop_price_caches()
+        rate_watcher.remember(self.db)
+        return result.rowcount
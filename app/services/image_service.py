@@ -1,4 +1,7 @@
+from typing import Dict, List
+
 import cloudinary
+import cloudinary.api
 import cloudinary.uploader
 from fastapi import UploadFile
 from app.config import settings
@@ -31,8 +34,13 @@ class ImageService:
             "height": result["height"],
         }
 
-    async def delete_image(self, public_id: str):
-        cloudinary.uploader.destroy(public_id)
+    def delete_images(self, public_ids: List[str]) -> Dict[str, str]:
+        """
+        Delete up to 100 assets in one Admin API call (blocking); returns
+        public_id -> "deleted" / "not_found" / an error status.
+        """
+        result = cloudinary.api.delete_resources(public_ids, invalidate=True)
+        return dict(result.get("deleted", {}))
 
     def get_image_url(self, public_id: str, transformations: dict = None):
         return cloudinary.CloudinaryImage(public_id).build_url(
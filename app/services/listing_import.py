@@ -0,0 +1,84 @@
+"""
+Parsing and validation for POST /properties/import.
+
+Uploads are read line by line, so a file is never held in memory. CSV
+columns are PropertyCreate field names (an export CSV can be re-imported);
+features/amenities cells are "a|b|c" as written by the export.
+"""
+
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+
+from app.schemas.property import PropertyCreate
+
+IMPORT_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+IMPORT_BATCH_SIZE = 500
+
+# (row number, validated listing or None, error messages)
+ImportRow = Tuple[int, Optional[PropertyCreate], List[str]]
+
+
+def detect_format(filename: Optional[str], format: Optional[str]) -> str:
+    if format:
+        return format
+    for suffix, detected in IMPORT_FORMATS.items():
+        if (filename or "").lower().endswith(suffix):
+            return detected
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Could not tell the file format; pass format=csv or format=ndjson",
+    )
+
+
+def _csv_records(text) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    reader = csv.DictReader(text)
+    number = 0
+    try:
+        for number, record in enumerate(reader, start=1):
+            values = {}
+            for key, value in record.items():
+                if not key or value is None or value == "":
+                    continue
+                if key in ("features", "amenities"):
+                    value = [v.strip() for v in value.split("|") if v.strip()]
+                values[key] = value
+            yield number, values, None
+    except csv.Error as exc:
+        yield number + 1, None, f"Malformed CSV: {exc}"
+
+
+def _ndjson_records(text) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, record, None
+
+
+def read_listings(stream: BinaryIO, format: str) -> Iterator[ImportRow]:
+    """Validate each record of an upload against PropertyCreate, in file order."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    records = _csv_records(text) if format == "csv" else _ndjson_records(text)
+    for number, record, error in records:
+        if error:
+            yield number, None, [error]
+            continue
+        try:
+            yield number, PropertyCreate.model_validate(record), []
+        except ValidationError as exc:
+            yield number, None, [
+                f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+                for e in exc.errors()
+            ]
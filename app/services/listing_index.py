@@ -0,0 +1,585 @@
+"""
+In-memory columnar index over the properties table.
+
+Listings are held in NumPy column arrays so that PropertySearchParams filters
+can be evaluated as vectorized boolean masks. The index only decides *which*
+ids make up a page; the rows themselves are still loaded from the database.
+
+The index is per process. PropertyService keeps it up to date for writes made
+by this worker, and it is fully rebuilt once it is older than
+LISTING_INDEX_MAX_AGE_SECONDS so writes from other workers are picked up.
+With LISTING_SNAPSHOT_PATH set the arrays are instead mapped from the shared
+listing snapshot (see listing_snapshot), and refreshed when it is swapped.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.fx_rate import price_field
+from app.models.property import (
+    ListingType,
+    Property,
+    PropertyStatus,
+    PropertyType,
+    fold_place,
+)
+from app.schemas.property import PropertySearchParams
+from app.services.facets import BEDROOMS_CAP, PRICE_BUCKET_EDGES, empty_counts
+from app.services.listing_snapshot import listing_snapshots
+from app.utils.geo import CELL_BITS
+from app.utils.pagination import sort_key
+
+
+# Nullable numeric columns, stored as float64 with NaN for NULL so that range
+# comparisons exclude NULL rows exactly like SQL does.
+NUMERIC_COLUMNS = (
+    "price",
+    "price_usd",
+    "bedrooms",
+    "bathrooms",
+    "square_feet",
+    "lot_size",
+    "year_built",
+    "created_at",
+    "updated_at",
+    "latitude",
+    "longitude",
+    # 52-bit cell ids are exact in float64
+    "geo_cell",
+)
+
+RANGE_FILTERS = {
+    "price": ("min_price", "max_price"),
+    "bedrooms": ("min_bedrooms", "max_bedrooms"),
+    "bathrooms": ("min_bathrooms", "max_bathrooms"),
+    "square_feet": ("min_square_feet", "max_square_feet"),
+    "lot_size": ("min_lot_size", "max_lot_size"),
+    "year_built": ("min_year_built", "max_year_built"),
+}
+
+ENUM_COLUMNS = {
+    "property_type": list(PropertyType),
+    "listing_type": list(ListingType),
+    "status": list(PropertyStatus),
+}
+
+# Case-insensitive substring filters (city/state/country) and exact ones.
+SUBSTRING_COLUMNS = ("city", "state", "country")
+EXACT_COLUMNS = ("zip_code", "currency")
+
+FLAG_COLUMNS = ("is_featured", "is_active")
+TAG_COLUMNS = ("features", "amenities")
+
+# Sort keys the index can order by; title sorts go to SQL.
+SORT_COLUMNS = (
+    "created_at",
+    "updated_at",
+    "price",
+    "bedrooms",
+    "bathrooms",
+    "square_feet",
+)
+
+INDEXED_FIELDS = (
+    ("id", "agent_id")
+    + NUMERIC_COLUMNS
+    + tuple(ENUM_COLUMNS)
+    + SUBSTRING_COLUMNS
+    + EXACT_COLUMNS
+    + FLAG_COLUMNS
+    + TAG_COLUMNS
+)
+
+_INITIAL_CAPACITY = 1024
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _flag(value) -> int:
+    if value is None:
+        return -1
+    return 1 if value else 0
+
+
+class _StringCodes:
+    """Dictionary encoding for a string column: value <-> int32 code."""
+
+    def __init__(self, casefold: bool = False, values: Iterable[str] = ()):
+        self.casefold = casefold
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(values)}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        if self.casefold:
+            value = value.lower()
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.codes)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> int:
+        if self.casefold:
+            value = value.lower()
+        return self.codes.get(value, -2)
+
+    def matching(self, needle: str) -> np.ndarray:
+        """Codes of all values containing ``needle`` (folded, see fold_place)."""
+        needle = fold_place(needle)
+        return np.fromiter(
+            (code for value, code in self.codes.items() if needle in value.lower()),
+            dtype=np.int32,
+        )
+
+
+class ListingIndex:
+    """Columnar, append-only arrays with tombstones for deleted listings."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._snapshot = None
+        self._stale_since: Optional[float] = None
+        self._reset(_INITIAL_CAPACITY)
+
+    def _reset(self, capacity: int):
+        self._size = 0
+        self._capacity = capacity
+        # Loaded rows are in id order and found by binary search over the
+        # first _sorted ids; only listings added since are kept in _pos
+        self._sorted = 0
+        self._pos: Dict[int, int] = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._agent = np.zeros(capacity, dtype=np.int64)
+        self._num = {c: np.full(capacity, np.nan) for c in NUMERIC_COLUMNS}
+        self._enum = {c: np.full(capacity, -1, dtype=np.int8) for c in ENUM_COLUMNS}
+        self._flags = {c: np.full(capacity, -1, dtype=np.int8) for c in FLAG_COLUMNS}
+        self._strings = {
+            c: _StringCodes(casefold=c in SUBSTRING_COLUMNS)
+            for c in SUBSTRING_COLUMNS + EXACT_COLUMNS
+        }
+        self._str = {
+            c: np.full(capacity, -1, dtype=np.int32)
+            for c in SUBSTRING_COLUMNS + EXACT_COLUMNS
+        }
+        self._tags: Dict[str, Dict[str, np.ndarray]] = {c: {} for c in TAG_COLUMNS}
+
+    def _grow(self, new_capacity: Optional[int] = None):
+        new_capacity = new_capacity or self._capacity * 2
+
+        def grow(arr: np.ndarray, fill) -> np.ndarray:
+            out = np.full(new_capacity, fill, dtype=arr.dtype)
+            out[: self._capacity] = arr
+            return out
+
+        self._ids = grow(self._ids, 0)
+        self._live = grow(self._live, False)
+        self._agent = grow(self._agent, 0)
+        self._num = {c: grow(a, np.nan) for c, a in self._num.items()}
+        self._enum = {c: grow(a, -1) for c, a in self._enum.items()}
+        self._flags = {c: grow(a, -1) for c, a in self._flags.items()}
+        self._str = {c: grow(a, -1) for c, a in self._str.items()}
+        self._tags = {
+            c: {tag: grow(a, False) for tag, a in tags.items()}
+            for c, tags in self._tags.items()
+        }
+        self._capacity = new_capacity
+
+    # ---------- Maintenance ----------
+
+    @property
+    def is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        return time.monotonic() - self._built_at > settings.LISTING_INDEX_MAX_AGE_SECONDS
+
+    def mark_stale(self, since: Optional[float] = None):
+        """
+        Have the next ``ensure_fresh`` reload everything (lazily, not now),
+        from a snapshot built after ``since`` (a time.time(), default now).
+        """
+        with self._lock:
+            self._built_at = None
+            self._snapshot = None
+            self._stale_since = time.time() if since is None else since
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._live[: self._size]))
+
+    def _find(self, property_id: int) -> Optional[int]:
+        pos = self._pos.get(property_id)
+        if pos is None and self._sorted:
+            i = int(np.searchsorted(self._ids[: self._sorted], property_id))
+            if i < self._sorted and self._ids[i] == property_id:
+                pos = i
+        return pos
+
+    def _load_from(self, db: Session):
+        columns = [getattr(Property, name) for name in INDEXED_FIELDS]
+        rows = db.execute(select(*columns).order_by(Property.id)).all()
+        with self._lock:
+            self._load(rows)
+            self._built_at = time.monotonic()
+
+    def rebuild(self, db: Session):
+        """Reload every listing from the database (into a new shared snapshot)."""
+        if listing_snapshots.enabled:
+            self._attach_snapshot(listing_snapshots.rebuild(db))
+        else:
+            self._load_from(db)
+
+    def ensure_fresh(self, db: Session):
+        if listing_snapshots.enabled:
+            snapshot = listing_snapshots.current(db, built_after=self._stale_since)
+            if snapshot is not self._snapshot:
+                self._attach_snapshot(snapshot)
+        elif self.is_stale:
+            self.rebuild(db)
+
+    def upsert(self, prop: Property):
+        """Add or replace a single listing (called after a committed write)."""
+        if self._built_at is None:
+            return
+        with self._lock:
+            self._write(prop)
+
+    def remove(self, property_id: int):
+        with self._lock:
+            pos = self._find(property_id)
+            if pos is not None:
+                self._live[pos] = False
+
+    # ---------- Shared snapshot section ----------
+
+    def export(self, db: Session) -> Tuple[Dict[str, np.ndarray], dict]:
+        """
+        Arrays and metadata of a freshly loaded index, with room for 1/8 more
+        listings so a worker's own inserts do not force a private copy.
+        """
+        index = ListingIndex()
+        index._load_from(db)
+        index._grow(
+            max(index._capacity, index._size + max(_INITIAL_CAPACITY, index._size // 8))
+        )
+        arrays = {"ids": index._ids, "live": index._live, "agent": index._agent}
+        for group in ("num", "enum", "flags", "str"):
+            for c, arr in getattr(index, f"_{group}").items():
+                arrays[f"{group}/{c}"] = arr
+        tags = {}
+        for c, by_tag in index._tags.items():
+            tags[c] = list(by_tag)
+            for i, arr in enumerate(by_tag.values()):
+                arrays[f"tags/{c}/{i}"] = arr
+        meta = {
+            "size": index._size,
+            "strings": {c: list(codes.codes) for c, codes in index._strings.items()},
+            "tags": tags,
+        }
+        return arrays, meta
+
+    def attach(self, arrays: Dict[str, np.ndarray], meta: dict):
+        """Use snapshot ``arrays`` in place (copy-on-write, not copied)."""
+        with self._lock:
+            self._size = self._sorted = meta["size"]
+            self._capacity = len(arrays["ids"])
+            self._pos = {}
+            self._ids, self._live = arrays["ids"], arrays["live"]
+            self._agent = arrays["agent"]
+            for group in ("num", "enum", "flags", "str"):
+                columns = getattr(self, f"_{group}")
+                setattr(self, f"_{group}", {c: arrays[f"{group}/{c}"] for c in columns})
+            self._strings = {
+                c: _StringCodes(casefold=c in SUBSTRING_COLUMNS, values=values)
+                for c, values in meta["strings"].items()
+            }
+            self._tags = {
+                c: {tag: arrays[f"tags/{c}/{i}"] for i, tag in enumerate(names)}
+                for c, names in meta["tags"].items()
+            }
+            self._built_at = time.monotonic()
+
+    def _attach_snapshot(self, snapshot):
+        self.attach(*snapshot.sections["listing_index"])
+        self._snapshot = snapshot
+
+    def _load(self, rows):
+        """Bulk-fill the arrays column by column."""
+        n = len(rows)
+        self._reset(max(_INITIAL_CAPACITY, n))
+        if not n:
+            return
+        cols = dict(zip(INDEXED_FIELDS, zip(*rows)))
+        self._size = self._sorted = n
+        self._ids[:n] = cols["id"]
+        self._live[:n] = True
+        self._agent[:n] = cols["agent_id"]
+        for c in NUMERIC_COLUMNS:
+            self._num[c][:n] = [_to_float(v) for v in cols[c]]
+        for c, members in ENUM_COLUMNS.items():
+            codes = {m: i for i, m in enumerate(members)}
+            self._enum[c][:n] = [codes.get(v, -1) for v in cols[c]]
+        for c in FLAG_COLUMNS:
+            self._flags[c][:n] = [_flag(v) for v in cols[c]]
+        for c in SUBSTRING_COLUMNS + EXACT_COLUMNS:
+            encode = self._strings[c].encode
+            self._str[c][:n] = [encode(v) for v in cols[c]]
+        for c in TAG_COLUMNS:
+            positions: Dict[str, List[int]] = {}
+            for pos, values in enumerate(cols[c]):
+                for tag in values or ():
+                    positions.setdefault(tag, []).append(pos)
+            for tag, hits in positions.items():
+                arr = np.zeros(self._capacity, dtype=bool)
+                arr[hits] = True
+                self._tags[c][tag] = arr
+
+    def _write(self, row):
+        pos = self._find(row.id)
+        if pos is None:
+            if self._size == self._capacity:
+                self._grow()
+            pos = self._size
+            self._size += 1
+            self._pos[row.id] = pos
+
+        self._ids[pos] = row.id
+        self._live[pos] = True
+        self._agent[pos] = row.agent_id
+        for c in NUMERIC_COLUMNS:
+            self._num[c][pos] = _to_float(getattr(row, c))
+        for c, members in ENUM_COLUMNS.items():
+            value = getattr(row, c)
+            self._enum[c][pos] = members.index(value) if value is not None else -1
+        for c in FLAG_COLUMNS:
+            self._flags[c][pos] = _flag(getattr(row, c))
+        for c in SUBSTRING_COLUMNS + EXACT_COLUMNS:
+            self._str[c][pos] = self._strings[c].encode(getattr(row, c))
+        for c in TAG_COLUMNS:
+            tags = self._tags[c]
+            values = set(getattr(row, c) or ())
+            for tag, arr in tags.items():
+                arr[pos] = tag in values
+            for tag in values - tags.keys():
+                arr = np.zeros(self._capacity, dtype=bool)
+                arr[pos] = True
+                tags[tag] = arr
+
+    # ---------- Querying ----------
+
+    @staticmethod
+    def filterable(params: PropertySearchParams) -> bool:
+        """Whether the filters can be evaluated here; free text is left to SQL."""
+        return not params.search_query
+
+    @classmethod
+    def supports(cls, params: PropertySearchParams) -> bool:
+        """Searchable here: filterable, and not ordered by title or relevance."""
+        return cls.filterable(params) and params.sort_by in SORT_COLUMNS
+
+    def _mask(self, params: PropertySearchParams, agent_id: Optional[int]) -> np.ndarray:
+        n = self._size
+        mask = self._live[:n].copy()
+
+        if agent_id is not None:
+            mask &= self._agent[:n] == agent_id
+
+        for c in SUBSTRING_COLUMNS:
+            needle = getattr(params, c)
+            if needle:
+                codes = self._strings[c].matching(needle)
+                mask &= np.isin(self._str[c][:n], codes)
+        if params.zip_code:
+            mask &= self._str["zip_code"][:n] == self._strings["zip_code"].lookup(
+                params.zip_code
+            )
+        if params.currency:
+            mask &= self._str["currency"][:n] == self._strings["currency"].lookup(
+                params.currency.upper()
+            )
+
+        for c, (low_name, high_name) in RANGE_FILTERS.items():
+            low, high = getattr(params, low_name), getattr(params, high_name)
+            if c == "price":
+                c = price_field(params.currency)
+            if low is not None:
+                mask &= self._num[c][:n] >= low
+            if high is not None:
+                mask &= self._num[c][:n] <= high
+
+        for c, members in ENUM_COLUMNS.items():
+            value = getattr(params, c)
+            if value:
+                mask &= self._enum[c][:n] == members.index(value)
+
+        for c in FLAG_COLUMNS:
+            value = getattr(params, c)
+            if value is not None:
+                mask &= self._flags[c][:n] == _flag(value)
+
+        for c in TAG_COLUMNS:
+            for tag in getattr(params, c) or ():
+                arr = self._tags[c].get(tag)
+                if arr is None:
+                    return np.zeros(n, dtype=bool)
+                mask &= arr[:n]
+
+        return mask
+
+    def search_ids(
+        self,
+        params: PropertySearchParams,
+        agent_id: Optional[int] = None,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> List[int]:
+        """
+        Return the ids of the requested page, in sort order.
+
+        Ordering is (sort key, id) with NULL keys last, the same as the SQL
+        path; ``after`` is a decoded keyset cursor.
+        """
+        with self._lock:
+            positions = np.flatnonzero(self._mask(params, agent_id))
+            key = self._num[sort_key(params.sort_by)][positions]
+            ids = self._ids[positions]
+        descending = params.sort_order.lower() == "desc"
+        if descending:
+            key, ids = -key, -ids
+
+        if after is not None:
+            value, last_id = _to_float(after[0]), after[1]
+            if descending:
+                value, last_id = -value, -last_id
+            if np.isnan(value):
+                keep = np.isnan(key) & (ids > last_id)
+            else:
+                keep = (key > value) | ((key == value) & (ids > last_id)) | np.isnan(key)
+            key, ids = key[keep], ids[keep]
+
+        # Only the first skip+limit rows need ordering: cut the candidates
+        # down to everything at or below the k-th key before sorting.
+        k = params.skip + params.limit
+        if k < len(key):
+            threshold = np.partition(key, k - 1)[k - 1]
+            if not np.isnan(threshold):
+                keep = key <= threshold
+                key, ids = key[keep], ids[keep]
+
+        order = np.lexsort((ids, key))[params.skip : k]
+        return [abs(int(i)) for i in ids[order]]
+
+    def count(self, params: PropertySearchParams) -> int:
+        """Number of listings matching ``params``."""
+        with self._lock:
+            return int(np.count_nonzero(self._mask(params, None)))
+
+    def map_markers(
+        self, params: PropertySearchParams, boxes, level: int, max_markers: int
+    ) -> Tuple[int, list, List[int]]:
+        """
+        Active listings matching ``params`` inside ``boxes`` as (total,
+        clusters, ids): clusters per cell at ``level`` (cell, count, centroid,
+        min/max price in USD, or in the filtered currency) or, when there are
+        at most ``max_markers``, their ids.
+        """
+        with self._lock:
+            n = self._size
+            mask = self._mask(params, None) & (self._flags["is_active"][:n] == 1)
+            lat, lon = self._num["latitude"][:n], self._num["longitude"][:n]
+            inside = np.zeros(n, dtype=bool)
+            for lat0, lat1, lon0, lon1 in boxes:
+                inside |= (lat >= lat0) & (lat <= lat1) & (lon >= lon0) & (lon <= lon1)
+            positions = np.flatnonzero(mask & inside)
+            if not len(positions):
+                return 0, [], []
+            if len(positions) <= max_markers:
+                return len(positions), [], sorted(int(i) for i in self._ids[positions])
+
+            cells = self._num["geo_cell"][positions].astype(np.int64) >> (
+                2 * (CELL_BITS - level)
+            )
+            order = np.argsort(cells, kind="stable")
+            cells, positions = cells[order], positions[order]
+            lat, lon = lat[positions], lon[positions]
+            price = self._num[price_field(params.currency)][:n][positions]
+
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        counts = np.diff(np.r_[starts, len(cells)])
+        columns = (
+            cells[starts],
+            counts,
+            np.add.reduceat(lat, starts) / counts,
+            np.add.reduceat(lon, starts) / counts,
+            np.fmin.reduceat(price, starts),
+            np.fmax.reduceat(price, starts),
+        )
+        names = ("cell", "count", "latitude", "longitude", "min_price", "max_price")
+        clusters = [dict(zip(names, row)) for row in zip(*(c.tolist() for c in columns))]
+        return len(positions), clusters, []
+
+    def facet_counts(self, params: PropertySearchParams) -> dict:
+        """Facet counts for the matching listings from a single mask."""
+        counts = empty_counts()
+        with self._lock:
+            n = self._size
+            mask = self._mask(params, None)
+            counts["total"] = int(np.count_nonzero(mask))
+
+            for c, members in ENUM_COLUMNS.items():
+                codes = self._enum[c][:n][mask]
+                tally = np.bincount(codes[codes >= 0], minlength=len(members))
+                counts[c].update({m: int(k) for m, k in zip(members, tally) if k})
+
+            beds = self._num["bedrooms"][:n][mask]
+            beds = np.minimum(beds[~np.isnan(beds)], BEDROOMS_CAP).astype(np.int64)
+            counts["bedrooms"].update(
+                {i: int(k) for i, k in enumerate(np.bincount(beds)) if k}
+            )
+
+            prices = self._num[price_field(params.currency)][:n][mask]
+            prices = prices[~np.isnan(prices)]
+            buckets = np.searchsorted(PRICE_BUCKET_EDGES, prices, side="right") - 1
+            counts["price"].update(
+                {i: int(k) for i, k in enumerate(np.bincount(np.maximum(buckets, 0))) if k}
+            )
+
+            for c in TAG_COLUMNS:
+                for tag, arr in self._tags[c].items():
+                    k = int(np.count_nonzero(arr[:n] & mask))
+                    if k:
+                        counts[c][tag] = k
+        return counts
+
+
+def fetch_in_order(db: Session, ids: Iterable[int], columns=None) -> List[Property]:
+    """
+    Load the given property ids, preserving the order of ``ids``; as Core
+    rows of ``columns`` (which must include id) when given.
+    """
+    ids = list(ids)
+    if not ids:
+        return []
+    if columns:
+        rows = db.execute(select(*columns).where(Property.id.in_(ids))).all()
+    else:
+        rows = db.execute(select(Property).where(Property.id.in_(ids))).scalars().all()
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+listing_index = ListingIndex()
+listing_snapshots.register("listing_index", listing_index)
@@ -0,0 +1,249 @@
+"""
+Listing snapshot shared by every worker on a host.
+
+With LISTING_SNAPSHOT_PATH set, the in-memory indexes (the listing index
+behind search prefiltering, the autocomplete place index) stop loading their
+own copy of the listings. Their arrays are written once to a single file,
+which every worker maps copy-on-write: the pages are shared through the page
+cache, and a worker only gets a private copy of a page its own writes touch.
+A worker that starts up maps the file instead of querying the database.
+
+One process rebuilds the file when it is older than
+LISTING_SNAPSHOT_MAX_AGE_SECONDS (an flock decides which; the others keep
+serving the old snapshot meanwhile). It writes a temporary file next to it
+and os.replace()s it in, so readers see either the old file or the new one,
+never a partial one. Workers notice the new inode on their next lookup and
+remap. Mappings of the old file stay valid until they are dropped.
+
+File layout: 8-byte magic, little-endian uint64 header length, JSON header
+(build time, per-section metadata, array dtypes/shapes/offsets), then the
+arrays, each aligned to 64 bytes.
+
+Indexes take part by registering a section with ``export(db)`` returning
+``(arrays, meta)`` and ``attach(arrays, meta)``.
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LXSNAP01"
+_LENGTH = struct.Struct("<Q")
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+class Snapshot:
+    """One mapped snapshot file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            # Copy-on-write: shared until this process writes to a page
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a listing snapshot")
+        (length,) = _LENGTH.unpack_from(self._map, len(MAGIC))
+        start = len(MAGIC) + _LENGTH.size
+        header = json.loads(self._map[start : start + length])
+        self.built_at: float = header["built_at"]
+        self.sections: Dict[str, Tuple[Dict[str, np.ndarray], dict]] = {}
+        for name, section in header["sections"].items():
+            arrays = {
+                key: np.frombuffer(
+                    self._map,
+                    dtype=np.dtype(spec["dtype"]),
+                    count=int(np.prod(spec["shape"])),
+                    offset=spec["offset"],
+                ).reshape(spec["shape"])
+                for key, spec in section["arrays"].items()
+            }
+            self.sections[name] = (arrays, section["meta"])
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+
+def write_snapshot(path: str, sections: Dict[str, Tuple[Dict[str, np.ndarray], dict]]):
+    """Write ``sections`` to ``path`` atomically (temporary file + rename)."""
+    layout, offset = {}, 0
+    for name, (arrays, meta) in sections.items():
+        specs = {}
+        for key, array in arrays.items():
+            offset = _aligned(offset)
+            specs[key] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset += array.nbytes
+        layout[name] = {"arrays": specs, "meta": meta}
+
+    # Offsets above are relative to the end of the header; make them absolute,
+    # growing the space reserved for the header until it fits
+    prefix = len(MAGIC) + _LENGTH.size
+    built_at = time.time()
+    body = _aligned(prefix + len(json.dumps(layout)))
+    while True:
+        header = {
+            "built_at": built_at,
+            "sections": {
+                name: {
+                    "arrays": {
+                        key: {**spec, "offset": spec["offset"] + body}
+                        for key, spec in section["arrays"].items()
+                    },
+                    "meta": section["meta"],
+                }
+                for name, section in layout.items()
+            },
+        }
+        encoded = json.dumps(header).encode()
+        if prefix + len(encoded) <= body:
+            break
+        body = _aligned(prefix + len(encoded))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + _LENGTH.pack(len(encoded)) + encoded)
+            for name, (arrays, _) in sections.items():
+                for key, array in arrays.items():
+                    f.seek(header["sections"][name]["arrays"][key]["offset"])
+                    f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class SnapshotStore:
+    """The current snapshot at ``path``, rebuilt by one process at a time."""
+
+    def __init__(self, path: str, max_age_seconds: float):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._sections: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._current: Optional[Snapshot] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def register(self, name: str, section):
+        self._sections[name] = section
+
+    def _latest(self) -> Optional[Snapshot]:
+        """The file now at ``path``, reusing the mapping while it is unchanged."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._current is None or self._current.key != key:
+            try:
+                self._current = Snapshot(self.path)
+            except (OSError, ValueError):
+                logger.exception("Could not map listing snapshot %s", self.path)
+                return None
+        return self._current
+
+    def _fresh(
+        self, snapshot: Optional[Snapshot], built_after: Optional[float] = None
+    ) -> bool:
+        return (
+            snapshot is not None
+            and set(self._sections) <= set(snapshot.sections)
+            and snapshot.age <= self.max_age_seconds
+            and (built_after is None or snapshot.built_at >= built_after)
+        )
+
+    def current(self, db: Session, built_after: Optional[float] = None) -> Snapshot:
+        """
+        The latest snapshot, rebuilt first when missing, too old or (given
+        ``built_after``, a time.time()) built before that.
+        """
+        with self._lock:
+            snapshot = self._latest()
+            if self._fresh(snapshot, built_after):
+                return snapshot
+            return self._rebuild(db, snapshot, force=False, built_after=built_after)
+
+    def rebuild(self, db: Session) -> Snapshot:
+        """Build and swap in a new snapshot now."""
+        with self._lock:
+            return self._rebuild(db, None, force=True)
+
+    def _rebuild(
+        self,
+        db: Session,
+        stale: Optional[Snapshot],
+        force: bool,
+        built_after: Optional[float] = None,
+    ) -> Snapshot:
+        with open(f"{self.path}.lock", "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if stale is not None and not force:
+                    # Another process is rebuilding; keep serving the old one
+                    return stale
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if not force:
+                    # It may have been rebuilt while we waited for the lock
+                    snapshot = self._latest()
+                    if self._fresh(snapshot, built_after):
+                        return snapshot
+                started = time.monotonic()
+                write_snapshot(
+                    self.path,
+                    {name: s.export(db) for name, s in self._sections.items()},
+                )
+                logger.info(
+                    "Listing snapshot rebuilt in %.2fs", time.monotonic() - started
+                )
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return self._latest()
+
+
+listing_snapshots = SnapshotStore(
+    settings.LISTING_SNAPSHOT_PATH, settings.LISTING_SNAPSHOT_MAX_AGE_SECONDS
+)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+    from app.services.autocomplete import place_index  # noqa: F401 (registers)
+    from app.services.listing_index import listing_index  # noqa: F401 (registers)
+
+    session = SessionLocal()
+    try:
+        listing_snapshots.rebuild(session)
+        print(f"Listing snapshot written to {listing_snapshots.path}")
+    finally:
+        session.close()
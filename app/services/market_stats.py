@@ -0,0 +1,193 @@
+"""
+Market statistics (/properties/stats) answered from the market_rollups table.
+
+The rollups hold per-group histograms of on-market listings, so a request
+sums at most a few hundred (metric, bucket) rows and derives percentiles and
+histograms from them; it never scans properties. Rows are kept current by
+the mapper events in app.models.market_rollup and rebuilt in full by:
+    python -m app.services.market_stats
+which the API also runs every MARKET_STATS_REBUILD_SECONDS.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.market_rollup import (
+    BUCKETS_PER_DECADE,
+    LISTED_METRIC,
+    LOG_METRICS,
+    MarketRollup,
+    bucket_bounds,
+    rebuild_market_rollups,
+)
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+# Histogram bins merge log buckets to quarter decades (1, 1.78, 3.16, 5.62, ...)
+LOG_BUCKETS_PER_BIN = BUCKETS_PER_DECADE // 4
+DAYS_ON_MARKET_EDGES = (0, 7, 14, 30, 60, 90, 180, 365)
+# pg_try_advisory_xact_lock key held by the worker running a full rebuild
+REBUILD_LOCK_ID = 0x4C584D53
+
+
+def _percentile(buckets: List[tuple], total: int, p: float) -> float:
+    """
+    ``p``th percentile of a histogram given as sorted (low, high, count)
+    bins, interpolating linearly inside the bin the rank falls in.
+    """
+    rank = p / 100 * total
+    seen = 0
+    for low, high, count in buckets:
+        if seen + count >= rank:
+            return low + (high - low) * ((rank - seen) / count)
+        seen += count
+    return buckets[-1][1]
+
+
+def _log_metric(counts: Dict[int, int]) -> dict:
+    total = sum(counts.values())
+    # Interpolate in log space: store log10 bounds, convert back at the end
+    buckets = [
+        (b / BUCKETS_PER_DECADE, (b + 1) / BUCKETS_PER_DECADE, counts[b])
+        for b in sorted(counts)
+    ]
+    percentiles = {
+        f"p{p}": round(10 ** _percentile(buckets, total, p), 2) for p in PERCENTILES
+    }
+    bins = Counter()
+    for b, count in counts.items():
+        bins[b // LOG_BUCKETS_PER_BIN] += count
+    histogram = []
+    for i in sorted(bins):
+        low = bucket_bounds(i * LOG_BUCKETS_PER_BIN)[0]
+        high = bucket_bounds((i + 1) * LOG_BUCKETS_PER_BIN - 1)[1]
+        histogram.append(
+            {
+                "lower": float(f"{low:.3g}"),
+                "upper": float(f"{high:.3g}"),
+                "count": bins[i],
+            }
+        )
+    return {"count": total, "percentiles": percentiles, "histogram": histogram}
+
+
+def _days_on_market(counts: Dict[int, int], today: date) -> dict:
+    total = sum(counts.values())
+    by_days = Counter()
+    for day, count in counts.items():
+        by_days[max(today.toordinal() - day, 0)] += count
+    buckets = [(d, d + 1, by_days[d]) for d in sorted(by_days)]
+    percentiles = {
+        f"p{p}": round(_percentile(buckets, total, p), 1) for p in PERCENTILES
+    }
+    histogram = []
+    edges = DAYS_ON_MARKET_EDGES
+    for i, low in enumerate(edges):
+        high = edges[i + 1] if i + 1 < len(edges) else None
+        count = sum(
+            n for d, n in by_days.items() if d >= low and (high is None or d < high)
+        )
+        histogram.append({"lower": low, "upper": high, "count": count})
+    return {"count": total, "percentiles": percentiles, "histogram": histogram}
+
+
+def market_stats(
+    db: Session,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    property_type: Optional[str] = None,
+    listing_type: Optional[str] = None,
+    currency: str = "USD",
+    today: Optional[date] = None,
+) -> dict:
+    """
+    Price, price per square foot and days-on-market distributions for the
+    on-market listings of one market; city/state match case-insensitively.
+    """
+    conditions = [MarketRollup.currency == currency.upper()]
+    if city:
+        conditions.append(func.lower(MarketRollup.city) == city.strip().lower())
+    if state:
+        conditions.append(func.lower(MarketRollup.state) == state.strip().lower())
+    if property_type:
+        conditions.append(
+            MarketRollup.property_type == getattr(property_type, "value", property_type)
+        )
+    if listing_type:
+        conditions.append(
+            MarketRollup.listing_type == getattr(listing_type, "value", listing_type)
+        )
+
+    rows = db.execute(
+        select(MarketRollup.metric, MarketRollup.bucket, func.sum(MarketRollup.count))
+        .where(*conditions)
+        .group_by(MarketRollup.metric, MarketRollup.bucket)
+        .having(func.sum(MarketRollup.count) > 0)
+    )
+    counts: Dict[str, Dict[int, int]] = {m: {} for m in (*LOG_METRICS, LISTED_METRIC)}
+    for metric, bucket, count in rows:
+        counts[metric][bucket] = int(count)
+
+    stats = {
+        "count": sum(counts[LISTED_METRIC].values()),
+        "currency": currency.upper(),
+    }
+    for metric in LOG_METRICS:
+        stats[metric] = _log_metric(counts[metric]) if counts[metric] else None
+    stats["days_on_market"] = (
+        _days_on_market(counts[LISTED_METRIC], today or datetime.now(timezone.utc).date())
+        if counts[LISTED_METRIC]
+        else None
+    )
+    return stats
+
+
+def rebuild(db: Session) -> bool:
+    """
+    Recompute all rollups in one transaction. Every API worker runs this on a
+    timer; on PostgreSQL only one at a time does the work (a transaction-level
+    advisory lock), and the others return False.
+    """
+    connection = db.connection()
+    if connection.dialect.name == "postgresql" and not connection.scalar(
+        select(func.pg_try_advisory_xact_lock(REBUILD_LOCK_ID))
+    ):
+        db.rollback()
+        logger.info("Market stats rebuild already running elsewhere; skipped")
+        return False
+    rebuild_market_rollups(connection)
+    db.commit()
+    return True
+
+
+async def rebuild_periodically(session_factory, interval_seconds: float):
+    """Full rebuild every ``interval_seconds``, correcting any drift."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        session = session_factory()
+        try:
+            await asyncio.to_thread(rebuild, session)
+        except Exception:
+            logger.exception("Market stats rebuild failed")
+            session.rollback()
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rebuild(session)
+        groups = session.execute(select(func.count(MarketRollup.id))).scalar()
+        print(f"Market rollups rebuilt ({groups} rows)")
+    finally:
+        session.close()
@@ -1,15 +1,337 @@
-from sqlalchemy import select, and_, or_, func, delete
+from sqlalchemy import (
+    select,
+    and_,
+    or_,
+    func,
+    delete,
+    insert,
+    literal,
+    literal_column,
+    case,
+    tuple_,
+    DateTime,
+)
 from app.database import SessionLocal
-from app.models.property import Property, PropertyStatus, PropertyType, ListingType
+from app.models.property import (
+    ListingType,
+    Property,
+    PropertyStatus,
+    PropertyType,
+    collapse_spaces,
+)
+from app.models.property_view_count import PropertyViewCount
+from app.models.fx_rate import BASE_CURRENCY, price_field, to_usd, usd_rates
 from app.models.property_images import PropertyImage
+from app.models.orphaned_asset import queue_asset_deletes
 from app.models.favorite import Favorite
-from app.schemas.property import PropertyCreate, PropertyUpdate, PropertySearchParams
-from sqlalchemy.orm import Session
+from app.models.tag import TAG_KINDS, Tag, add_property_tags, property_tags
+from app.models.market_rollup import add_listing_rollups
+from app.schemas.property import (
+    PropertyCreate,
+    PropertyUpdate,
+    PropertySearchParams,
+    PropertyImportError,
+    PropertyImportResult,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence
 from datetime import datetime
 from app.services.subscription import SubscriptionService
 from app.models.subscription import SubscriptionStatus
+from app.config import settings
+from app.services.listing_index import listing_index, fetch_in_order
+from app.services.export import EXPORT_COLUMNS
+from app.services.fx_rates import rate_watcher
+from app.services.facets import (
+    BEDROOMS_CAP,
+    PRICE_BUCKET_EDGES,
+    build_facets,
+    empty_counts,
+)
+from app.services.fulltext import apply_fulltext, matching_ids, resolve_sort_by
+from app.services.search_cache import HitCount, hit_counts, search_cache, snapshot
+from app.services.listing_import import IMPORT_BATCH_SIZE, ImportRow
+from app.services.similar_listings import similar_listings
+from app.services.autocomplete import place_index
+from app.services.saved_searches import alert_saved_searches
+from app.services.view_counter import view_counter
+from app.utils.geo import (
+    bounding_boxes,
+    cell_ranges,
+    cluster_level,
+    encode_cell,
+    viewport_boxes,
+    CELL_BITS,
+)
+from app.utils.pagination import decode_cursor, sort_key
+
+# Map viewports: individual listings from this zoom on, if there are at most
+# MAP_MAX_MARKERS of them; otherwise at most MAP_MAX_CELLS clusters.
+MAP_LISTING_ZOOM = 14
+MAP_MAX_MARKERS = 500
+MAP_MAX_CELLS = 1024
+# Trending candidates fetched per listing wanted, since some are off the market
+TRENDING_OVERFETCH = 2
+
+
+def _sort_expression(db: Session, column):
+    """
+    SQLite keeps server-default timestamps without fractional seconds while
+    bound datetimes carry microseconds, so normalise both sides there to make
+    ORDER BY and the keyset comparison agree.
+    """
+    if db.get_bind().dialect.name == "sqlite" and isinstance(column.type, DateTime):
+        return func.strftime("%Y-%m-%d %H:%M:%f", column)
+    return column
+
+
+def _order_and_seek(db: Session, query, column, sort_order: str, after=None):
+    """
+    Order by (column, id) with NULLs last and, for cursor pages, only keep
+    rows strictly after the (value, id) pair the previous page ended on.
+    """
+    descending = sort_order.lower() == "desc"
+    expr = _sort_expression(db, column)
+
+    if after is not None:
+        value, last_id = after
+        id_after = Property.id < last_id if descending else Property.id > last_id
+        if column is Property.id:
+            query = query.where(id_after)
+        elif value is None:
+            query = query.where(and_(column.is_(None), id_after))
+        else:
+            bound = _sort_expression(db, literal(value, column.type))
+            beyond = expr < bound if descending else expr > bound
+            query = query.where(
+                or_(beyond, and_(expr == bound, id_after), column.is_(None))
+            )
+
+    if descending:
+        query = query.order_by(expr.desc().nulls_last())
+    else:
+        query = query.order_by(expr.asc().nulls_last())
+    if column is not Property.id:
+        query = query.order_by(Property.id.desc() if descending else Property.id.asc())
+    return query
+
+
+def _search_conditions(params: PropertySearchParams) -> list:
+    """WHERE clauses for every PropertySearchParams filter except search_query."""
+    conditions = []
+
+    # Location filters (substring of the folded value, see fold_place)
+    if params.city:
+        conditions.append(
+            func.lower(Property.city).contains(
+                func.lower(collapse_spaces(params.city))
+            )
+        )
+    if params.state:
+        conditions.append(
+            func.lower(Property.state).contains(
+                func.lower(collapse_spaces(params.state))
+            )
+        )
+    if params.country:
+        conditions.append(
+            func.lower(Property.country).contains(
+                func.lower(collapse_spaces(params.country))
+            )
+        )
+    if params.zip_code:
+        conditions.append(Property.zip_code == params.zip_code)
+
+    # Price filters: in USD unless a currency filter picks the listing currency
+    price = getattr(Property, price_field(params.currency))
+    if params.min_price is not None:
+        conditions.append(price >= params.min_price)
+    if params.max_price is not None:
+        conditions.append(price <= params.max_price)
+    if params.currency:
+        conditions.append(Property.currency == params.currency.upper())
+
+    # Property details
+    if params.property_type:
+        conditions.append(Property.property_type == params.property_type)
+    if params.status:
+        conditions.append(Property.status == params.status)
+    if params.listing_type:
+        conditions.append(Property.listing_type == params.listing_type)
+
+    # Bedroom filters
+    if params.min_bedrooms is not None:
+        conditions.append(Property.bedrooms >= params.min_bedrooms)
+    if params.max_bedrooms is not None:
+        conditions.append(Property.bedrooms <= params.max_bedrooms)
+
+    # Bathroom filters
+    if params.min_bathrooms is not None:
+        conditions.append(Property.bathrooms >= params.min_bathrooms)
+    if params.max_bathrooms is not None:
+        conditions.append(Property.bathrooms <= params.max_bathrooms)
+
+    # Square footage filters
+    if params.min_square_feet is not None:
+        conditions.append(Property.square_feet >= params.min_square_feet)
+    if params.max_square_feet is not None:
+        conditions.append(Property.square_feet <= params.max_square_feet)
+
+    # Lot size filters
+    if params.min_lot_size is not None:
+        conditions.append(Property.lot_size >= params.min_lot_size)
+    if params.max_lot_size is not None:
+        conditions.append(Property.lot_size <= params.max_lot_size)
+
+    # Year built filters
+    if params.min_year_built is not None:
+        conditions.append(Property.year_built >= params.min_year_built)
+    if params.max_year_built is not None:
+        conditions.append(Property.year_built <= params.max_year_built)
+
+    # Features and amenities: one intersection over the tag index
+    wanted = sorted(
+        {(kind, name) for kind in TAG_KINDS for name in getattr(params, kind) or []}
+    )
+    if wanted:
+        conditions.append(
+            Property.id.in_(
+                select(property_tags.c.property_id)
+                .join(Tag, Tag.id == property_tags.c.tag_id)
+                .where(tuple_(Tag.kind, Tag.name).in_(wanted))
+                .group_by(property_tags.c.property_id)
+                .having(func.count() == len(wanted))
+            )
+        )
+
+    # Special filters
+    if params.is_featured is not None:
+        conditions.append(Property.is_featured == params.is_featured)
+    if params.is_active is not None:
+        conditions.append(Property.is_active == params.is_active)
+
+    return conditions
+
+
+def _projection(fields: Optional[Sequence[str]], *extra: str) -> Optional[list]:
+    """
+    Core columns for ``fields`` plus id and any ``extra`` ones (e.g. the sort
+    key a keyset cursor needs); None when whole ORM objects are wanted.
+    """
+    if not fields:
+        return None
+    names = dict.fromkeys(("id", *fields, *extra))
+    return [Property.__table__.c[n] for n in names if n in Property.__table__.c]
+
+
+def _filtered_query(db: Session, query, params: PropertySearchParams):
+    """
+    Apply every search filter (and the full-text match) to ``query``, a select
+    over properties, and return it with the column to sort by.
+    """
+    conditions = _search_conditions(params)
+    if conditions:
+        query = query.where(and_(*conditions))
+
+    relevance = None
+    if params.search_query:
+        query, relevance = apply_fulltext(db, query, params.search_query)
+
+    if params.sort_by == "relevance":
+        return query, relevance
+    return query, getattr(Property, sort_key(params.sort_by), Property.created_at)
+
+
+# Enough to tell whether a listing changed (updated_at is bumped on every
+# ORM update and by FX repricing), for ETags and Last-Modified
+VERSION_COLUMNS = (
+    Property.id,
+    Property.updated_at,
+    Property.created_at,
+)
+
+
+def _featured_query(columns, limit: int):
+    return (
+        select(*columns)
+        .where(
+            and_(
+                Property.is_featured == True,
+                Property.is_active == True,
+                Property.status == PropertyStatus.AVAILABLE,
+            )
+        )
+        .order_by(Property.created_at.desc(), Property.id.desc())
+        .limit(limit)
+    )
+
+
+def _listings_query(db, skip: int, limit: int, after, columns):
+    query = _order_and_seek(
+        db, select(*(columns or [Property])), Property.id, "asc", after
+    )
+    if after is None:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def _batch_query(property_ids: List[int]):
+    return (
+        select(Property)
+        .where(Property.id.in_(set(property_ids)))
+        .options(selectinload(Property.images))
+    )
+
+
+def _trending_query(property_ids: List[int]):
+    return (
+        select(Property, func.coalesce(PropertyViewCount.view_count, 0))
+        .outerjoin(PropertyViewCount, PropertyViewCount.property_id == Property.id)
+        .where(
+            Property.id.in_(property_ids),
+            Property.is_active == True,
+            Property.status == PropertyStatus.AVAILABLE,
+        )
+    )
+
+
+def _in_request_order(property_ids: List[int], properties):
+    by_id = {property.id: property for property in properties}
+    for property in by_id.values():
+        property.images.sort(key=lambda image: (image.order_index or 0, image.id))
+    return [(pid, by_id.get(pid)) for pid in property_ids]
+
+
+def _not_found(property_id: int):
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Property with ID {property_id} not found",
+    )
+
+
+def _similar(db: Session, property: Property, limit: int, columns=None):
+    similar_listings.ensure_fresh(db)
+    ids = similar_listings.similar_ids(property, limit)
+    return fetch_in_order(db, ids, columns)
+
+
+def _agent_listings_query(db, agent_id: int, skip: int, limit: int, after, columns):
+    query = _order_and_seek(
+        db,
+        select(*(columns or [Property])).where(Property.agent_id == agent_id),
+        Property.created_at,
+        "desc",
+        after,
+    )
+    return query.offset(skip).limit(limit)
+
+
+def _invalidate_searches(*rows):
+    """Drop cached pages and hit counts a listing (before/after a write) is in."""
+    search_cache.invalidate(*rows)
+    hit_counts.invalidate(*rows)
 
 
 class PropertyService:
@@ -32,6 +354,12 @@ class PropertyService:
         db.add(new_property)
         db.commit()
         db.refresh(new_property)  # Return object with ID populated
+        listing_index.upsert(new_property)
+        similar_listings.upsert(new_property)
+        after = snapshot(new_property)
+        place_index.apply(None, after)
+        _invalidate_searches(after)
+        alert_saved_searches(db, new_property, after)
 
         # Decrement subscription listing_limit (remaining slots) after successful create
         if subscription and getattr(subscription, "listing_limit", None) is not None:
@@ -42,9 +370,118 @@ class PropertyService:
 
         return new_property
 
-    async def get_properties(self, db: Session, skip: int = 0, limit: int = 100):
-        result = db.execute(select(Property).offset(skip).limit(limit))
-        return result.scalars().all()
+    async def import_properties(
+        self,
+        db: Session,
+        rows: Iterable[ImportRow],
+        agent_id: int,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> PropertyImportResult:
+        """
+        Insert validated listings in batches of ``batch_size``: one multi-row
+        INSERT ... RETURNING, one tag insert, one listing_limit decrement and
+        one commit per batch. Rows beyond the subscription's remaining slots
+        are reported as errors instead of inserted.
+        """
+        subscription = SubscriptionService(db).get_user_active_subscription(agent_id)
+        created: List[int] = []
+        errors: List[PropertyImportError] = []
+        batch = []
+
+        def flush():
+            ids, rejected = self._import_batch(db, batch, agent_id, subscription)
+            created.extend(ids)
+            errors.extend(
+                PropertyImportError(row=number, errors=["Listing limit reached"])
+                for number, _ in rejected
+            )
+            batch.clear()
+
+        for number, listing, row_errors in rows:
+            if row_errors:
+                errors.append(PropertyImportError(row=number, errors=row_errors))
+                continue
+            batch.append((number, listing))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+        errors.sort(key=lambda e: e.row)
+        return PropertyImportResult(
+            created=len(created),
+            failed=len(errors),
+            property_ids=created,
+            errors=errors,
+        )
+
+    def _import_batch(self, db: Session, batch, agent_id: int, subscription):
+        rejected = []
+        limit = getattr(subscription, "listing_limit", None) if subscription else None
+        if limit is not None and limit < len(batch):
+            keep = max(limit, 0)
+            batch, rejected = batch[:keep], batch[keep:]
+        if not batch:
+            return [], rejected
+
+        rates = usd_rates(
+            db.connection(),
+            {(listing.currency or BASE_CURRENCY).upper() for _, listing in batch},
+        )
+        values = []
+        for _, listing in batch:
+            row = listing.model_dump()
+            row["agent_id"] = agent_id
+            row["price_usd"] = to_usd(row["price"], row["currency"], rates)
+            if row["latitude"] is not None and row["longitude"] is not None:
+                row["geo_cell"] = encode_cell(row["latitude"], row["longitude"])
+            values.append(row)
+
+        # ORM bulk INSERT ... RETURNING skips per-object flush events, so
+        # price_usd is set above and the tag and market rollup rows the mapper
+        # events would write are added for the whole batch
+        properties = db.scalars(
+            insert(Property).returning(Property, sort_by_parameter_order=True), values
+        ).all()
+        add_property_tags(
+            db.connection(),
+            [(p.id, {k: getattr(p, k) for k in TAG_KINDS}) for p in properties],
+        )
+        add_listing_rollups(db.connection(), properties)
+
+        if limit is not None:
+            subscription.listing_limit = limit - len(properties)
+            if subscription.listing_limit <= 0:
+                subscription.status = SubscriptionStatus.EXPIRED.value
+
+        # Detach so the loaded rows are not expired (and reloaded) by commit
+        for property in properties:
+            db.expunge(property)
+        db.commit()
+
+        snapshots = [snapshot(p) for p in properties]
+        for property, after in zip(properties, snapshots):
+            listing_index.upsert(property)
+            similar_listings.upsert(property)
+            place_index.apply(None, after)
+        _invalidate_searches(*snapshots)
+        # Imported listings alert saved searches like single creates
+        for property, after in zip(properties, snapshots):
+            alert_saved_searches(db, property, after)
+        return [p.id for p in properties], rejected
+
+    async def get_properties(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        after = decode_cursor(cursor, "id", "asc")
+        columns = _projection(fields)
+        result = db.execute(_listings_query(db, skip, limit, after, columns))
+        return result.all() if columns else result.scalars().all()
 
     async def get_property(self, db: Session, property_id: int):
         result = db.execute(select(Property).where(Property.id == property_id))
@@ -57,6 +494,37 @@ class PropertyService:
             )
         return property
 
+    async def get_property_version(self, db: Session, property_id: int):
+        """VERSION_COLUMNS of one listing, without loading the row."""
+        version = db.execute(
+            select(*VERSION_COLUMNS).where(Property.id == property_id)
+        ).first()
+        if version is None:
+            raise _not_found(property_id)
+        return version
+
+    async def get_similar_properties(
+        self,
+        db: Session,
+        property_id: int,
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Up to ``limit`` active, available listings nearest to ``property_id``
+        in the similar-listings feature space, nearest first.
+        """
+        property = await self.get_property(db, property_id)
+        return _similar(db, property, limit, _projection(fields))
+
+    async def get_properties_batch(self, db: Session, property_ids: List[int]):
+        """
+        Properties for ``property_ids`` with their images, in request order;
+        ids that do not exist map to None. Two queries regardless of count.
+        """
+        result = db.execute(_batch_query(property_ids))
+        return _in_request_order(property_ids, result.scalars())
+
     async def update_property(
         self,
         db: Session,
@@ -81,6 +549,8 @@ class PropertyService:
                 detail="You are not authorized to update this property",
             )
 
+        before = snapshot(property)
+
         # Update fields selectively
         update_data = property_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
@@ -88,6 +558,12 @@ class PropertyService:
 
         db.commit()
         db.refresh(property)
+        listing_index.upsert(property)
+        similar_listings.upsert(property)
+        after = snapshot(property)
+        place_index.apply(before, after)
+        _invalidate_searches(before, after)
+        alert_saved_searches(db, property, after, before)
 
         return property
 
@@ -114,18 +590,37 @@ class PropertyService:
             db.commit()
 
         # Delete related property images first to avoid FK constraint errors
-        # (PropertyImage FK has no ondelete=CASCADE at DB level)
+        # (PropertyImage FK has no ondelete=CASCADE at DB level); their
+        # Cloudinary assets are deleted in the background (asset_cleanup)
+        queue_asset_deletes(
+            db,
+            db.execute(
+                select(PropertyImage.file_key).where(
+                    PropertyImage.property_id == property_id
+                )
+            ).scalars(),
+        )
         db.execute(delete(PropertyImage).where(PropertyImage.property_id == property_id))
 
         # Delete related favorites so SQLAlchemy doesn't try to nullify property_id (NOT NULL)
         db.execute(delete(Favorite).where(Favorite.property_id == property_id))
 
+        before = snapshot(property)
         db.delete(property)
         db.commit()
+        listing_index.remove(property_id)
+        similar_listings.remove(property_id)
+        view_counter.forget(property_id)
+        place_index.apply(before, None)
+        _invalidate_searches(before)
 
         return {"detail": "Property deleted successfully"}
 
-    async def search_properties(
+    async def search_properties(self, db: Session, **filters):
+        """``search`` on a sync Session; see AsyncPropertyService for the async one."""
+        return self.search(db, **filters)
+
+    def search(
         self,
         db: Session,
         # Location filters
@@ -163,8 +658,14 @@ class PropertyService:
         skip: int = 0,
         limit: int = 100,
         # Sorting
-        sort_by: str = "created_at",
+        sort_by: Optional[str] = None,
         sort_order: str = "desc",
+        # Keyset pagination ("" for the first page, then next_cursor)
+        cursor: Optional[str] = None,
+        # Projection: return Core rows of just these columns
+        fields: Optional[Sequence[str]] = None,
+        # Also return a HitCount for the whole result set
+        include_total: bool = False,
     ):
         """
         Comprehensive property search with multiple filter options.
@@ -180,129 +681,215 @@ class PropertyService:
             min_lot_size, max_lot_size: Lot size range
             min_year_built, max_year_built: Year built range
             features, amenities: Lists of features/amenities to filter by
-            search_query: Text search in title and description
+            search_query: Full-text search in title and description
             is_featured, is_active: Boolean filters
             skip, limit: Pagination parameters
-            sort_by: Field to sort by (default: created_at)
+            sort_by: Field to sort by (default: relevance when search_query
+                is set, otherwise created_at)
             sort_order: Sort order (asc/desc, default: desc)
+            cursor: Opaque keyset cursor; when set, skip is ignored
+            fields: Columns to select; rows are then returned as Core Row
+                objects (plus a relevance column for relevance sorting)
+                instead of ORM instances
+            include_total: Return ``(properties, HitCount)``; see count_hits
         """
+        sort_by = resolve_sort_by(sort_by, search_query)
+        after = decode_cursor(cursor, sort_by, sort_order)
+        if after is not None:
+            skip = 0
 
-        # Start with base query
-        query = select(Property)
+        params = PropertySearchParams.model_construct(
+            city=city,
+            state=state,
+            country=country,
+            zip_code=zip_code,
+            min_price=min_price,
+            max_price=max_price,
+            currency=currency,
+            property_type=property_type,
+            status=status,
+            listing_type=listing_type,
+            min_bedrooms=min_bedrooms,
+            max_bedrooms=max_bedrooms,
+            min_bathrooms=min_bathrooms,
+            max_bathrooms=max_bathrooms,
+            min_square_feet=min_square_feet,
+            max_square_feet=max_square_feet,
+            min_lot_size=min_lot_size,
+            max_lot_size=max_lot_size,
+            min_year_built=min_year_built,
+            max_year_built=max_year_built,
+            features=features,
+            amenities=amenities,
+            search_query=search_query,
+            is_featured=is_featured,
+            is_active=is_active,
+            skip=skip,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        )
 
-        # Build filter conditions
-        conditions = []
+        columns = _projection(fields, sort_key(sort_by))
+        properties = self._cached_search(db, params, after, columns)
+        if not include_total:
+            return properties
+        if after is None and (0 < len(properties) < limit or not (properties or skip)):
+            # A short offset page already holds the rest of the result set
+            return properties, HitCount(skip + len(properties), True)
+        return properties, self.count_hits(db, params)
 
-        # Location filters
-        if city:
-            conditions.append(func.lower(Property.city).contains(func.lower(city)))
-        if state:
-            conditions.append(func.lower(Property.state).contains(func.lower(state)))
-        if country:
-            conditions.append(
-                func.lower(Property.country).contains(func.lower(country))
-            )
-        if zip_code:
-            conditions.append(Property.zip_code == zip_code)
+    def _cached_search(
+        self, db: Session, params: PropertySearchParams, after=None, columns=None
+    ):
+        sort_by = params.sort_by
+        # Cached pages and the index compare USD prices at the rates they saw
+        rate_watcher.check(db)
+        if not settings.SEARCH_CACHE_ENABLED:
+            return self._run_search(db, params, after, columns)
 
-        # Price filters
-        if min_price is not None:
-            conditions.append(Property.price >= min_price)
-        if max_price is not None:
-            conditions.append(Property.price <= max_price)
-        if currency:
-            conditions.append(Property.currency == currency.upper())
+        # Cached pages hold ids (and relevance scores); rows are always fresh
+        key = search_cache.key(params, after)
+        cached = search_cache.get(key)
+        if cached is not None:
+            properties = fetch_in_order(db, [id for id, _ in cached], columns)
+            if sort_by != "relevance":
+                return properties
+            scores = dict(cached)
+            if columns:
+                return [
+                    {**row._mapping, "relevance": scores[row.id]} for row in properties
+                ]
+            for property in properties:
+                property.relevance = scores[property.id]
+            return properties
 
-        # Property details
-        if property_type:
-            conditions.append(Property.property_type == property_type)
-        if status:
-            conditions.append(Property.status == status)
-        if listing_type:
-            conditions.append(Property.listing_type == listing_type)
-
-        # Bedroom filters
-        if min_bedrooms is not None:
-            conditions.append(Property.bedrooms >= min_bedrooms)
-        if max_bedrooms is not None:
-            conditions.append(Property.bedrooms <= max_bedrooms)
-
-        # Bathroom filters
-        if min_bathrooms is not None:
-            conditions.append(Property.bathrooms >= min_bathrooms)
-        if max_bathrooms is not None:
-            conditions.append(Property.bathrooms <= max_bathrooms)
-
-        # Square footage filters
-        if min_square_feet is not None:
-            conditions.append(Property.square_feet >= min_square_feet)
-        if max_square_feet is not None:
-            conditions.append(Property.square_feet <= max_square_feet)
-
-        # Lot size filters
-        if min_lot_size is not None:
-            conditions.append(Property.lot_size >= min_lot_size)
-        if max_lot_size is not None:
-            conditions.append(Property.lot_size <= max_lot_size)
-
-        # Year built filters
-        if min_year_built is not None:
-            conditions.append(Property.year_built >= min_year_built)
-        if max_year_built is not None:
-            conditions.append(Property.year_built <= max_year_built)
-
-        # Features filter (JSON contains)
-        if features:
-            for feature in features:
-                conditions.append(Property.features.contains([feature]))
-
-        # Amenities filter (JSON contains)
-        if amenities:
-            for amenity in amenities:
-                conditions.append(Property.amenities.contains([amenity]))
-
-        # Text search in title and description
-        if search_query:
-            search_conditions = [
-                func.lower(Property.title).contains(func.lower(search_query)),
-                func.lower(Property.description).contains(func.lower(search_query)),
-            ]
-            conditions.append(or_(*search_conditions))
+        properties = self._run_search(db, params, after, columns)
+        search_cache.put(
+            key, [(p.id, getattr(p, "relevance", None)) for p in properties]
+        )
+        return properties
 
-        # Special filters
-        if is_featured is not None:
-            conditions.append(Property.is_featured == is_featured)
-        if is_active is not None:
-            conditions.append(Property.is_active == is_active)
+    def _run_search(
+        self, db: Session, params: PropertySearchParams, after=None, columns=None
+    ):
+        sort_by, sort_order = params.sort_by, params.sort_order
 
-        # Apply all conditions
-        if conditions:
-            query = query.where(and_(*conditions))
+        # Serve from the in-memory listing index when enabled and the
+        # filters are ones it can evaluate; only the page is read from the DB.
+        if settings.LISTING_INDEX_ENABLED and listing_index.supports(params):
+            listing_index.ensure_fresh(db)
+            return fetch_in_order(
+                db, listing_index.search_ids(params, after=after), columns
+            )
 
-        # Sorting
-        sort_column = getattr(Property, sort_by, Property.created_at)
-        if sort_order.lower() == "desc":
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
+        # Filters, full-text match and sort column
+        base = select(*columns) if columns else select(Property)
+        query, sort_column = _filtered_query(db, base, params)
+        if sort_by == "relevance":
+            query = query.add_columns(sort_column.label("relevance"))
+
+        # Sorting (ties broken by id) and keyset seek
+        query = _order_and_seek(db, query, sort_column, sort_order, after)
 
         # Pagination
-        query = query.offset(skip).limit(limit)
+        query = query.offset(params.skip).limit(params.limit)
 
         # Execute query
         result = db.execute(query)
-        properties = result.scalars().all()
+        if columns:
+            return result.all()
+        if sort_by != "relevance":
+            return result.scalars().all()
 
+        # Keep the score on each row so the next keyset cursor can use it
+        properties = []
+        for property, score in result.all():
+            property.relevance = score
+            properties.append(property)
         return properties
 
+    def count_hits(self, db: Session, params: PropertySearchParams) -> HitCount:
+        """
+        Total listings matching ``params`` (paging ignored).
+
+        Structured filters are counted exactly, from the listing index when
+        it can answer. Free-text searches stop counting after
+        SEARCH_COUNT_LIMIT matches and report that as an estimate. With the
+        search cache enabled counts are cached per filter set as well.
+        """
+        rate_watcher.check(db)
+        if settings.SEARCH_CACHE_ENABLED:
+            key = hit_counts.key(params)
+            cached = hit_counts.get(key)
+            if cached is not None:
+                return cached
+
+        if settings.LISTING_INDEX_ENABLED and listing_index.filterable(params):
+            listing_index.ensure_fresh(db)
+            hits = HitCount(listing_index.count(params), True)
+        elif params.search_query:
+            bound = settings.SEARCH_COUNT_LIMIT
+            query, _ = _filtered_query(db, select(Property.id), params)
+            n = db.scalar(
+                select(func.count()).select_from(query.limit(bound + 1).subquery())
+            )
+            hits = HitCount(min(n, bound), n <= bound)
+        else:
+            query, _ = _filtered_query(db, select(func.count(Property.id)), params)
+            hits = HitCount(db.scalar(query), True)
+
+        if settings.SEARCH_CACHE_ENABLED:
+            hit_counts.put(key, hits)
+        return hits
+
+    def stream_search(
+        self, db: Session, search_params: PropertySearchParams, batch_size: int = 1000
+    ):
+        """
+        Yield every listing matching ``search_params`` (skip/limit ignored) as
+        lists of at most ``batch_size`` Core rows of EXPORT_COLUMNS.
+
+        Rows come from a server-side cursor (yield_per), so memory does not
+        grow with the number of matches.
+        """
+        params = search_params.model_copy(
+            update={
+                "sort_by": resolve_sort_by(
+                    search_params.sort_by, search_params.search_query
+                )
+            }
+        )
+        columns = [Property.__table__.c[name] for name in EXPORT_COLUMNS]
+        query, sort_column = _filtered_query(db, select(*columns), params)
+        query = _order_and_seek(db, query, sort_column, params.sort_order)
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
     async def search_properties_with_params(
-        self, db: Session, search_params: PropertySearchParams
+        self,
+        db: Session,
+        search_params: PropertySearchParams,
+        fields: Optional[Sequence[str]] = None,
+        include_total: bool = False,
+    ):
+        return self.search_with_params(db, search_params, fields, include_total)
+
+    def search_with_params(
+        self,
+        db: Session,
+        search_params: PropertySearchParams,
+        fields: Optional[Sequence[str]] = None,
+        include_total: bool = False,
     ):
         """
         Search properties using PropertySearchParams schema.
         This is a convenience method that unpacks the search parameters.
         """
-        return await self.search_properties(
+        return self.search(
             db=db,
             city=search_params.city,
             state=search_params.state,
@@ -333,7 +920,84 @@ class PropertyService:
             limit=search_params.limit,
             sort_by=search_params.sort_by,
             sort_order=search_params.sort_order,
+            cursor=search_params.cursor,
+            fields=fields,
+            include_total=include_total,
+        )
+
+    async def get_search_facets(
+        self, db: Session, search_params: PropertySearchParams, top_tags: int = 10
+    ):
+        """
+        Facet counts (type, listing type, status, bedroom and price buckets,
+        top features/amenities) for everything matching ``search_params``.
+
+        On the SQL path this is one grouped query over all scalar facets plus
+        one over the tag index; the listing index answers from one mask.
+        """
+        if settings.LISTING_INDEX_ENABLED and listing_index.filterable(search_params):
+            rate_watcher.check(db)
+            listing_index.ensure_fresh(db)
+            return build_facets(listing_index.facet_counts(search_params), top_tags)
+
+        conditions = _search_conditions(search_params)
+        if search_params.search_query:
+            conditions.append(
+                Property.id.in_(matching_ids(db, search_params.search_query))
+            )
+
+        # Bucket boundaries are inlined so GROUP BY sees identical expressions
+        bedroom_bucket = case(
+            (
+                Property.bedrooms >= literal_column(str(BEDROOMS_CAP)),
+                literal_column(str(BEDROOMS_CAP)),
+            ),
+            else_=Property.bedrooms,
+        )
+        price_column = getattr(Property, price_field(search_params.currency))
+        price_bucket = case(
+            (price_column.is_(None), None),
+            *[
+                (price_column < literal_column(str(edge)), literal_column(str(i)))
+                for i, edge in enumerate(PRICE_BUCKET_EDGES[1:])
+            ],
+            else_=literal_column(str(len(PRICE_BUCKET_EDGES) - 1)),
         )
+        dimensions = [
+            Property.property_type,
+            Property.listing_type,
+            Property.status,
+            bedroom_bucket,
+            price_bucket,
+        ]
+        counts = empty_counts()
+        grouped = db.execute(
+            select(*dimensions, func.count())
+            .where(*conditions)
+            .group_by(*dimensions)
+        )
+        for property_type, listing_type, status, bedrooms, price, n in grouped:
+            counts["total"] += n
+            counts["property_type"][property_type] += n
+            counts["listing_type"][listing_type] += n
+            counts["status"][status] += n
+            if bedrooms is not None:
+                counts["bedrooms"][bedrooms] += n
+            if price is not None:
+                counts["price"][price] += n
+
+        tagged = db.execute(
+            select(Tag.kind, Tag.name, func.count())
+            .select_from(Property)
+            .join(property_tags, property_tags.c.property_id == Property.id)
+            .join(Tag, Tag.id == property_tags.c.tag_id)
+            .where(*conditions)
+            .group_by(Tag.kind, Tag.name)
+        )
+        for kind, name, n in tagged:
+            counts[kind][name] += n
+
+        return build_facets(counts, top_tags)
 
     async def get_properties_by_location(
         self,
@@ -344,15 +1008,32 @@ class PropertyService:
         limit: int = 50,
     ):
         """
-
-
         Find properties within a certain radius of given coordinates.
-        Uses Haversine formula for distance calculation.
-
 
+        Candidates are narrowed with indexed geo_cell ranges and a lat/lon
+        bounding box first; only those get the exact Haversine distance.
         """
         EARTH_RADIUS = 6371  # km
 
+        boxes = bounding_boxes(latitude, longitude, radius_km)
+        prefilter = and_(
+            or_(
+                *[
+                    Property.geo_cell.between(low, high)
+                    for low, high in cell_ranges(boxes)
+                ]
+            ),
+            or_(
+                *[
+                    and_(
+                        Property.latitude.between(min_lat, max_lat),
+                        Property.longitude.between(min_lon, max_lon),
+                    )
+                    for min_lat, max_lat, min_lon, max_lon in boxes
+                ]
+            ),
+        )
+
         distance_formula = EARTH_RADIUS * func.acos(
             func.cos(func.radians(latitude))
             * func.cos(func.radians(Property.latitude))
@@ -390,6 +1071,7 @@ class PropertyService:
                 Property.is_active,
                 Property.created_at,
                 Property.updated_at,
+                Property.listing_type,
                 distance_formula.label("distance"),
             )
             .where(
@@ -397,6 +1079,7 @@ class PropertyService:
                     Property.latitude.isnot(None),
                     Property.longitude.isnot(None),
                     Property.is_active == True,
+                    prefilter,
                 )
             )
             .subquery()
@@ -413,35 +1096,251 @@ class PropertyService:
         result = db.execute(query)
         return result.all()
 
-    async def get_featured_properties(self, db: Session, limit: int = 10):
-        """Get featured properties for homepage display."""
-        query = (
-            select(Property)
-            .where(
-                and_(
-                    Property.is_featured == True,
-                    Property.is_active == True,
-                    Property.status == PropertyStatus.AVAILABLE,
-                )
+    async def get_map_markers(
+        self,
+        db: Session,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        zoom: int,
+        search_params: Optional[PropertySearchParams] = None,
+    ):
+        """
+        Clusters (count, centroid, min/max price per grid cell; USD unless a
+        currency filter is set) or individual active listings inside a
+        viewport, optionally narrowed by search filters. Cells are geo_cell prefixes sized from the zoom level, so
+        the number of markers is bounded whatever the listing density.
+        """
+        boxes = viewport_boxes(min_lat, max_lat, min_lon, max_lon)
+        level = cluster_level(boxes, zoom, MAP_MAX_CELLS)
+        view = {"zoom": zoom, "level": level}
+        max_markers = MAP_MAX_MARKERS if zoom >= MAP_LISTING_ZOOM else -1
+        listing_columns = [
+            Property.id,
+            Property.title,
+            Property.price,
+            Property.currency,
+            Property.latitude,
+            Property.longitude,
+            Property.property_type,
+            Property.listing_type,
+            Property.overview_image,
+        ]
+
+        # The listing index clusters from its arrays in a few milliseconds
+        # where SQL would aggregate every listing in a zoomed-out viewport.
+        params = search_params or PropertySearchParams()
+        if settings.LISTING_INDEX_ENABLED and listing_index.filterable(params):
+            rate_watcher.check(db)
+            listing_index.ensure_fresh(db)
+            total, clusters, ids = listing_index.map_markers(
+                params, boxes, level, max_markers
             )
-            .order_by(Property.created_at.desc())
-            .limit(limit)
-        )
+            # Same shape as the SQL path below, also when nothing matches
+            if total <= max_markers:
+                return {
+                    **view,
+                    "total": total,
+                    "listings": fetch_in_order(db, ids, listing_columns),
+                }
+            return {**view, "total": total, "clusters": clusters}
+
+        conditions = [
+            Property.is_active == True,
+            or_(
+                *[
+                    Property.geo_cell.between(low, high)
+                    for low, high in cell_ranges(boxes)
+                ]
+            ),
+            or_(
+                *[
+                    and_(
+                        Property.latitude.between(lat0, lat1),
+                        Property.longitude.between(lon0, lon1),
+                    )
+                    for lat0, lat1, lon0, lon1 in boxes
+                ]
+            ),
+        ]
+        conditions.extend(_search_conditions(params))
+        if params.search_query:
+            conditions.append(Property.id.in_(matching_ids(db, params.search_query)))
+
+        cell = Property.geo_cell.op(">>")(2 * (CELL_BITS - level))
+        price = getattr(Property, price_field(params.currency))
+        clusters = db.execute(
+            select(
+                cell.label("cell"),
+                func.count().label("count"),
+                func.avg(Property.latitude).label("latitude"),
+                func.avg(Property.longitude).label("longitude"),
+                func.min(price).label("min_price"),
+                func.max(price).label("max_price"),
+            )
+            .where(*conditions)
+            .group_by(cell)
+            .order_by(cell)
+        ).all()
+        view["total"] = total = sum(c.count for c in clusters)
+        if total <= max_markers:
+            listings = db.execute(
+                select(*listing_columns).where(*conditions).order_by(Property.id)
+            ).all()
+            return {**view, "listings": listings}
+        return {**view, "clusters": clusters}
+
+    async def get_featured_properties(
+        self, db: Session, limit: int = 10, fields: Optional[Sequence[str]] = None
+    ):
+        """Get featured properties for homepage display."""
+        query = _featured_query(_projection(fields) or [Property], limit)
 
         result = db.execute(query)
-        return result.scalars().all()
+        return result.all() if fields else result.scalars().all()
+
+    async def get_featured_versions(self, db: Session, limit: int = 10):
+        """(id, updated_at, created_at) of the featured page, for its ETag."""
+        return db.execute(_featured_query(VERSION_COLUMNS, limit)).all()
 
     async def get_properties_by_agent(
-        self, db: Session, agent_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        agent_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
     ):
         """Get all properties for a specific agent."""
-        query = (
-            select(Property)
-            .where(Property.agent_id == agent_id)
-            .order_by(Property.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        after = decode_cursor(cursor, "created_at", "desc")
+        if after is not None:
+            skip = 0
+        columns = _projection(fields, "created_at")
+        # Always SQL: agents page their own listings right after editing them,
+        # which a per-worker index may not have caught up with yet
+        query = _agent_listings_query(db, agent_id, skip, limit, after, columns)
+        result = db.execute(query)
+        return result.all() if columns else result.scalars().all()
+
+
+class AsyncPropertyService:
+    """
+    The hot read paths of PropertyService on an AsyncSession, so a request
+    waiting on the database does not hold up the event loop (and every other
+    request and WebSocket on the worker). Plain queries are awaited directly;
+    searches and index-backed reads run the synchronous implementation through
+    ``AsyncSession.run_sync``, whose queries still go through the async driver.
+    """
+
+    async def get_properties(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        after = decode_cursor(cursor, "id", "asc")
+        columns = _projection(fields)
+        result = await db.execute(_listings_query(db, skip, limit, after, columns))
+        return result.all() if columns else result.scalars().all()
+
+    async def get_property(self, db: AsyncSession, property_id: int):
+        property = await db.scalar(select(Property).where(Property.id == property_id))
+        if not property:
+            raise _not_found(property_id)
+        return property
+
+    async def get_property_version(self, db: AsyncSession, property_id: int):
+        """VERSION_COLUMNS of one listing, without loading the row."""
+        result = await db.execute(
+            select(*VERSION_COLUMNS).where(Property.id == property_id)
         )
+        version = result.first()
+        if version is None:
+            raise _not_found(property_id)
+        return version
 
-        result = db.execute(query)
-        return result.scalars().all()
+    async def get_similar_properties(
+        self,
+        db: AsyncSession,
+        property_id: int,
+        limit: int = 10,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        property = await self.get_property(db, property_id)
+        return await db.run_sync(_similar, property, limit, _projection(fields))
+
+    async def get_properties_batch(self, db: AsyncSession, property_ids: List[int]):
+        result = await db.execute(_batch_query(property_ids))
+        return _in_request_order(property_ids, result.scalars())
+
+    async def get_trending_properties(self, db: AsyncSession, limit: int = 10):
+        """
+        Active, available listings with the highest decayed view scores in
+        this worker, best first, with ``views`` and ``trending_score`` set.
+        Only the ranked ids are read from the database.
+        """
+        ranked = view_counter.trending(limit * TRENDING_OVERFETCH)
+        if not ranked:
+            return []
+        result = await db.execute(_trending_query([pid for pid, _ in ranked]))
+        by_id = {property.id: (property, views) for property, views in result.all()}
+        trending = []
+        for property_id, score in ranked:
+            if property_id not in by_id:
+                continue
+            property, views = by_id[property_id]
+            property.views = views + view_counter.pending(property_id)
+            property.trending_score = score
+            trending.append(property)
+        return trending[:limit]
+
+    async def search_properties(self, db: AsyncSession, **filters):
+        """PropertyService.search, without blocking the event loop."""
+        return await db.run_sync(
+            lambda session: PropertyService().search(session, **filters)
+        )
+
+    async def search_properties_with_params(
+        self,
+        db: AsyncSession,
+        search_params: PropertySearchParams,
+        fields: Optional[Sequence[str]] = None,
+        include_total: bool = False,
+    ):
+        return await db.run_sync(
+            PropertyService().search_with_params, search_params, fields, include_total
+        )
+
+    async def get_featured_properties(
+        self, db: AsyncSession, limit: int = 10, fields: Optional[Sequence[str]] = None
+    ):
+        result = await db.execute(
+            _featured_query(_projection(fields) or [Property], limit)
+        )
+        return result.all() if fields else result.scalars().all()
+
+    async def get_featured_versions(self, db: AsyncSession, limit: int = 10):
+        return (await db.execute(_featured_query(VERSION_COLUMNS, limit))).all()
+
+    async def get_properties_by_agent(
+        self,
+        db: AsyncSession,
+        agent_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        after = decode_cursor(cursor, "created_at", "desc")
+        if after is not None:
+            skip = 0
+        columns = _projection(fields, "created_at")
+        # Always SQL: agents page their own listings right after editing them,
+        # which a per-worker index may not have caught up with yet
+        query = _agent_listings_query(db, agent_id, skip, limit, after, columns)
+        result = await db.execute(query)
+        return result.all() if columns else result.scalars().all()
@@ -0,0 +1,198 @@
+"""
+Saved searches and new-listing alerts.
+
+A saved search stores its normalised filters (see ``search_cache.normalize``)
+plus an inverted-index key: the folded city, the property type and the (USD) price
+range as log-scale bands. When a listing is created or updated,
+``alert_saved_searches`` looks up only the searches whose key admits the
+listing (one indexed query: city IN (city, any), type IN (type, any), band
+within range), checks each candidate's full filters, and notifies the owners
+of searches the listing has just started to match. A write therefore costs
+O(candidate searches), however many searches are saved.
+
+The city key is the whole city name, so alerts match cities exactly where the
+interactive search would also accept a substring.
+"""
+
+import asyncio
+from typing import List, Mapping, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.models.property import Property
+from app.models.saved_search import (
+    ANY,
+    SavedSearch,
+    fold_city,
+    match_key,
+    price_band,
+)
+from app.schemas.property import PropertySearchParams
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchUpdate
+from app.services.fulltext import apply_fulltext
+from app.services.notifications import dispatch_notification
+from app.services.search_cache import matches, normalize
+
+Row = Mapping[str, object]
+
+# Notification tasks in flight, kept referenced until they finish
+_pending = set()
+
+
+def _plain(value):
+    return getattr(value, "value", value)
+
+
+class SavedSearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _filters(self, params: PropertySearchParams) -> dict:
+        filters = normalize(params)
+        if not filters:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A saved search needs at least one filter",
+            )
+        # JSON has no tuples
+        return {k: list(v) if isinstance(v, tuple) else v for k, v in filters.items()}
+
+    def create_saved_search(self, data: SavedSearchCreate, user_id: int):
+        filters = self._filters(data.filters)
+        saved = SavedSearch(
+            user_id=user_id, name=data.name, filters=filters, **match_key(filters)
+        )
+        self.db.add(saved)
+        self.db.commit()
+        self.db.refresh(saved)
+        return saved
+
+    def get_saved_searches(self, user_id: int):
+        return (
+            self.db.query(SavedSearch)
+            .filter(SavedSearch.user_id == user_id)
+            .order_by(SavedSearch.id)
+            .all()
+        )
+
+    def get_saved_search(self, search_id: int, user_id: int):
+        saved = (
+            self.db.query(SavedSearch)
+            .filter(SavedSearch.id == search_id, SavedSearch.user_id == user_id)
+            .first()
+        )
+        if not saved:
+            raise HTTPException(status_code=404, detail="Saved search not found")
+        return saved
+
+    def update_saved_search(
+        self, search_id: int, data: SavedSearchUpdate, user_id: int
+    ):
+        saved = self.get_saved_search(search_id, user_id)
+        if data.name is not None:
+            saved.name = data.name
+        if data.filters is not None:
+            filters = self._filters(data.filters)
+            saved.filters = filters
+            for column, value in match_key(filters).items():
+                setattr(saved, column, value)
+        self.db.commit()
+        self.db.refresh(saved)
+        return saved
+
+    def delete_saved_search(self, search_id: int, user_id: int):
+        saved = self.get_saved_search(search_id, user_id)
+        self.db.delete(saved)
+        self.db.commit()
+
+
+def _qualifies(db: Session, search: SavedSearch, listing_id: int, row: Row) -> bool:
+    if not row["is_active"] or not matches(search.filters, row):
+        return False
+    # Unless the search asks for a status, only listings on the market count
+    if "status" not in search.filters and _plain(row["status"]) not in (
+        None,
+        "available",
+    ):
+        return False
+    search_query = search.filters.get("search_query")
+    if search_query:
+        query, _ = apply_fulltext(
+            db, select(Property.id).where(Property.id == listing_id), search_query
+        )
+        return db.execute(query.limit(1)).first() is not None
+    return True
+
+
+def candidate_searches(db: Session, row: Row, exclude_user: Optional[int] = None):
+    """Saved searches whose index key admits a listing with snapshot ``row``."""
+    band = price_band(row["price_usd"])
+    query = select(SavedSearch).where(
+        SavedSearch.city_key.in_((fold_city(row["city"]), ANY)),
+        SavedSearch.property_type.in_((_plain(row["property_type"]) or ANY, ANY)),
+    )
+    if band is None:
+        query = query.where(
+            SavedSearch.price_band_low.is_(None), SavedSearch.price_band_high.is_(None)
+        )
+    else:
+        query = query.where(
+            or_(SavedSearch.price_band_low.is_(None), SavedSearch.price_band_low <= band),
+            or_(
+                SavedSearch.price_band_high.is_(None),
+                SavedSearch.price_band_high >= band,
+            ),
+        )
+    if exclude_user is not None:
+        query = query.where(SavedSearch.user_id != exclude_user)
+    return db.execute(query).scalars().all()
+
+
+def newly_matching(
+    db: Session,
+    listing_id: int,
+    after: Row,
+    before: Optional[Row] = None,
+    exclude_user: Optional[int] = None,
+) -> List[SavedSearch]:
+    """Saved searches the listing matches now but did not match ``before``."""
+    if not after["is_active"]:
+        return []
+    return [
+        search
+        for search in candidate_searches(db, after, exclude_user)
+        if _qualifies(db, search, listing_id, after)
+        and not (before is not None and _qualifies(db, search, listing_id, before))
+    ]
+
+
+def _dispatch(user_id: int, title: str, body: str, payload: dict):
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        dispatch_notification(user_id, title, body, payload)
+        return
+    task = loop.create_task(
+        asyncio.to_thread(dispatch_notification, user_id, title, body, payload)
+    )
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+def alert_saved_searches(
+    db: Session, listing: Property, after: Row, before: Optional[Row] = None
+) -> int:
+    """Notify owners of saved searches ``listing`` newly matches; returns the count."""
+    searches = newly_matching(db, listing.id, after, before, exclude_user=listing.agent_id)
+    for search in searches:
+        currency = (listing.currency or "USD").upper()
+        _dispatch(
+            search.user_id,
+            "New listing for your saved search",
+            f'{listing.title} in {listing.city} ({currency} {listing.price:,.0f}) '
+            f'matches "{search.name}"',
+            {"saved_search_id": search.id, "property_id": listing.id},
+        )
+    return len(searches)
@@ -0,0 +1,212 @@
+"""
+Per-process LRU + TTL cache of /properties/search result pages.
+
+Entries are keyed on normalised PropertySearchParams (plus the keyset cursor
+position) and hold only the page's property ids, so a hit still loads fresh
+rows. Writes invalidate just the entries whose filters match the listing
+before or after the change; a listing that matches neither cannot move in or
+out of any cached page. Other workers only see the TTL, so keep it short.
+
+Total-hit counts for a filter set (shared by all of its pages) are kept the
+same way in ``hit_counts``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.models.fx_rate import price_field
+from app.models.property import Property, fold_place
+from app.schemas.property import PropertySearchParams
+
+# Filters compared case-insensitively by the search (substring / FTS match)
+_PLACES = ("city", "state", "country")
+_FOLDED = (*_PLACES, "currency", "search_query")
+_TAGS = ("features", "amenities")
+_RANGES = {
+    "price": ("min_price", "max_price"),
+    "bedrooms": ("min_bedrooms", "max_bedrooms"),
+    "bathrooms": ("min_bathrooms", "max_bathrooms"),
+    "square_feet": ("min_square_feet", "max_square_feet"),
+    "lot_size": ("min_lot_size", "max_lot_size"),
+    "year_built": ("min_year_built", "max_year_built"),
+}
+_EQUAL = ("zip_code", "property_type", "listing_type", "status", "is_featured", "is_active")
+SNAPSHOT_FIELDS = (
+    "city",
+    "state",
+    "country",
+    "currency",
+    *_RANGES,
+    "price_usd",
+    *_EQUAL,
+    *_TAGS,
+)
+
+CacheKey = Tuple
+Row = Mapping[str, object]
+
+
+class HitCount(NamedTuple):
+    """Matches for a search; when not exact, counting stopped at ``total``."""
+
+    total: int
+    exact: bool
+
+
+def normalize(params: PropertySearchParams) -> Dict[str, object]:
+    """Filters that are set, in a canonical form; equal searches compare equal."""
+    filters = {}
+    for name in (*_FOLDED, *_TAGS, *_EQUAL, *(b for pair in _RANGES.values() for b in pair)):
+        value = getattr(params, name, None)
+        if value is None:
+            continue
+        if name in _PLACES:
+            # Folded exactly as the SQL filter folds the value
+            value = fold_place(value)
+            if not value:
+                continue
+        elif name in _FOLDED:
+            value = value.lower()
+            if not value:
+                continue
+        elif name in _TAGS:
+            if not value:
+                continue
+            value = tuple(sorted(set(value)))
+        elif name == "zip_code":
+            if not value:
+                continue
+        elif hasattr(value, "value"):
+            value = value.value
+        filters[name] = value
+    return filters
+
+
+def snapshot(prop: Property) -> Dict[str, object]:
+    """The column values search filters look at, captured before/after a write."""
+    return {name: getattr(prop, name, None) for name in SNAPSHOT_FIELDS}
+
+
+def matches(filters: Mapping[str, object], row: Row) -> bool:
+    """
+    Whether a listing with column values ``row`` could satisfy ``filters``.
+    Errs towards True (e.g. full-text queries) since that only costs a miss.
+    """
+    # Same comparisons as the SQL filters: folded needle in lower(column),
+    # currency equal to the upper-cased filter
+    for name in _PLACES:
+        if name in filters and filters[name] not in (row[name] or "").lower():
+            return False
+    if "currency" in filters and filters["currency"].upper() != row["currency"]:
+        return False
+    for name in _EQUAL:
+        if name in filters:
+            value = row[name]
+            if filters[name] != getattr(value, "value", value):
+                return False
+    for column, (low, high) in _RANGES.items():
+        if column == "price":
+            column = price_field(filters.get("currency"))
+        value = row[column]
+        if low in filters and (value is None or value < filters[low]):
+            return False
+        if high in filters and (value is None or value > filters[high]):
+            return False
+    for name in _TAGS:
+        if name in filters and not set(filters[name]) <= set(row[name] or []):
+            return False
+    return True
+
+
+class SearchCache:
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, filters, [(id, relevance), ...])
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(params: PropertySearchParams, after: Optional[tuple] = None) -> CacheKey:
+        page = (params.skip, params.limit, params.sort_by, params.sort_order.lower(), after)
+        return tuple(sorted(normalize(params).items())) + (("__page__", page),)
+
+    def get(self, key: CacheKey) -> Optional[List[Tuple[int, Optional[float]]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: CacheKey, rows: List[Tuple[int, Optional[float]]]):
+        filters = dict(item for item in key if item[0] != "__page__")
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, filters, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *rows: Optional[Row]):
+        """Drop entries whose filters match any of the given listing snapshots."""
+        rows = [row for row in rows if row is not None]
+        with self._lock:
+            stale = [
+                key
+                for key, (_, filters, _) in self._entries.items()
+                if any(matches(filters, row) for row in rows)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class HitCountCache(SearchCache):
+    """HitCount per normalised filter set; paging and sorting do not matter."""
+
+    @staticmethod
+    def key(params: PropertySearchParams, after: Optional[tuple] = None) -> CacheKey:
+        return tuple(sorted(normalize(params).items()))
+
+
+search_cache = SearchCache(
+    settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_TTL_SECONDS
+)
+hit_counts = HitCountCache(
+    settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_TTL_SECONDS
+)
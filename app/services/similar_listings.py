@@ -0,0 +1,246 @@
+"""
+In-memory nearest-neighbour index for "similar listings".
+
+Every listing is a row of a float32 matrix of weighted, normalised features:
+log price, beds, baths, log square feet, year built, latitude/longitude,
+one-hot property and listing type, and the most common feature/amenity tags.
+A lookup is one matrix-vector product over the whole matrix (squared
+Euclidean distance via precomputed row norms) followed by argpartition, so it
+stays in the low milliseconds at 100k listings.
+
+Like the listing index the matrix is per process: PropertyService updates the
+rows of listings it writes, and it is rebuilt once older than
+SIMILAR_LISTINGS_MAX_AGE_SECONDS. Normalisation (means, spreads, tag
+vocabulary) is fixed at rebuild time so incremental writes stay comparable.
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.property import ListingType, Property, PropertyStatus, PropertyType
+
+# Column -> (transform, weight). NULLs become the column mean (0 after scaling).
+NUMERIC_FEATURES = {
+    "price": (np.log1p, 2.0),
+    "bedrooms": (None, 1.0),
+    "bathrooms": (None, 0.75),
+    "square_feet": (np.log1p, 1.0),
+    "year_built": (None, 0.5),
+    "latitude": (None, 1.5),
+    "longitude": (None, 1.5),
+}
+ONE_HOT_FEATURES = {
+    "property_type": (list(PropertyType), 1.0),
+    "listing_type": (list(ListingType), 2.0),
+}
+TAG_COLUMNS = ("features", "amenities")
+TAG_VOCABULARY = 32
+TAG_WEIGHT = 0.5
+
+FIELDS = (
+    "id",
+    "is_active",
+    "status",
+    *NUMERIC_FEATURES,
+    *ONE_HOT_FEATURES,
+    *TAG_COLUMNS,
+)
+
+_INITIAL_CAPACITY = 1024
+
+
+def _is_candidate(row) -> bool:
+    return bool(row.is_active) and row.status in (None, PropertyStatus.AVAILABLE)
+
+
+class SimilarListings:
+    """
+    Feature matrix, appended to or overwritten in place. Listings that are not
+    candidates (inactive, unavailable or deleted) keep their row but get an
+    infinite norm, so they are never among the nearest.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._center = np.zeros(len(NUMERIC_FEATURES))
+        self._scale = np.ones(len(NUMERIC_FEATURES))
+        self._tags: Dict[tuple, int] = {}
+        self._reset(_INITIAL_CAPACITY)
+
+    @property
+    def dimensions(self) -> int:
+        return (
+            len(NUMERIC_FEATURES)
+            + sum(len(members) for members, _ in ONE_HOT_FEATURES.values())
+            + TAG_VOCABULARY
+        )
+
+    def _reset(self, capacity: int):
+        self._size = 0
+        self._capacity = capacity
+        self._pos: Dict[int, int] = {}
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+
+    def _grow(self):
+        capacity = self._capacity * 2
+        matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        self._matrix = matrix
+        for name in ("_ids", "_norms"):
+            arr = getattr(self, name)
+            grown = np.zeros(capacity, dtype=arr.dtype)
+            grown[: self._size] = arr[: self._size]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    # ---------- Maintenance ----------
+
+    @property
+    def is_stale(self) -> bool:
+        if self._built_at is None:
+            return True
+        return (
+            time.monotonic() - self._built_at
+            > settings.SIMILAR_LISTINGS_MAX_AGE_SECONDS
+        )
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def rebuild(self, db: Session):
+        """Reload every listing and refit the normalisation."""
+        rows = db.execute(select(*(getattr(Property, f) for f in FIELDS))).all()
+        with self._lock:
+            self._load(rows)
+            self._built_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session):
+        if self.is_stale:
+            self.rebuild(db)
+
+    def upsert(self, prop: Property):
+        """Add or replace a single listing (called after a committed write)."""
+        if self._built_at is None:
+            return
+        with self._lock:
+            pos = self._pos.get(prop.id)
+            if pos is None:
+                if self._size == self._capacity:
+                    self._grow()
+                pos = self._size
+                self._size += 1
+                self._pos[prop.id] = pos
+            self._ids[pos] = prop.id
+            self._matrix[pos] = self._vectors([prop])[0]
+            self._norms[pos] = (
+                self._matrix[pos] @ self._matrix[pos] if _is_candidate(prop) else np.inf
+            )
+
+    def remove(self, property_id: int):
+        with self._lock:
+            pos = self._pos.pop(property_id, None)
+            if pos is not None:
+                self._norms[pos] = np.inf
+
+    def _load(self, rows):
+        n = len(rows)
+        self._fit(rows)
+        self._reset(max(_INITIAL_CAPACITY, n))
+        if not n:
+            return
+        self._size = n
+        self._pos = {row.id: pos for pos, row in enumerate(rows)}
+        self._ids[:n] = [row.id for row in rows]
+        self._matrix[:n] = self._vectors(rows)
+        self._norms[:n] = np.einsum("ij,ij->i", self._matrix[:n], self._matrix[:n])
+        self._norms[:n][[not _is_candidate(row) for row in rows]] = np.inf
+
+    def _fit(self, rows):
+        raw = self._numeric(rows)
+        known = ~np.isnan(raw)
+        count = np.maximum(known.sum(axis=0), 1)
+        center = np.where(known, raw, 0).sum(axis=0) / count
+        spread = np.sqrt((np.where(known, raw - center, 0) ** 2).sum(axis=0) / count)
+        self._center = center
+        self._scale = np.where(spread > 0, spread, 1.0)
+
+        counts = Counter(
+            (c, tag)
+            for row in rows
+            for c in TAG_COLUMNS
+            for tag in set(getattr(row, c) or ())
+        )
+        self._tags = {
+            key: i for i, (key, _) in enumerate(counts.most_common(TAG_VOCABULARY))
+        }
+
+    @staticmethod
+    def _numeric(rows) -> np.ndarray:
+        raw = np.array(
+            [[getattr(row, c) for c in NUMERIC_FEATURES] for row in rows], dtype=float
+        ).reshape(len(rows), len(NUMERIC_FEATURES))
+        for i, (transform, _) in enumerate(NUMERIC_FEATURES.values()):
+            if transform is not None:
+                raw[:, i] = transform(np.maximum(raw[:, i], 0))
+        return raw
+
+    def _vectors(self, rows) -> np.ndarray:
+        """Weighted feature vectors for ``rows`` with the fitted normalisation."""
+        out = np.zeros((len(rows), self.dimensions), dtype=np.float32)
+        weights = np.array([w for _, w in NUMERIC_FEATURES.values()])
+        numeric = (self._numeric(rows) - self._center) / self._scale
+        out[:, : len(NUMERIC_FEATURES)] = np.nan_to_num(numeric) * weights
+
+        offset = len(NUMERIC_FEATURES)
+        for c, (members, weight) in ONE_HOT_FEATURES.items():
+            index = {m: i for i, m in enumerate(members)}
+            for r, row in enumerate(rows):
+                i = index.get(getattr(row, c))
+                if i is not None:
+                    out[r, offset + i] = weight
+            offset += len(members)
+
+        for r, row in enumerate(rows):
+            for c in TAG_COLUMNS:
+                for tag in getattr(row, c) or ():
+                    i = self._tags.get((c, tag))
+                    if i is not None:
+                        out[r, offset + i] = TAG_WEIGHT
+        return out
+
+    # ---------- Querying ----------
+
+    def similar_ids(self, prop: Property, k: int = 10) -> List[int]:
+        """Ids of the ``k`` active listings closest to ``prop``, nearest first."""
+        with self._lock:
+            n = self._size
+            vector = self._vectors([prop])[0]
+            distance = self._matrix[:n] @ vector
+            distance *= -2
+            distance += self._norms[:n]
+            pos = self._pos.get(prop.id)
+            if pos is not None:
+                distance[pos] = np.inf
+            ids = self._ids[:n]
+
+            k = min(k, n)
+            if k < n:
+                nearest = np.argpartition(distance, k - 1)[:k]
+            else:
+                nearest = np.arange(n)
+            nearest = nearest[np.isfinite(distance[nearest])]
+            order = np.lexsort((ids[nearest], distance[nearest]))
+            return [int(i) for i in ids[nearest[order]]]
+
+
+similar_listings = SimilarListings()
@@ -0,0 +1,140 @@
+"""
+Buffered listing view counts and the trending feed.
+
+GET /properties/{id} calls ``view_counter.record``, which only bumps an
+in-memory Counter. ``flush`` writes the accumulated increments to
+property_view_counts as one batched upsert, every VIEW_COUNTS_FLUSH_SECONDS
+from a background task, so the database sees one statement per interval
+however many views there were.
+
+Each view also adds to an exponentially decayed trending score (half-life
+TRENDING_HALF_LIFE_SECONDS). Scores are forward-decayed: a view at time t
+adds 2 ** ((t - epoch) / half_life) and nothing is decayed in place. Every
+score shrinks by the same factor over time, so their order only changes when
+views arrive, and ``/properties/trending`` is a top-k over this dict with no
+database scan. Flushes rebase the epoch (keeping the weights finite) and drop
+scores that have decayed away. Buffer and scores are per worker.
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.property_view_count import add_views
+
+logger = logging.getLogger(__name__)
+
+# Scores below this many (decayed) views are forgotten at the next flush
+MIN_SCORE = 0.01
+
+
+class ViewCounter:
+    def __init__(self, half_life_seconds: float, max_listings: int):
+        self.half_life_seconds = half_life_seconds
+        self.max_listings = max_listings
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._scores: Dict[int, float] = {}
+        self._epoch = time.monotonic()
+
+    def _weight(self, now: float) -> float:
+        return 2.0 ** ((now - self._epoch) / self.half_life_seconds)
+
+    def record(self, property_id: int, now: Optional[float] = None):
+        """Count one view of ``property_id``; no I/O."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._pending[property_id] += 1
+            self._scores[property_id] = self._scores.get(property_id, 0.0) + self._weight(
+                now
+            )
+
+    def pending(self, property_id: int) -> int:
+        """Views of ``property_id`` recorded here and not flushed yet."""
+        with self._lock:
+            return self._pending.get(property_id, 0)
+
+    def forget(self, property_id: int):
+        with self._lock:
+            self._pending.pop(property_id, None)
+            self._scores.pop(property_id, None)
+
+    def trending(self, limit: int, now: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        The ``limit`` highest (property id, score) pairs, best first; a score
+        is in views, each decayed by its age.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            top = heapq.nlargest(limit, self._scores.items(), key=itemgetter(1))
+            scale = self._weight(now)
+        return [(property_id, score / scale) for property_id, score in top]
+
+    def _compact(self, now: float):
+        scale = self._weight(now)
+        scores = {
+            property_id: score / scale
+            for property_id, score in self._scores.items()
+            if score / scale >= MIN_SCORE
+        }
+        if len(scores) > self.max_listings:
+            scores = dict(
+                heapq.nlargest(self.max_listings, scores.items(), key=itemgetter(1))
+            )
+        self._scores = scores
+        self._epoch = now
+
+    def flush(self, db: Session, now: Optional[float] = None) -> int:
+        """
+        Write the buffered increments in one batch; returns the number of
+        listings updated. On failure the increments go back in the buffer.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._compact(now)
+        if not pending:
+            return 0
+        try:
+            updated = add_views(db.connection(), pending, datetime.now(timezone.utc))
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return updated
+
+
+async def flush_periodically(session_factory, interval_seconds: float):
+    """Flush ``view_counter`` every ``interval_seconds``, and once more on cancel."""
+    try:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.to_thread(_flush, session_factory)
+    finally:
+        await asyncio.to_thread(_flush, session_factory)
+
+
+def _flush(session_factory):
+    session = session_factory()
+    try:
+        view_counter.flush(session)
+    except Exception:
+        logger.exception("View count flush failed")
+    finally:
+        session.close()
+
+
+view_counter = ViewCounter(
+    settings.TRENDING_HALF_LIFE_SECONDS, settings.TRENDING_MAX_LISTINGS
+)
@@ -5,7 +5,8 @@ import types
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.orm import sessionmaker
 
 # CRITICAL: Set test database URL BEFORE importing any app modules
@@ -46,17 +47,35 @@ def event_loop():
 
 
 @pytest.fixture(scope="session")
-def test_engine():
+def test_db_path(tmp_path_factory):
+    # A file rather than :memory: so the async engine (a different driver,
+    # hence different connections) sees the same database
+    return tmp_path_factory.mktemp("db") / "test.db"
+
+
+@pytest.fixture(scope="session")
+def test_engine(test_db_path):
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{test_db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,  # share same in-memory DB across connections
+        poolclass=StaticPool,  # share one connection across sync sessions
     )
+    with engine.connect() as conn:
+        # WAL lets async readers run next to the shared sync connection
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.exec_driver_sql("PRAGMA synchronous=OFF")
     # Don't create tables here - let db_session fixture handle it
     # This ensures tables are created fresh for each test with latest schema
     return engine
 
 
+@pytest.fixture(scope="session")
+def async_test_engine(test_db_path):
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{test_db_path}", poolclass=NullPool
+    )
+
+
 @pytest.fixture()
 def db_session(test_engine):
     TestingSessionLocal = sessionmaker(
@@ -76,10 +95,17 @@ def db_session(test_engine):
 
 
 @pytest.fixture(autouse=True)
-def patch_sessionlocal(monkeypatch, test_engine, db_session):
+def patch_sessionlocal(monkeypatch, test_engine, async_test_engine, db_session):
     # CRITICAL: Patch engine FIRST before any SessionLocal patches
     # This ensures all sessions use the test engine where tables are created
     monkeypatch.setattr(db_module, "engine", test_engine, raising=False)
+    monkeypatch.setattr(db_module, "async_engine", async_test_engine, raising=False)
+    TestingAsyncSessionLocal = async_sessionmaker(
+        async_test_engine, autoflush=False, expire_on_commit=False
+    )
+    monkeypatch.setattr(
+        db_module, "AsyncSessionLocal", TestingAsyncSessionLocal, raising=True
+    )
 
     # Patch the SessionLocal used by routers to our testing session factory
     TestingSessionLocal = sessionmaker(
@@ -109,6 +135,7 @@ def patch_sessionlocal(monkeypatch, test_engine, db_session):
     router_modules = [
         "app.routers.stripe_checkout",
         "app.routers.favorites", 
+        "app.routers.saved_searches",
         "app.routers.properties",
         "app.routers.auth",
         "app.routers.user",
@@ -128,6 +155,13 @@ def patch_sessionlocal(monkeypatch, test_engine, db_session):
             router_module = __import__(router_path, fromlist=[""])
             if hasattr(router_module, "SessionLocal"):
                 monkeypatch.setattr(router_module, "SessionLocal", TestingSessionLocal, raising=False)
+            if hasattr(router_module, "AsyncSessionLocal"):
+                monkeypatch.setattr(
+                    router_module,
+                    "AsyncSessionLocal",
+                    TestingAsyncSessionLocal,
+                    raising=False,
+                )
             if hasattr(router_module, "get_db"):
                 monkeypatch.setattr(router_module, "get_db", test_get_db, raising=False)
         except ImportError:
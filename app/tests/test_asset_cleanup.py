@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.models.orphaned_asset import OrphanedAsset, queue_asset_deletes
+from app.models.property_images import PropertyImage
+from app.services import image_service as image_service_module
+from app.services.asset_cleanup import RETRY_BASE_SECONDS, clean_up_assets
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def cloudinary(monkeypatch):
+    """Records each batch; answers with ``outcomes`` (or raises ``error``)."""
+    fake = type("FakeCloudinary", (), {"batches": [], "outcomes": {}, "error": None})()
+
+    def delete_images(self, public_ids):
+        fake.batches.append(list(public_ids))
+        if fake.error:
+            raise fake.error
+        return {pid: fake.outcomes.get(pid, "deleted") for pid in public_ids}
+
+    monkeypatch.setattr(
+        image_service_module.ImageService, "delete_images", delete_images
+    )
+    return fake
+
+
+def _queued(db):
+    db.expire_all()
+    return {a.public_id: a for a in db.query(OrphanedAsset)}
+
+
+def _later():
+    return datetime.now(timezone.utc) + timedelta(seconds=1)
+
+
+def test_deleting_a_listing_queues_its_images(client, db_session, cloudinary):
+    headers = _auth_headers(db_session)
+    listing = client.post(
+        "/properties/", json=_property_payload(), headers=headers
+    ).json()
+    for key in ("a", "b"):
+        db_session.add(PropertyImage(property_id=listing["id"], file_key=key))
+    db_session.commit()
+
+    response = client.delete(f"/properties/{listing['id']}", headers=headers)
+    assert response.status_code == 204
+    assert cloudinary.batches == []
+    assert set(_queued(db_session)) == {"a", "b"}
+    # Queuing an asset twice is a no-op
+    assert queue_asset_deletes(db_session, ["a", "c"]) == 1
+    db_session.commit()
+
+    assert clean_up_assets(db_session, now=_later()) == 3
+    assert sorted(cloudinary.batches[0]) == ["a", "b", "c"]
+    assert _queued(db_session) == {}
+
+
+def test_cleanup_batches_and_backs_off(db_session, cloudinary):
+    queue_asset_deletes(db_session, [f"img{i:03d}" for i in range(230)])
+    db_session.commit()
+    cloudinary.outcomes = {"img000": "not_found", "img001": "error"}
+
+    assert clean_up_assets(db_session, now=_later()) == 229
+    assert [len(batch) for batch in cloudinary.batches] == [100, 100, 30]
+    failed = _queued(db_session)["img001"]
+    assert (failed.attempts, failed.last_error) == (1, "error")
+
+    # Not due yet; then the whole batch fails and the delay doubles
+    now = _later()
+    assert clean_up_assets(db_session, now=now) == 0
+    cloudinary.error = ConnectionError("timed out")
+    clean_up_assets(db_session, now=now + timedelta(seconds=RETRY_BASE_SECONDS))
+    failed = _queued(db_session)["img001"]
+    assert failed.attempts == 2
+    assert failed.last_error == "ConnectionError: timed out"
+    assert len(cloudinary.batches) == 4
+
+
+def test_assets_that_keep_failing_stay_orphaned(db_session, cloudinary, monkeypatch):
+    monkeypatch.setattr(settings, "ASSET_CLEANUP_MAX_ATTEMPTS", 2)
+    queue_asset_deletes(db_session, ["gone"])
+    db_session.commit()
+    cloudinary.error = RuntimeError("boom")
+
+    now = _later()
+    for _ in range(4):
+        clean_up_assets(db_session, now=now)
+        now += timedelta(days=1)
+    asset = _queued(db_session)["gone"]
+    assert (asset.attempts, asset.next_attempt_at) == (2, None)
+    assert len(cloudinary.batches) == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import async_database_url
+from app.schemas.property import PropertySearchParams
+from app.services.property_service import AsyncPropertyService, PropertyService
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./luxestate.db", "sqlite+aiosqlite:///./luxestate.db"),
+        ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        (
+            "postgresql://u:p@db:6543/app?sslmode=require",
+            "postgresql+asyncpg://u:p@db:6543/app?ssl=require",
+        ),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert async_database_url(url).render_as_string(hide_password=False) == expected
+
+
+def test_async_service_matches_sync_service(client, db_session, async_test_engine):
+    headers = _auth_headers(db_session)
+    for price in (100000, 300000, 200000):
+        payload = {**_property_payload(), "price": price}
+        client.post("/properties/", json=payload, headers=headers)
+    params = PropertySearchParams(sort_by="price", sort_order="asc")
+    expected = asyncio.run(
+        PropertyService().search_properties_with_params(db_session, params)
+    )
+
+    async def run():
+        async with async_sessionmaker(async_test_engine)() as db:
+            service = AsyncPropertyService()
+            found = await service.search_properties_with_params(db, params)
+            listing = await service.get_property(db, found[0].id)
+            with pytest.raises(HTTPException) as missing:
+                await service.get_property(db, 999999)
+            return found, listing, missing.value.status_code
+
+    found, listing, status_code = asyncio.run(run())
+    assert [p.id for p in found] == [p.id for p in expected]
+    assert [p.price for p in found] == [100000, 200000, 300000]
+    assert (listing.id, status_code) == (found[0].id, 404)
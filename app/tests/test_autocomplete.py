@@ -0,0 +1,76 @@
+import pytest
+
+from app.models.property import Property
+from app.services import property_service as property_service_module
+from app.services.autocomplete import PlaceIndex
+from app.routers import properties as properties_router
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def places(monkeypatch):
+    index = PlaceIndex()
+    monkeypatch.setattr(property_service_module, "place_index", index)
+    monkeypatch.setattr(properties_router, "place_index", index)
+    return index
+
+
+def _create(client, headers, **overrides):
+    payload = {**_property_payload(), **overrides}
+    response = client.post("/properties/", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _suggest(client, prefix, **params):
+    params = {"prefix": prefix, **params}
+    response = client.get("/properties/autocomplete", params=params)
+    assert response.status_code == 200, response.text
+    return [(s["kind"], s["value"], s["count"]) for s in response.json()]
+
+
+def test_suggestions_ranked_by_active_listings(client, db_session, places):
+    headers = _auth_headers(db_session)
+    for _ in range(3):
+        _create(client, headers, city="Lagos", state="Lagos State", zip_code="100001")
+    _create(client, headers, city="lagos ", zip_code="100002")
+    _create(client, headers, city="Lafia", state="Nasarawa", zip_code="950101")
+    inactive = _create(client, headers, city="Lamu")
+    db_session.get(Property, inactive).is_active = False
+    db_session.commit()
+
+    assert _suggest(client, "LA") == [
+        ("city", "Lagos", 4),
+        ("state", "Lagos State", 3),
+        ("city", "Lafia", 1),
+    ]
+    assert _suggest(client, "la", limit=1) == [("city", "Lagos", 4)]
+    assert _suggest(client, "lagos s") == [("state", "Lagos State", 3)]
+    assert _suggest(client, "1000") == [
+        ("zip_code", "100001", 3),
+        ("zip_code", "100002", 1),
+    ]
+    assert _suggest(client, "la", kind="state") == [("state", "Lagos State", 3)]
+    assert _suggest(client, "zz") == []
+    assert client.get("/properties/autocomplete", params={"prefix": ""}).status_code == 422
+
+
+def test_writes_update_the_index_without_a_rebuild(
+    client, db_session, places, monkeypatch
+):
+    headers = _auth_headers(db_session)
+    pid = _create(client, headers, city="Abuja")
+    assert _suggest(client, "ab") == [("city", "Abuja", 1)]
+
+    def fail(db):
+        raise AssertionError("index should not be rebuilt")
+
+    monkeypatch.setattr(places, "rebuild", fail)
+    other = _create(client, headers, city="Aba")
+    assert _suggest(client, "ab") == [("city", "Aba", 1), ("city", "Abuja", 1)]
+
+    client.patch(f"/properties/{pid}", json={"city": "Aba"}, headers=headers)
+    assert _suggest(client, "ab") == [("city", "Aba", 2)]
+
+    client.delete(f"/properties/{other}", headers=headers)
+    assert _suggest(client, "ab") == [("city", "Aba", 1)]
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.property import Property
+from app.services.property_service import AsyncPropertyService
+from app.tests.test_announcements_and_seller_subscription import _headers, _seed_admin
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def test_property_detail_etag_and_last_modified(client, db_session):
+    headers = _auth_headers(db_session)
+    listing = client.post("/properties/", json=_property_payload(), headers=headers).json()
+    url = f"/properties/{listing['id']}"
+
+    first = client.get(url)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert (cached.status_code, cached.content) == (304, b"")
+    assert cached.headers["etag"] == etag
+    assert client.get(url, headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert (
+        client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        .status_code
+        == 200
+    )
+    # If-None-Match takes precedence over If-Modified-Since
+    stale = {"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    assert client.get(url, headers=stale).status_code == 200
+
+    client.patch(url, json={"price": 260000}, headers=headers)
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["price"] == 260000
+    assert changed.headers["etag"] != etag
+
+    assert client.get("/properties/999999", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_repricing_moves_last_modified(client, db_session):
+    headers = _auth_headers(db_session)
+    payload = {**_property_payload(), "price": 300_000_000, "currency": "NGN"}
+    listing = client.post("/properties/", json=payload, headers=headers).json()
+    url = f"/properties/{listing['id']}"
+    # Created well before the repricing, so the two fall in different seconds
+    row = db_session.get(Property, listing["id"])
+    row.created_at = row.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.commit()
+    last_modified = client.get(url).headers["last-modified"]
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    admin = _headers(db_session, _seed_admin(db_session))
+    client.put("/admin/fx-rates", json={"rates": {"NGN": 0.00065}}, headers=admin)
+    repriced = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert repriced.status_code == 200
+    assert repriced.headers["last-modified"] != last_modified
+
+
+def test_unconditional_detail_loads_the_row_once(client, db_session, monkeypatch):
+    headers = _auth_headers(db_session)
+    listing = client.post("/properties/", json=_property_payload(), headers=headers).json()
+    url = f"/properties/{listing['id']}"
+    version_lookups = []
+    original = AsyncPropertyService.get_property_version
+
+    async def get_property_version(self, db, property_id):
+        version_lookups.append(property_id)
+        return await original(self, db, property_id)
+
+    monkeypatch.setattr(AsyncPropertyService, "get_property_version", get_property_version)
+    etag = client.get(url).headers["etag"]
+    assert version_lookups == []
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert version_lookups == [listing["id"]]
+    assert client.get("/properties/999999").status_code == 404
+
+
+def test_featured_etag_tracks_the_page(client, db_session):
+    headers = _auth_headers(db_session)
+
+    def feature(is_featured=True, listing_id=None):
+        if listing_id is None:
+            created = client.post("/properties/", json=_property_payload(), headers=headers)
+            listing_id = created.json()["id"]
+        body = {"is_featured": is_featured}
+        client.patch(f"/properties/{listing_id}", json=body, headers=headers)
+        return listing_id
+
+    first_id = feature()
+
+    etag = client.get("/properties/featured").headers["etag"]
+    assert client.get("/properties/featured", headers={"If-None-Match": etag}).status_code == 304
+    # Different representation, different tag
+    by_fields = client.get("/properties/featured", params={"fields": "id,title"})
+    assert by_fields.headers["etag"] != etag
+
+    feature()
+    added = client.get("/properties/featured", headers={"If-None-Match": etag})
+    assert added.status_code == 200 and len(added.json()) == 2
+    etag = added.headers["etag"]
+
+    feature(False, first_id)
+    removed = client.get("/properties/featured", headers={"If-None-Match": etag})
+    assert removed.status_code == 200 and len(removed.json()) == 1
+
+
+def test_announcements_etag(client, db_session):
+    headers = _headers(db_session, _seed_admin(db_session))
+    payload = {
+        "title": "Maintenance",
+        "content": "We will be down.",
+        "expires_at": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat(),
+    }
+    created = client.post("/announcements/", headers=headers, json=payload).json()
+
+    etag = client.get("/announcements/").headers["etag"]
+    assert client.get("/announcements/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.delete(f"/announcements/{created['id']}", headers=headers)
+    after = client.get("/announcements/", headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.json() == []
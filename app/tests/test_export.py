@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+from app.services import property_service as property_service_module
+from app.tests.test_listing_index import _seed_listings
+
+
+def test_export_ndjson_streams_all_matches(client, db_session):
+    _seed_listings(db_session)
+    res = client.get("/properties/export", params={"city": "lagos", "sort_by": "price"})
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    search = client.get(
+        "/properties/search", params={"city": "lagos", "sort_by": "price", "limit": 1000}
+    ).json()
+    assert [r["id"] for r in rows] == [r["id"] for r in search]
+    assert rows[0] == search[0]
+
+
+def test_export_csv_in_small_batches(client, db_session, monkeypatch):
+    _seed_listings(db_session)
+    stream_search = property_service_module.PropertyService.stream_search
+    monkeypatch.setattr(
+        property_service_module.PropertyService,
+        "stream_search",
+        lambda self, db, params: stream_search(self, db, params, batch_size=7),
+    )
+
+    res = client.post(
+        "/properties/export?format=csv",
+        json={"features": ["pool"], "sort_by": "created_at", "sort_order": "asc", "limit": 1},
+    )
+    assert res.status_code == 200
+    assert 'filename="properties.csv"' in res.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    # limit is ignored: every listing with a pool (i % 3 == 0) is exported
+    assert len(rows) == 14
+    assert rows[0]["title"] == "Listing 0"
+    assert rows[0]["features"] == "pool|garage"
+    assert rows[0]["property_type"] == "apartment"
+
+
+def test_export_with_no_matches_has_only_csv_header(client, db_session):
+    res = client.get("/properties/export", params={"format": "csv", "city": "nowhere"})
+    lines = res.text.splitlines()
+    assert len(lines) == 1 and lines[0].startswith("title,description,price")
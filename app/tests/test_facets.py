@@ -0,0 +1,92 @@
+import pytest
+
+from app.config import settings
+from app.models.fx_rate import FxRate
+from app.models.property import Property
+from app.services import property_service as property_service_module
+from app.services.listing_index import ListingIndex
+from app.tests.test_listing_index import _seed_listings
+
+
+@pytest.fixture()
+def index(monkeypatch):
+    idx = ListingIndex()
+    monkeypatch.setattr(property_service_module, "listing_index", idx)
+    return idx
+
+
+def _brute_force(db, **filters):
+    rows = [
+        p
+        for p in db.query(Property).all()
+        if all(getattr(p, k) == v for k, v in filters.items())
+    ]
+    bedrooms = {}
+    for p in rows:
+        if p.bedrooms is not None:
+            key = "5+" if p.bedrooms >= 5 else str(p.bedrooms)
+            bedrooms[key] = bedrooms.get(key, 0) + 1
+    features = {}
+    for p in rows:
+        for tag in p.features or []:
+            features[tag] = features.get(tag, 0) + 1
+    return len(rows), bedrooms, features
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize(
+    "query, filters",
+    [
+        ("", {}),
+        ("?city=lagos&is_active=true", {"is_active": True}),
+        ("?listing_type=rent", {}),
+    ],
+)
+def test_facets_count_matching_listings(
+    client, db_session, index, monkeypatch, use_index, query, filters
+):
+    # Price buckets are in USD, so every seeded currency needs a rate
+    db_session.add(FxRate(currency="NGN", usd_rate=0.00065))
+    db_session.commit()
+    _seed_listings(db_session)
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", use_index)
+
+    res = client.get(f"/properties/search/facets{query}")
+    assert res.status_code == 200, res.text
+    body = res.json()
+
+    search = client.get(f"/properties/search{query}{'&' if query else '?'}limit=100")
+    total = len(search.json())
+    assert body["total"] == total
+    assert sum(body["property_type"].values()) == total
+    assert sum(body["status"].values()) == total
+    assert sum(b["count"] for b in body["price"]) == total
+    assert len(body["bedrooms"]) == 6
+
+    if not query:
+        expected_total, bedrooms, features = _brute_force(db_session)
+        assert body["total"] == expected_total
+        assert {k: v for k, v in body["bedrooms"].items() if v} == bedrooms
+        assert {b["value"]: b["count"] for b in body["features"]} == features
+
+
+def test_facets_index_and_sql_paths_agree(client, db_session, index, monkeypatch):
+    _seed_listings(db_session)
+    payload = {"min_price": 100_000, "state": "LA", "features": ["garage"]}
+
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", False)
+    sql = client.post("/properties/search/facets?top_tags=1", json=payload).json()
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    indexed = client.post("/properties/search/facets?top_tags=1", json=payload).json()
+
+    assert sql == indexed
+    assert sql["total"] > 0
+    assert sql["features"] == [{"value": "garage", "count": sql["total"]}]
+
+
+def test_facets_with_text_search(client, db_session):
+    _seed_listings(db_session)
+    res = client.get("/properties/search/facets?search_query=listing 1")
+    assert res.status_code == 200
+    # "Listing 1" prefix-matches Listing 1 and Listing 10..19
+    assert res.json()["total"] == 11
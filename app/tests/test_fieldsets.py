@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.services import property_service as property_service_module
+from app.services.listing_index import ListingIndex
+from app.tests.test_listing_index import _seed_listings
+
+CARD = "id,title,price,currency,city,overview_image,bedrooms,bathrooms"
+
+
+@pytest.fixture()
+def statements(db_session, async_test_engine):
+    captured = []
+    engines = (db_session.get_bind(), async_test_engine.sync_engine)
+
+    def listener(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", listener)
+    yield captured
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_search_fields_narrow_projection_and_response(
+    client, db_session, statements, monkeypatch, use_index
+):
+    _seed_listings(db_session)
+    monkeypatch.setattr(property_service_module, "listing_index", ListingIndex())
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", use_index)
+
+    full = client.get("/properties/search", params={"sort_by": "price"}).json()
+    statements.clear()
+    res = client.get("/properties/search", params={"sort_by": "price", "fields": CARD})
+    assert res.status_code == 200
+    rows = res.json()
+
+    assert [r["id"] for r in rows] == [r["id"] for r in full]
+    assert set(rows[0]) == set(CARD.split(","))
+    assert rows[0] == {k: full[0][k] for k in CARD.split(",")}
+    page_selects = [s for s in statements if "FROM properties" in s]
+    assert page_selects and not any("properties.description" in s for s in page_selects)
+
+
+def test_fields_with_cursor_and_body(client, db_session):
+    _seed_listings(db_session)
+    first = client.post(
+        "/properties/search?fields=title",
+        json={"cursor": "", "limit": 15, "sort_by": "created_at"},
+    ).json()
+    assert set(first["items"][0]) == {"id", "title"}
+
+    # The cursor still encodes created_at even though it is not returned
+    second = client.post(
+        "/properties/search?fields=title",
+        json={"cursor": first["next_cursor"], "limit": 15, "sort_by": "created_at"},
+    ).json()
+    ids = [r["id"] for r in first["items"] + second["items"]]
+    assert len(set(ids)) == 30
+
+
+def test_featured_and_agent_fields(client, db_session):
+    agent = _seed_listings(db_session)
+    featured = client.get("/properties/featured", params={"fields": "price"}).json()
+    assert featured and all(set(r) == {"id", "price"} for r in featured)
+
+    rows = client.get(f"/properties/agent/{agent.id}", params={"fields": "city"}).json()
+    assert len(rows) == 40 and set(rows[0]) == {"id", "city"}
+
+
+def test_unknown_field_is_rejected(client):
+    res = client.get("/properties/search", params={"fields": "title,password_hash"})
+    assert res.status_code == 400
+    assert "password_hash" in res.json()["detail"]
@@ -0,0 +1,134 @@
+import pytest
+
+from app.config import settings
+from app.models.property import Property
+from app.services import fx_rates as fx_rates_module
+from app.services import property_service as property_service_module
+from app.services.fx_rates import FxRateService, RateWatcher
+from app.services.listing_index import ListingIndex
+from app.services.search_cache import search_cache
+from app.tests.test_announcements_and_seller_subscription import _headers, _seed_admin
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def index(monkeypatch):
+    idx = ListingIndex()
+    monkeypatch.setattr(property_service_module, "listing_index", idx)
+    monkeypatch.setattr("app.services.fx_rates.listing_index", idx)
+    return idx
+
+
+def _listings(client, db_session):
+    headers = _auth_headers(db_session)
+    usd = client.post("/properties/", json=_property_payload(), headers=headers).json()
+    ngn = client.post(
+        "/properties/",
+        json={**_property_payload(), "price": 300_000_000, "currency": "NGN"},
+        headers=headers,
+    ).json()
+    return headers, usd["id"], ngn["id"]
+
+
+def _ids(client, query):
+    response = client.get(f"/properties/search?{query}")
+    assert response.status_code == 200, response.text
+    return [p["id"] for p in response.json()]
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_price_filters_and_sort_compare_usd(
+    client, db_session, index, monkeypatch, use_index
+):
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", use_index)
+    _, usd, ngn = _listings(client, db_session)
+    assert db_session.get(Property, usd).price_usd == 250_000
+    # No NGN rate yet: the price is compared at face value, not dropped
+    assert db_session.get(Property, ngn).price_usd == 300_000_000
+    assert _ids(client, "min_price=1") == [ngn, usd]
+    assert _ids(client, "max_price=300000") == [usd]
+
+    admin = _headers(db_session, _seed_admin(db_session))
+    response = client.put(
+        "/admin/fx-rates", json={"rates": {"ngn": 0.00065}}, headers=admin
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["repriced"] == 1
+    # The index is reloaded by the next search, not by the admin request
+    assert index.is_stale
+    db_session.expire_all()
+    assert db_session.get(Property, ngn).price_usd == pytest.approx(195_000)
+
+    assert _ids(client, "max_price=200000") == [ngn]
+    assert _ids(client, "min_price=200000&max_price=300000") == [usd]
+    assert _ids(client, "sort_by=price&sort_order=asc") == [ngn, usd]
+    # A currency filter compares prices in that currency
+    assert _ids(client, "currency=NGN&min_price=250000000") == [ngn]
+
+    first = client.get("/properties/search?sort_by=price&sort_order=asc&limit=1&cursor=")
+    page = first.json()
+    assert [p["id"] for p in page["items"]] == [ngn]
+    second = client.get(
+        "/properties/search?sort_by=price&sort_order=asc&limit=1"
+        f"&cursor={page['next_cursor']}"
+    )
+    assert [p["id"] for p in second.json()["items"]] == [usd]
+
+
+def test_rate_changes_reprice_only_that_currency(client, db_session):
+    seller, usd, ngn = _listings(client, db_session)
+    admin = _headers(db_session, _seed_admin(db_session))
+    client.put("/admin/fx-rates", json={"rates": {"NGN": 0.001}}, headers=admin)
+    # Repricing counts as a change to the listing; other currencies are untouched
+    assert db_session.get(Property, ngn).updated_at is not None
+    assert db_session.get(Property, usd).updated_at is None
+
+    response = client.put(
+        "/admin/fx-rates", json={"rates": {"NGN": 0.002, "EUR": 1.1}}, headers=admin
+    )
+    assert response.json()["repriced"] == 1
+    assert [r["currency"] for r in response.json()["rates"]] == ["EUR", "NGN"]
+    db_session.expire_all()
+    assert db_session.get(Property, ngn).price_usd == pytest.approx(600_000)
+    # Unchanged rates reprice nothing
+    again = client.put("/admin/fx-rates", json={"rates": {"NGN": 0.002}}, headers=admin)
+    assert again.json()["repriced"] == 0
+
+    # Editing a listing's price or currency reprices it at the stored rate
+    client.patch(f"/properties/{usd}", json={"currency": "EUR"}, headers=seller)
+    db_session.expire_all()
+    assert db_session.get(Property, usd).price_usd == pytest.approx(275_000)
+
+
+def test_rate_changes_from_another_worker_drop_this_workers_caches(
+    client, db_session, index, monkeypatch
+):
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(fx_rates_module, "RATES_CHECK_SECONDS", 0)
+    watcher = RateWatcher()
+    monkeypatch.setattr(fx_rates_module, "rate_watcher", watcher)
+    monkeypatch.setattr(property_service_module, "rate_watcher", watcher)
+    search_cache.clear()
+    _, _, ngn = _listings(client, db_session)
+    admin = _headers(db_session, _seed_admin(db_session))
+    client.put("/admin/fx-rates", json={"rates": {"NGN": 0.001}}, headers=admin)
+    assert _ids(client, "max_price=200000") == []  # NGN listing at $300k
+
+    # Another worker reprices: only its own caches are dropped
+    with monkeypatch.context() as other_worker:
+        other_worker.setattr(fx_rates_module, "rate_watcher", RateWatcher())
+        other_worker.setattr(fx_rates_module, "_drop_price_caches", lambda *a: None)
+        FxRateService(db_session).set_rates({"NGN": 0.0005})
+
+    assert _ids(client, "max_price=200000") == [ngn]
+    assert not index.is_stale
+
+
+def test_fx_rates_validation_and_permissions(client, db_session):
+    admin = _headers(db_session, _seed_admin(db_session))
+    for rates in ({"USD": 2}, {"NG": 1}, {"NGN": 0}, {}):
+        response = client.put("/admin/fx-rates", json={"rates": rates}, headers=admin)
+        assert response.status_code == 422
+    seller = _auth_headers(db_session)
+    assert client.get("/admin/fx-rates", headers=seller).status_code == 403
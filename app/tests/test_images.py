@@ -5,6 +5,7 @@ from app.services.auth_service import create_access_token
 from app.models.user import User, UserRole
 from app.models.property import Property, PropertyType, ListingType
 from app.models.property_images import PropertyImage
+from app.models.orphaned_asset import OrphanedAsset
 from app.services import image_service as image_service_module
 
 
@@ -56,14 +57,14 @@ def test_upload_and_delete_image(client, db_session, monkeypatch):
     async def _upload_image(file, property_id):
         return {"public_id": "pid", "secure_url": "https://url"}
 
-    async def _delete_image(key):
-        return True
+    def _delete_images(public_ids):
+        raise AssertionError("deletes must not call Cloudinary in the request")
 
     monkeypatch.setattr(
         image_service_module.ImageService, "upload_image", staticmethod(_upload_image)
     )
     monkeypatch.setattr(
-        image_service_module.ImageService, "delete_image", staticmethod(_delete_image)
+        image_service_module.ImageService, "delete_images", staticmethod(_delete_images)
     )
     # upload
     files = {"file": ("test.jpg", BytesIO(b"x"), "image/jpeg")}
@@ -81,3 +82,4 @@ def test_upload_and_delete_image(client, db_session, monkeypatch):
     # delete
     delr = client.delete(f"/property_images/{img_id}", headers=headers)
     assert delr.status_code == 204
+    assert [a.public_id for a in db_session.query(OrphanedAsset)] == ["pid"]
@@ -0,0 +1,113 @@
+import csv
+import io
+import json
+
+from app.models.property import Property
+from app.models.subscription import Subscription, SubscriptionStatus
+from app.services import property_service as property_service_module
+from app.services.subscription import SubscriptionService
+from app.services.listing_import import read_listings
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def _ndjson(rows):
+    return "".join(json.dumps(r) + "\n" for r in rows).encode()
+
+
+def _upload(client, headers, content, filename="listings.ndjson", **params):
+    return client.post(
+        "/properties/import",
+        files={"file": (filename, content)},
+        params=params,
+        headers=headers,
+    )
+
+
+def test_import_ndjson_reports_bad_rows(client, db_session):
+    headers = _auth_headers(db_session)
+    good = _property_payload()
+    lines = [
+        json.dumps({**good, "title": "First", "features": ["pool", "garage"]}),
+        json.dumps({**good, "price": -1}),
+        "",
+        "{not json",
+        json.dumps({**good, "title": "Second"}),
+    ]
+    res = _upload(client, headers, "\n".join(lines).encode())
+    assert res.status_code == 200, res.text
+    body = res.json()
+
+    assert body["created"] == 2 and body["failed"] == 2
+    assert [e["row"] for e in body["errors"]] == [2, 4]
+    assert body["errors"][0]["errors"][0].startswith("price:")
+
+    first = client.get(f"/properties/{body['property_ids'][0]}").json()
+    assert first["title"] == "First"
+    # Tag index and geo cell are filled like single creates
+    ids = client.get("/properties/search", params={"features": ["pool"]}).json()
+    assert [r["id"] for r in ids] == body["property_ids"][:1]
+    assert db_session.get(Property, first["id"]).geo_cell is not None
+
+
+def test_import_csv_round_trips_export(client, db_session):
+    headers = _auth_headers(db_session)
+    pid = client.post("/properties/", json=_property_payload(), headers=headers).json()["id"]
+    exported = client.get("/properties/export", params={"format": "csv"}).content
+
+    res = _upload(client, headers, exported, filename="feed.csv")
+    assert res.json()["created"] == 1
+    copy = client.get(f"/properties/{res.json()['property_ids'][0]}").json()
+    original = client.get(f"/properties/{pid}").json()
+    for field in ("title", "price", "features", "amenities", "property_type", "bedrooms"):
+        assert copy[field] == original[field]
+
+
+def test_import_batches_respect_listing_limit(client, db_session, monkeypatch):
+    headers = _auth_headers(db_session)
+    subscription = db_session.query(Subscription).one()
+    subscription.listing_limit = 5
+    db_session.commit()
+    # conftest stubs the lookup with a limitless subscription; use the real row
+    monkeypatch.setattr(
+        SubscriptionService,
+        "get_user_active_subscription",
+        lambda self, user_id: self.db.query(Subscription)
+        .filter(Subscription.user_id == user_id)
+        .first(),
+    )
+
+    import_properties = property_service_module.PropertyService.import_properties
+    monkeypatch.setattr(
+        property_service_module.PropertyService,
+        "import_properties",
+        lambda self, db, rows, agent_id: import_properties(
+            self, db, rows, agent_id, batch_size=3
+        ),
+    )
+    rows = [{**_property_payload(), "title": f"L{i}"} for i in range(8)]
+    body = _upload(client, headers, _ndjson(rows)).json()
+
+    assert body["created"] == 5
+    assert [e["row"] for e in body["errors"]] == [6, 7, 8]
+    assert body["errors"][0]["errors"] == ["Listing limit reached"]
+    db_session.expire_all()
+    subscription = db_session.query(Subscription).one()
+    assert subscription.listing_limit == 0
+    assert subscription.status == SubscriptionStatus.EXPIRED.value
+
+
+def test_import_needs_a_known_format(client, db_session):
+    headers = _auth_headers(db_session)
+    assert _upload(client, headers, b"", filename="listings.txt").status_code == 400
+
+
+def test_read_listings_csv_cells():
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[*_property_payload(), "id"])
+    writer.writeheader()
+    writer.writerow({**_property_payload(), "features": "pool| garden", "bedrooms": "", "id": 9})
+    rows = list(read_listings(io.BytesIO(buffer.getvalue().encode()), "csv"))
+    number, listing, errors = rows[0]
+    assert (number, errors) == (1, [])
+    assert listing.features == ["pool", "garden"]
+    assert listing.bedrooms is None
@@ -0,0 +1,186 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.models.property import Property, PropertyType, ListingType, PropertyStatus
+from app.models.user import User, UserRole
+from app.schemas.property import PropertySearchParams
+from app.services import property_service as property_service_module
+from app.services.listing_index import ListingIndex
+from app.services.property_service import PropertyService
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def index(monkeypatch):
+    idx = ListingIndex()
+    monkeypatch.setattr(property_service_module, "listing_index", idx)
+    return idx
+
+
+def _seed_listings(db):
+    agent = User(
+        email="agent@example.com",
+        password_hash="x",
+        role=UserRole.SELLER,
+        is_active=True,
+        is_verified=True,
+    )
+    db.add(agent)
+    db.commit()
+    db.refresh(agent)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    cities = ["Lagos", "Abuja", "Port Harcourt", "lagos island"]
+    for i in range(40):
+        db.add(
+            Property(
+                title=f"Listing {i}",
+                price=50_000 + (i * 7919) % 400_000,
+                currency="USD" if i % 5 else "NGN",
+                address=f"{i} Road",
+                city=cities[i % len(cities)],
+                state="LA" if i % 2 else "FC",
+                zip_code=f"{i % 3:05d}",
+                country="Nigeria",
+                property_type=list(PropertyType)[i % len(PropertyType)],
+                listing_type=list(ListingType)[i % len(ListingType)],
+                status=PropertyStatus.AVAILABLE if i % 4 else PropertyStatus.SOLD,
+                bedrooms=None if i % 9 == 0 else i % 6,
+                bathrooms=(i % 4) + 0.5,
+                square_feet=800 + i * 10,
+                year_built=1990 + i % 30,
+                features=["pool", "garage"] if i % 3 == 0 else ["garage"],
+                amenities=["gym"] if i % 2 else [],
+                agent_id=agent.id,
+                is_featured=i % 7 == 0,
+                is_active=i % 10 != 0,
+                created_at=base + timedelta(days=i),
+            )
+        )
+    db.commit()
+    return agent
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"city": "LAGOS"},
+        {"min_price": 100_000, "max_price": 300_000, "sort_by": "price"},
+        {"property_type": PropertyType.HOUSE, "is_active": True},
+        {"min_bedrooms": 2, "sort_by": "bedrooms", "sort_order": "asc"},
+        {"currency": "ngn", "listing_type": ListingType.RENT},
+        {"status": PropertyStatus.SOLD, "is_featured": False, "zip_code": "00001"},
+        {"min_year_built": 2000, "max_square_feet": 1000, "skip": 3, "limit": 5},
+    ],
+)
+def test_index_matches_sql_path(db_session, index, monkeypatch, filters):
+    _seed_listings(db_session)
+    params = PropertySearchParams(**filters)
+    service = PropertyService()
+
+    sql_rows = asyncio.run(service.search_properties_with_params(db_session, params))
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    index_rows = asyncio.run(service.search_properties_with_params(db_session, params))
+
+    assert len(index) == 40
+    if params.sort_by == "created_at":
+        assert [p.id for p in index_rows] == [p.id for p in sql_rows]
+    else:
+        # Ties on the sort key may come back in a different order.
+        assert sorted(p.id for p in index_rows) == sorted(p.id for p in sql_rows)
+
+
+def test_index_feature_intersection(db_session, index, monkeypatch):
+    _seed_listings(db_session)
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    params = PropertySearchParams(features=["pool", "garage"], amenities=["gym"])
+    rows = asyncio.run(PropertyService().search_properties_with_params(db_session, params))
+    assert rows and all(
+        {"pool", "garage"} <= set(p.features) and "gym" in p.amenities for p in rows
+    )
+
+
+def test_index_tracks_writes(client, db_session, index, monkeypatch):
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    headers = _auth_headers(db_session)
+    assert client.get("/properties/search").json() == []
+
+    pid = client.post("/properties/", json=_property_payload(), headers=headers).json()["id"]
+    rows = client.get("/properties/search", params={"min_price": 200000}).json()
+    assert [r["id"] for r in rows] == [pid]
+
+    client.patch(f"/properties/{pid}", json={"price": 150000}, headers=headers)
+    assert client.get("/properties/search", params={"min_price": 200000}).json() == []
+
+    client.delete(f"/properties/{pid}", headers=headers)
+    assert len(index) == 0
+    assert client.get("/properties/search").json() == []
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize(
+    "sort_by",
+    ["created_at", "updated_at", "price", "title", "bedrooms", "bathrooms", "square_feet"],
+)
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_pages_match_offset_order(
+    client, db_session, index, monkeypatch, use_index, sort_by, sort_order
+):
+    _seed_listings(db_session)
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", use_index)
+    params = {"sort_by": sort_by, "sort_order": sort_order, "limit": 7}
+    expected = [
+        r["id"]
+        for r in client.get("/properties/search", params={**params, "limit": 100}).json()
+    ]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/properties/search", params={**params, "cursor": cursor}).json()
+        seen.extend(r["id"] for r in page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == expected and len(seen) == 40
+
+
+def test_cursor_rejects_mismatched_sort(client, db_session, index):
+    _seed_listings(db_session)
+    page = client.get("/properties/search", params={"cursor": "", "limit": 5}).json()
+    r = client.get(
+        "/properties/search",
+        params={"cursor": page["next_cursor"], "sort_by": "price"},
+    )
+    assert r.status_code == 400
+    assert client.get("/properties/search", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_agent_and_all_listings_cursor(client, db_session, index):
+    agent = _seed_listings(db_session)
+    for url in ("/properties/", f"/properties/agent/{agent.id}"):
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = client.get(url, params={"cursor": cursor, "limit": 15}).json()
+            seen.extend(r["id"] for r in page["items"])
+            cursor = page["next_cursor"]
+        assert sorted(seen) == list(range(1, 41)) and len(set(seen)) == 40
+    # Offset paging keeps returning a bare list
+    assert isinstance(client.get("/properties/", params={"limit": 5}).json(), list)
+
+
+def test_agent_listings_read_their_own_writes(client, db_session, index, monkeypatch):
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    agent = _seed_listings(db_session)
+    index.rebuild(db_session)
+    # Written by another worker: this worker's index has not seen it
+    latest = Property(
+        **{**_property_payload(), "title": "Just listed"},
+        agent_id=agent.id,
+        created_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+    )
+    db_session.add(latest)
+    db_session.commit()
+    page = client.get(f"/properties/agent/{agent.id}", params={"limit": 1}).json()
+    assert [p["id"] for p in page] == [latest.id]
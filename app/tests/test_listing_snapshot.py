@@ -0,0 +1,146 @@
+import fcntl
+import os
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.models.property import ListingType, Property, PropertyType
+from app.schemas.property import PropertySearchParams
+from app.services import listing_snapshot as listing_snapshot_module
+from app.services.autocomplete import PlaceIndex
+from app.services.listing_index import ListingIndex
+from app.services.listing_snapshot import Snapshot, SnapshotStore
+from app.tests.test_listing_index import _seed_listings
+
+
+@pytest.fixture()
+def store(monkeypatch, tmp_path):
+    store = listing_snapshot_module.listing_snapshots
+    monkeypatch.setattr(store, "path", str(tmp_path / "listings.snap"))
+    monkeypatch.setattr(store, "_current", None)
+    return store
+
+
+def _count_queries(db):
+    statements = []
+    engine = db.get_bind()
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", listener)
+
+
+PARAMS = [
+    PropertySearchParams(sort_by="created_at"),
+    PropertySearchParams(city="lagos", sort_by="price"),
+    PropertySearchParams(
+        features=["pool"], min_bedrooms=2, sort_by="created_at", sort_order="asc"
+    ),
+]
+
+
+def test_workers_map_one_snapshot_instead_of_loading(db_session, store):
+    _seed_listings(db_session)
+    reference = ListingIndex()
+    reference._load_from(db_session)
+
+    first = ListingIndex()
+    first.ensure_fresh(db_session)
+    assert os.path.exists(store.path)
+
+    second = ListingIndex()
+    statements, stop = _count_queries(db_session)
+    second.ensure_fresh(db_session)
+    stop()
+    assert statements == []
+    assert len(second) == 40
+    # Arrays are views of the mapped file, not private copies
+    assert not second._ids.flags.owndata
+    for params in PARAMS:
+        assert second.search_ids(params) == reference.search_ids(params)
+        assert second.count(params) == reference.count(params)
+
+
+def test_local_writes_do_not_touch_the_shared_file(db_session, store):
+    _seed_listings(db_session)
+    index = ListingIndex()
+    index.ensure_fresh(db_session)
+    listing = db_session.query(Property).filter(Property.is_active.is_(True)).first()
+
+    listing.city = "Kano"
+    db_session.commit()
+    index.upsert(listing)
+    index.remove(listing.id + 1)
+    assert index.search_ids(PropertySearchParams(city="kano", sort_by="created_at")) == [listing.id]
+
+    on_disk = ListingIndex()
+    on_disk.attach(*Snapshot(store.path).sections["listing_index"])
+    assert on_disk.search_ids(PropertySearchParams(city="kano", sort_by="created_at")) == []
+    assert len(on_disk) == len(index) + 1
+
+
+def test_rebuild_swaps_the_file_and_workers_remap(db_session, store, monkeypatch):
+    agent = _seed_listings(db_session)
+    index = ListingIndex()
+    index.ensure_fresh(db_session)
+    inode = os.stat(store.path).st_ino
+
+    db_session.add(
+        Property(
+            title="New",
+            price=1,
+            address="1 Road",
+            city="Jos",
+            state="PL",
+            zip_code="930001",
+            country="Nigeria",
+            property_type=PropertyType.HOUSE,
+            listing_type=ListingType.SALE,
+            agent_id=agent.id,
+        )
+    )
+    db_session.commit()
+    # Another worker (its own store) rebuilds the shared file
+    other = SnapshotStore(store.path, store.max_age_seconds)
+    other.register("listing_index", ListingIndex())
+    other.register("place_index", PlaceIndex())
+    other.rebuild(db_session)
+    assert os.stat(store.path).st_ino != inode
+
+    index.ensure_fresh(db_session)
+    assert len(index.search_ids(PropertySearchParams(city="jos", sort_by="created_at"))) == 1
+
+    # A stale mark (e.g. after an FX repricing) forces a newer snapshot
+    built_at = index._snapshot.built_at
+    index.mark_stale()
+    index.ensure_fresh(db_session)
+    assert index._snapshot.built_at > built_at
+
+
+def test_stale_snapshot_is_served_while_another_process_rebuilds(db_session, store):
+    _seed_listings(db_session)
+    index = ListingIndex()
+    index.ensure_fresh(db_session)
+    snapshot = index._snapshot
+    store.max_age_seconds = -1
+
+    with open(f"{store.path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert store.current(db_session) is snapshot
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    assert store.current(db_session) is not snapshot
+
+
+def test_place_index_reads_the_snapshot(db_session, store):
+    _seed_listings(db_session)
+    reference = PlaceIndex()
+    reference._load_from(db_session)
+
+    places = PlaceIndex()
+    places.ensure_fresh(db_session)
+    assert places._snapshot is not None
+    assert places.suggest("la") == reference.suggest("la")
+    assert np.array_equal(places._counts, reference._counts)
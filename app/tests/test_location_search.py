@@ -0,0 +1,94 @@
+import math
+import random
+
+import pytest
+
+from app.models.property import Property, PropertyType, ListingType
+from app.models.user import User, UserRole
+from app.utils.geo import bounding_boxes, cell_ranges, encode_cell
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371 * math.asin(math.sqrt(a))
+
+
+def _seed_points(db, points):
+    agent = User(email="geo@example.com", password_hash="x", role=UserRole.SELLER)
+    db.add(agent)
+    db.commit()
+    for i, (lat, lon) in enumerate(points):
+        db.add(
+            Property(
+                title=f"P{i}",
+                price=1000 + i,
+                address="a",
+                city="c",
+                state="s",
+                zip_code="z",
+                latitude=lat,
+                longitude=lon,
+                bedrooms=1,
+                bathrooms=1,
+                square_feet=100,
+                lot_size=1.0,
+                year_built=2000,
+                features=[],
+                amenities=[],
+                property_type=PropertyType.HOUSE,
+                listing_type=ListingType.SALE,
+                agent_id=agent.id,
+            )
+        )
+    db.commit()
+
+
+@pytest.mark.parametrize(
+    "center,radius_km",
+    [
+        ((6.5, 3.4), 25),
+        ((6.5, 3.4), 300),
+        ((0.0, 179.9), 50),  # crosses the antimeridian
+        ((89.8, 10.0), 100),  # contains the north pole
+    ],
+)
+def test_location_search_matches_brute_force(client, db_session, center, radius_km):
+    rng = random.Random(7)
+    lat0, lon0 = center
+    points = []
+    for _ in range(300):
+        lat = lat0 + rng.uniform(-4, 4)
+        lat = 180 - lat if lat > 90 else lat  # reflect over the pole
+        lon = (lon0 + rng.uniform(-8, 8) + 180) % 360 - 180
+        points.append((lat, lon))
+    _seed_points(db_session, points)
+
+    r = client.get(
+        "/properties/search/location",
+        params={"latitude": lat0, "longitude": lon0, "radius_km": radius_km, "limit": 200},
+    )
+    assert r.status_code == 200, r.text
+    got = [(row["title"], row["distance"]) for row in r.json()]
+
+    expected = sorted(
+        (d, f"P{i}")
+        for i, (lat, lon) in enumerate(points)
+        if (d := _haversine_km(lat0, lon0, lat, lon)) <= radius_km
+    )[:200]
+    assert [title for title, _ in got] == [title for _, title in expected]
+    assert all(abs(a - b) < 1e-6 for (_, a), (b, _) in zip(got, expected))
+
+
+def test_cell_ranges_cover_points_in_box():
+    rng = random.Random(3)
+    boxes = bounding_boxes(48.85, 2.35, 40)
+    ranges = cell_ranges(boxes)
+    assert len(ranges) <= 16
+    min_lat, max_lat, min_lon, max_lon = boxes[0]
+    for _ in range(1000):
+        cell = encode_cell(rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon))
+        assert any(low <= cell <= high for low, high in ranges)
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import property_service as property_service_module
+from app.services.fx_rates import FxRateService
+from app.services.listing_index import ListingIndex
+from app.services.property_service import PropertyService
+from app.tests.test_properties import _auth_headers, _property_payload
+from app.utils.geo import cluster_level, viewport_boxes
+
+VIEWPORT = {"min_lat": 6.0, "max_lat": 7.0, "min_lon": 3.0, "max_lon": 4.0}
+
+
+@pytest.fixture(params=[False, True], ids=["sql", "index"])
+def use_index(request, monkeypatch):
+    monkeypatch.setattr(property_service_module, "listing_index", ListingIndex())
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", request.param)
+    return request.param
+
+
+def _create(client, headers, latitude, longitude, **overrides):
+    payload = {
+        **_property_payload(),
+        "latitude": latitude,
+        "longitude": longitude,
+        **overrides,
+    }
+    assert client.post("/properties/", json=payload, headers=headers).status_code == 201
+
+
+def _seed(client, headers):
+    # Two tight groups in Lagos plus one listing outside the viewport
+    for i, price in enumerate((100000, 150000, 300000)):
+        _create(client, headers, 6.45 + i * 0.001, 3.39 + i * 0.001, price=price)
+    for i in range(2):
+        _create(client, headers, 6.85 + i * 0.001, 3.85, price=500000)
+    _create(client, headers, 9.05, 7.49)
+
+
+def test_low_zoom_returns_clusters(client, db_session, use_index):
+    _seed(client, _auth_headers(db_session))
+
+    body = client.get("/properties/map", params={**VIEWPORT, "zoom": 8}).json()
+    assert body["total"] == 5 and body["listings"] == []
+    clusters = sorted(body["clusters"], key=lambda c: c["count"])
+    assert [c["count"] for c in clusters] == [2, 3]
+    lagos = clusters[1]
+    assert (lagos["min_price"], lagos["max_price"]) == (100000, 300000)
+    assert abs(lagos["latitude"] - 6.451) < 1e-6 and abs(lagos["longitude"] - 3.391) < 1e-6
+
+    filtered = client.get(
+        "/properties/map", params={**VIEWPORT, "zoom": 8, "min_price": 400000}
+    ).json()
+    assert [c["count"] for c in filtered["clusters"]] == [2]
+
+
+def test_cluster_prices_compare_like_the_price_filters(client, db_session, use_index):
+    FxRateService(db_session).set_rates({"NGN": 0.001})
+    headers = _auth_headers(db_session)
+    _create(client, headers, 6.45, 3.39, price=200000)
+    _create(client, headers, 6.451, 3.391, price=100_000_000, currency="NGN")
+
+    (cluster,) = client.get("/properties/map", params={**VIEWPORT, "zoom": 8}).json()[
+        "clusters"
+    ]
+    assert (cluster["min_price"], cluster["max_price"]) == (100000, 200000)
+    # A currency filter reports that currency's own prices
+    params = {**VIEWPORT, "zoom": 8, "currency": "NGN"}
+    (cluster,) = client.get("/properties/map", params=params).json()["clusters"]
+    assert (cluster["min_price"], cluster["max_price"]) == (100_000_000, 100_000_000)
+
+
+def test_high_zoom_returns_listings_unless_dense(
+    client, db_session, monkeypatch, use_index
+):
+    _seed(client, _auth_headers(db_session))
+
+    body = client.get("/properties/map", params={**VIEWPORT, "zoom": 15}).json()
+    assert body["clusters"] == [] and len(body["listings"]) == 5
+    assert {"id", "title", "price", "latitude", "longitude"} <= set(body["listings"][0])
+
+    monkeypatch.setattr(property_service_module, "MAP_MAX_MARKERS", 4)
+    body = client.get("/properties/map", params={**VIEWPORT, "zoom": 15}).json()
+    assert body["listings"] == [] and sum(c["count"] for c in body["clusters"]) == 5
+
+
+@pytest.mark.parametrize("zoom,key", [(8, "clusters"), (15, "listings")])
+def test_empty_viewport_has_the_same_shape_on_both_paths(
+    client, db_session, use_index, zoom, key
+):
+    _seed(client, _auth_headers(db_session))
+    empty = {"min_lat": -40.0, "max_lat": -39.0, "min_lon": 3.0, "max_lon": 4.0}
+    body = asyncio.run(
+        PropertyService().get_map_markers(db_session, zoom=zoom, **empty)
+    )
+    level = cluster_level(
+        viewport_boxes(*empty.values()), zoom, property_service_module.MAP_MAX_CELLS
+    )
+    assert body == {"zoom": zoom, "level": level, "total": 0, key: []}
+
+
+def test_viewport_across_the_antimeridian(client, db_session, use_index):
+    headers = _auth_headers(db_session)
+    _create(client, headers, -17.0, 179.5)
+    _create(client, headers, -17.0, -179.5)
+    _create(client, headers, -17.0, 170.0)
+
+    params = {"min_lat": -18, "max_lat": -16, "min_lon": 179, "max_lon": -179, "zoom": 6}
+    assert client.get("/properties/map", params=params).json()["total"] == 2
+    params["min_lat"] = -10
+    assert client.get("/properties/map", params=params).status_code == 400
+
+
+def test_cluster_level_caps_cell_count():
+    small = viewport_boxes(6.0, 7.0, 3.0, 4.0)
+    assert cluster_level(small, 8) == 11
+    world = viewport_boxes(-85.0, 85.0, -180.0, 180.0)
+    assert cluster_level(world, 20, max_cells=1024) <= 5
@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.market_rollup import (
+    MarketRollup,
+    compute_market_rollups,
+    rebuild_market_rollups,
+    set_market_rollups,
+)
+from app.services.market_stats import market_stats, rebuild
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def _create(client, headers, **overrides):
+    payload = {**_property_payload(), **overrides}
+    response = client.post("/properties/", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _rollups(db_session):
+    db_session.expire_all()
+    rows = db_session.execute(
+        select(MarketRollup).where(MarketRollup.count != 0)
+    ).scalars()
+    return sorted(
+        (r.city, r.property_type, r.metric, r.bucket, r.count) for r in rows
+    )
+
+
+def test_stats_percentiles_and_histograms(client, db_session):
+    headers = _auth_headers(db_session)
+    for price in (100000, 200000, 400000):
+        _create(client, headers, price=price, square_feet=1000)
+    _create(client, headers, city="Elsewhere", price=9000000)
+    _create(client, headers, property_type="condo", price=50000)
+
+    body = client.get(
+        "/properties/stats", params={"city": "TOWN", "property_type": "house"}
+    ).json()
+    assert body["count"] == 3
+    price = body["price"]
+    assert price["percentiles"]["p50"] == pytest.approx(200000, rel=0.06)
+    p10, p50, p90 = (price["percentiles"][p] for p in ("p10", "p50", "p90"))
+    assert p10 < p50 < p90
+    assert sum(b["count"] for b in price["histogram"]) == 3
+    assert all(b["lower"] < b["upper"] for b in price["histogram"])
+    assert body["price_per_sqft"]["percentiles"]["p50"] == pytest.approx(200, rel=0.06)
+    assert body["days_on_market"]["histogram"][0] == {"lower": 0, "upper": 7, "count": 3}
+
+    assert client.get("/properties/stats").json()["count"] == 5
+    empty = client.get("/properties/stats", params={"city": "nowhere"}).json()
+    assert (empty["count"], empty["price"]) == (0, None)
+
+
+def test_rollups_follow_writes_and_match_a_rebuild(client, db_session):
+    headers = _auth_headers(db_session)
+    _create(client, headers)
+    moved = _create(client, headers, price=300000)
+    sold = _create(client, headers)
+    deleted = _create(client, headers)
+
+    client.patch(
+        f"/properties/{moved}", json={"price": 900000, "city": "Uptown"}, headers=headers
+    )
+    client.patch(f"/properties/{sold}", json={"status": "sold"}, headers=headers)
+    client.delete(f"/properties/{deleted}", headers=headers)
+
+    assert client.get("/properties/stats", params={"city": "town"}).json()["count"] == 1
+    uptown = client.get("/properties/stats", params={"city": "uptown"}).json()
+    assert uptown["price"]["percentiles"]["p50"] == pytest.approx(900000, rel=0.06)
+
+    incremental = _rollups(db_session)
+    rebuild_market_rollups(db_session.connection())
+    db_session.commit()
+    assert _rollups(db_session) == incremental
+
+
+def test_overlapping_rebuilds_write_absolute_counts(client, db_session):
+    headers = _auth_headers(db_session)
+    _create(client, headers)
+    _create(client, headers, city="Uptown", price=900000)
+    expected = _rollups(db_session)
+
+    # Back to back, and interleaved (both recount before either writes)
+    assert rebuild(db_session) and rebuild(db_session)
+    assert _rollups(db_session) == expected
+    first = compute_market_rollups(db_session.connection())
+    second = compute_market_rollups(db_session.connection())
+    set_market_rollups(db_session.connection(), first)
+    set_market_rollups(db_session.connection(), second)
+    db_session.commit()
+    assert _rollups(db_session) == expected
+
+    # Drifted and stray rows are overwritten, not added to
+    db_session.query(MarketRollup).update({MarketRollup.count: 99})
+    db_session.add(
+        MarketRollup(
+            city="Gone",
+            state="X",
+            property_type="house",
+            listing_type="sale",
+            currency="USD",
+            metric="price",
+            bucket=1,
+            count=3,
+        )
+    )
+    db_session.commit()
+    rebuild(db_session)
+    assert _rollups(db_session) == expected
+
+
+def test_imported_listings_are_counted(client, db_session):
+    headers = _auth_headers(db_session)
+    csv = "title,price,address,city,state,zip_code,property_type,listing_type\n" + "".join(
+        f"Home {i},{150000 + i},1 Road,Lagos,LA,100001,house,sell\n" for i in range(4)
+    )
+    response = client.post(
+        "/properties/import",
+        files={"file": ("listings.csv", csv, "text/csv")},
+        headers=headers,
+    )
+    assert response.json()["created"] == 4
+    assert client.get("/properties/stats", params={"city": "lagos"}).json()["count"] == 4
+
+
+def test_days_on_market_is_relative_to_today(client, db_session):
+    headers = _auth_headers(db_session)
+    _create(client, headers)
+    _create(client, headers)
+
+    later = market_stats(db_session, today=date.today() + timedelta(days=40))
+    days = later["days_on_market"]
+    assert 39 <= days["percentiles"]["p50"] <= 41
+    assert [b["count"] for b in days["histogram"] if b["count"]] == [2]
+    assert days["histogram"][3] == {"lower": 30, "upper": 60, "count": 2}
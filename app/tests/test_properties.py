@@ -107,3 +107,45 @@ def test_update_and_delete_property(client, db_session):
     assert get.status_code == 200 and get.json()["price"] == 260000
     delr = client.delete(f"/properties/{pid}", headers=headers)
     assert delr.status_code == 204
+
+
+def test_full_text_search_ranks_and_tracks_updates(client, db_session):
+    headers = _auth_headers(db_session)
+    titles = {
+        "Quiet cottage": "Garden cottage near the lake",
+        "Lake view villa": "Lake house with a private lake dock and lake views",
+        "City loft": "Downtown loft",
+    }
+    ids = {}
+    for title, description in titles.items():
+        payload = {**_property_payload(), "title": title, "description": description}
+        ids[title] = client.post("/properties/", json=payload, headers=headers).json()["id"]
+
+    rows = client.get("/properties/search", params={"search_query": "lake"}).json()
+    assert [r["id"] for r in rows] == [ids["Lake view villa"], ids["Quiet cottage"]]
+
+    # Prefix matching and multi-word AND
+    rows = client.get("/properties/search", params={"search_query": "cott gard"}).json()
+    assert [r["id"] for r in rows] == [ids["Quiet cottage"]]
+
+    # Triggers keep the index in sync with updates and deletes
+    client.patch(
+        f"/properties/{ids['City loft']}",
+        json={"description": "Loft on the lake"},
+        headers=headers,
+    )
+    client.delete(f"/properties/{ids['Quiet cottage']}", headers=headers)
+    rows = client.get("/properties/search", params={"search_query": "lake"}).json()
+    assert sorted(r["id"] for r in rows) == sorted(
+        [ids["Lake view villa"], ids["City loft"]]
+    )
+
+    # Relevance ordering pages with cursors too
+    first = client.get(
+        "/properties/search", params={"search_query": "lake", "limit": 1, "cursor": ""}
+    ).json()
+    second = client.get(
+        "/properties/search",
+        params={"search_query": "lake", "limit": 1, "cursor": first["next_cursor"]},
+    ).json()
+    assert [r["id"] for r in first["items"] + second["items"]] == [r["id"] for r in rows]
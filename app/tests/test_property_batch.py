@@ -0,0 +1,48 @@
+from sqlalchemy import event
+
+from app.models.property_images import PropertyImage
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def test_batch_returns_request_order_with_images(client, db_session):
+    headers = _auth_headers(db_session)
+    ids = []
+    for i in range(3):
+        payload = {**_property_payload(), "title": f"P{i}"}
+        ids.append(client.post("/properties/", json=payload, headers=headers).json()["id"])
+    db_session.add_all(
+        [
+            PropertyImage(property_id=ids[1], file_key="b", file_url="u/b", order_index=2),
+            PropertyImage(property_id=ids[1], file_key="a", file_url="u/a", order_index=1),
+        ]
+    )
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        res = client.get("/properties/batch", params={"ids": f"{ids[1]},999,{ids[0]}"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert res.status_code == 200, res.text
+    items = res.json()["items"]
+    assert [(i["id"], i["found"]) for i in items] == [(ids[1], True), (999, False), (ids[0], True)]
+    assert items[1]["property"] is None
+    assert items[0]["property"]["title"] == "P1"
+    assert [img["file_url"] for img in items[0]["property"]["images"]] == ["u/a", "u/b"]
+    assert items[2]["property"]["images"] == []
+    assert len([s for s in statements if "properties" in s or "property_images" in s]) <= 2
+
+
+def test_batch_accepts_repeated_ids_and_validates(client, db_session):
+    headers = _auth_headers(db_session)
+    pid = client.post("/properties/", json=_property_payload(), headers=headers).json()["id"]
+    items = client.get(f"/properties/batch?ids={pid}&ids={pid}").json()["items"]
+    assert [i["id"] for i in items] == [pid, pid]
+
+    assert client.get("/properties/batch?ids=1,x").status_code == 400
+    too_many = ",".join(str(i) for i in range(301))
+    assert client.get(f"/properties/batch?ids={too_many}").status_code == 400
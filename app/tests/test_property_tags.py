@@ -0,0 +1,55 @@
+from sqlalchemy import select
+
+from app.models.tag import Tag, property_tags, rebuild_property_tags
+from app.tests.test_listing_index import _seed_listings
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def _tag_rows(db):
+    return sorted(
+        db.execute(
+            select(property_tags.c.property_id, Tag.kind, Tag.name).join(
+                Tag, Tag.id == property_tags.c.tag_id
+            )
+        ).all()
+    )
+
+
+def test_tag_index_follows_writes_and_keeps_json_shape(client, db_session):
+    headers = _auth_headers(db_session)
+    payload = {**_property_payload(), "features": ["pool", "garage"], "amenities": ["gym"]}
+    created = client.post("/properties/", json=payload, headers=headers).json()
+    pid = created["id"]
+    assert created["features"] == ["pool", "garage"]
+    assert _tag_rows(db_session) == [
+        (pid, "amenities", "gym"),
+        (pid, "features", "garage"),
+        (pid, "features", "pool"),
+    ]
+
+    def search(**params):
+        return [r["id"] for r in client.get("/properties/search", params=params).json()]
+
+    assert search(features=["pool", "garage"], amenities=["gym"]) == [pid]
+    assert search(features=["pool", "sauna"]) == []
+    # Exact tag membership, not a substring of the JSON text
+    assert search(features=["poo"]) == []
+
+    client.patch(f"/properties/{pid}", json={"features": ["garden"]}, headers=headers)
+    assert search(features=["pool"]) == []
+    assert search(features=["garden"], amenities=["gym"]) == [pid]
+
+    client.delete(f"/properties/{pid}", headers=headers)
+    assert _tag_rows(db_session) == []
+    # Dictionary entries are kept for reuse
+    assert db_session.query(Tag).count() == 4
+
+
+def test_rebuild_matches_incremental_index(db_session):
+    _seed_listings(db_session)
+    incremental = _tag_rows(db_session)
+    assert incremental
+
+    rebuild_property_tags(db_session.connection(), batch_size=7)
+    db_session.commit()
+    assert _tag_rows(db_session) == incremental
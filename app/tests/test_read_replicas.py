@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+import app.database as db_module
+from app.config import settings
+from app.database import PRIMARY_UNTIL_COOKIE, Base, ReplicaSet
+from app.models.property import Property
+from app.models.user import User
+from app.services.auth_service import create_access_token
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def replica(monkeypatch, tmp_path):
+    replica_set = ReplicaSet([f"sqlite:///{tmp_path}/replica.db"])
+    Base.metadata.create_all(replica_set.replicas[0].engine)
+    monkeypatch.setattr(db_module, "replicas", replica_set)
+    yield replica_set.replicas[0]
+    replica_set.replicas[0].engine.dispose()
+
+
+def _seller_headers(db):
+    user = db.query(User).filter(User.email == "seller@example.com").one()
+    token = create_access_token(user.email, user.id, user.role.value, timedelta(minutes=30))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _listing_on_both(client, db_session, replica):
+    """A listing on the primary, and a copy with another title on the replica."""
+    response = client.post(
+        "/properties/", json=_property_payload(), headers=_auth_headers(db_session)
+    )
+    assert response.status_code == 201
+    row = db_session.execute(select(Property.__table__)).mappings().one()
+    with replica.engine.begin() as conn:
+        conn.execute(Property.__table__.insert(), {**row, "title": "Replica copy"})
+    client.cookies.clear()
+    return row["id"]
+
+
+def test_reads_go_to_replica(client, db_session, replica):
+    property_id = _listing_on_both(client, db_session, replica)
+    response = client.get(f"/properties/{property_id}")
+    assert response.json()["title"] == "Replica copy"
+    assert client.get("/properties/stats").status_code == 200
+
+
+def test_client_reads_own_writes_from_primary(client, db_session, replica):
+    property_id = _listing_on_both(client, db_session, replica)
+    headers = _seller_headers(db_session)
+    response = client.patch(
+        f"/properties/{property_id}", json={"description": "Updated"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert PRIMARY_UNTIL_COOKIE in response.cookies
+    assert client.get(f"/properties/{property_id}").json()["title"] == "Nice House"
+
+
+def test_lagging_replica_is_skipped(client, db_session, replica, monkeypatch):
+    property_id = _listing_on_both(client, db_session, replica)
+    monkeypatch.setattr(settings, "REPLICA_MAX_LAG_SECONDS", -1)
+    assert client.get(f"/properties/{property_id}").json()["title"] == "Nice House"
+    assert not replica.usable
+
+
+def test_unreachable_replica_falls_back_to_primary(client, db_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        db_module, "replicas", ReplicaSet([f"sqlite:///{tmp_path}/missing/replica.db"])
+    )
+    response = client.post(
+        "/properties/", json=_property_payload(), headers=_auth_headers(db_session)
+    )
+    client.cookies.clear()
+    property_id = response.json()["id"]
+    assert client.get(f"/properties/{property_id}").json()["title"] == "Nice House"
+    assert db_module.replicas.replicas[0].retry_at > 0
+
+
+
+@pytest.mark.parametrize(
+    "path", ["/properties/export?format=ndjson", "/properties/search"]
+)
+def test_read_only_posts_read_replica_without_pinning(
+    client, db_session, replica, path
+):
+    _listing_on_both(client, db_session, replica)
+    response = client.post(path, json={})
+    assert response.status_code == 200
+    assert "Replica copy" in response.text
+    assert PRIMARY_UNTIL_COOKIE not in response.cookies
+
+
+def test_post_facets_read_replica_without_pinning(client, db_session, replica):
+    _listing_on_both(client, db_session, replica)
+    with replica.engine.begin() as conn:
+        conn.execute(Property.__table__.update().values(bedrooms=9))
+    response = client.post("/properties/search/facets", json={})
+    assert response.status_code == 200
+    assert PRIMARY_UNTIL_COOKIE not in response.cookies
+    assert response.json()["bedrooms"]["5+"] == 1
+
+
+def test_refused_replica_connection_falls_back(client, db_session, replica, monkeypatch):
+    _listing_on_both(client, db_session, replica)
+
+    def refuse():
+        raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(replica.engine, "connect", refuse)
+    response = client.get("/properties/autocomplete", params={"prefix": "to"})
+    assert response.status_code == 200
+    assert not replica.usable and replica.retry_at > 0
@@ -0,0 +1,147 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.user import User, UserRole
+from app.services import saved_searches as saved_searches_module
+from app.services.auth_service import create_access_token
+from app.services.search_cache import snapshot
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def _buyer_headers(db, email="buyer@example.com"):
+    user = User(
+        email=email,
+        password_hash="x",
+        first_name="B",
+        last_name="Uyer",
+        role=UserRole.BUYER,
+        is_active=True,
+        is_verified=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(user)
+    db.commit()
+    token = create_access_token(
+        user.email, user.id, user.role.value, timedelta(minutes=30)
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _save(client, headers, name, **filters):
+    response = client.post(
+        "/saved-searches/", json={"name": name, "filters": filters}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.fixture()
+def alerts(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        saved_searches_module,
+        "dispatch_notification",
+        lambda user_id, title, body, payload: sent.append(payload),
+    )
+    return sent
+
+
+def test_saved_search_crud(client, db_session):
+    headers = _buyer_headers(db_session)
+    other = _buyer_headers(db_session, "other@example.com")
+
+    search_id = _save(
+        client, headers, "Homes", city="  Town ", features=["pool", "garage"], limit=5
+    )
+    body = client.get(f"/saved-searches/{search_id}", headers=headers).json()
+    assert body["filters"] == {"city": "town", "features": ["garage", "pool"]}
+
+    updated = client.patch(
+        f"/saved-searches/{search_id}",
+        json={"name": "Cheap", "filters": {"max_price": 100000}},
+        headers=headers,
+    ).json()
+    assert (updated["name"], updated["filters"]) == ("Cheap", {"max_price": 100000})
+
+    assert client.get(f"/saved-searches/{search_id}", headers=other).status_code == 404
+    empty = client.post(
+        "/saved-searches/", json={"name": "All", "filters": {}}, headers=headers
+    )
+    assert empty.status_code == 400
+
+    assert client.delete(f"/saved-searches/{search_id}", headers=headers).status_code == 204
+    assert client.get("/saved-searches/", headers=headers).json() == []
+
+
+def test_new_and_updated_listings_alert_matching_searches(client, db_session, alerts):
+    seller = _auth_headers(db_session)
+    buyer = _buyer_headers(db_session)
+    town = _save(client, buyer, "Town houses", city="town", property_type="house", max_price=300000)
+    _save(client, buyer, "Lagos", city="Lagos")
+    luxury = _save(client, buyer, "Luxury", min_price=1000000)
+    _save(client, seller, "Own listings", city="town")
+
+    created = client.post("/properties/", json=_property_payload(), headers=seller)
+    listing = created.json()["id"]
+    assert alerts == [{"saved_search_id": town, "property_id": listing}]
+
+    # Still matching: no repeat alert
+    client.patch(f"/properties/{listing}", json={"price": 280000}, headers=seller)
+    assert len(alerts) == 1
+
+    client.patch(f"/properties/{listing}", json={"price": 2000000}, headers=seller)
+    assert alerts[-1] == {"saved_search_id": luxury, "property_id": listing}
+
+    # Off-market listings alert nobody; coming back on the market counts as new
+    client.patch(f"/properties/{listing}", json={"status": "sold"}, headers=seller)
+    assert len(alerts) == 2
+    client.patch(f"/properties/{listing}", json={"status": "available"}, headers=seller)
+    assert [a["saved_search_id"] for a in alerts] == [town, luxury, luxury]
+
+
+def test_imported_listings_alert_matching_searches(client, db_session, alerts):
+    seller = _auth_headers(db_session)
+    buyer = _buyer_headers(db_session)
+    town = _save(client, buyer, "Town", city="town", max_price=300000)
+    rows = [
+        _property_payload(),
+        {**_property_payload(), "city": "Elsewhere"},
+        {**_property_payload(), "price": 900000},
+    ]
+    content = "".join(json.dumps(row) + "\n" for row in rows).encode()
+    response = client.post(
+        "/properties/import",
+        files={"file": ("listings.ndjson", content)},
+        headers=seller,
+    )
+    assert response.status_code == 200, response.text
+    first = response.json()["property_ids"][0]
+    assert alerts == [{"saved_search_id": town, "property_id": first}]
+
+
+def test_candidates_come_from_the_index_key(client, db_session, alerts):
+    seller = _auth_headers(db_session)
+    buyer = _buyer_headers(db_session)
+    _save(client, buyer, "Lagos", city="Lagos")
+    _save(client, buyer, "Condos", property_type="condo")
+    _save(client, buyer, "Cheap", max_price=1000)
+    anywhere = _save(client, buyer, "Gym", amenities=["gym"])
+    town = _save(client, buyer, "Town garages", city="TOWN", features=["garage", "pool"])
+    text = _save(client, buyer, "Nice", search_query="nice")
+    _save(client, buyer, "Castle", search_query="castle")
+    spaced = _save(client, buyer, "Spaced", city="  TOWN ")
+
+    response = client.post("/properties/", json=_property_payload(), headers=seller)
+    from app.models.property import Property
+
+    listing = db_session.get(Property, response.json()["id"])
+    candidates = saved_searches_module.candidate_searches(db_session, snapshot(listing))
+    # City, type and price band prune; tag and text filters are checked after
+    assert sorted(s.id for s in candidates) == sorted(
+        [anywhere, town, text, text + 1, spaced]
+    )
+    assert sorted(a["saved_search_id"] for a in alerts) == sorted(
+        [anywhere, text, spaced]
+    )
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from app.config import settings
+from app.schemas.property import PropertySearchParams
+from app.services import property_service as property_service_module
+from app.services.search_cache import SearchCache
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def cache(monkeypatch):
+    cache = SearchCache(max_entries=3, ttl_seconds=60)
+    monkeypatch.setattr(property_service_module, "search_cache", cache)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    return cache
+
+
+def test_key_normalizes_equivalent_searches():
+    a = PropertySearchParams(city="LAGOS", features=["pool", "garage"], currency="usd")
+    b = PropertySearchParams(city="lagos", features=["garage", "pool", "garage"], currency="USD")
+    c = PropertySearchParams(city="lagos", features=["garage"], currency="USD")
+    assert SearchCache.key(a) == SearchCache.key(b)
+    assert SearchCache.key(a) != SearchCache.key(c)
+    assert SearchCache.key(a) != SearchCache.key(a.model_copy(update={"skip": 10}))
+    # Spacing is collapsed and case lowered exactly as the SQL filter does
+    spaced = PropertySearchParams(city=" Port  Harcourt")
+    assert SearchCache.key(spaced) == SearchCache.key(
+        PropertySearchParams(city="port harcourt")
+    )
+    # lower(), not casefold(): "ß" and "ss" are different SQL filters
+    assert SearchCache.key(PropertySearchParams(city="Straße")) != SearchCache.key(
+        PropertySearchParams(city="strasse")
+    )
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = SearchCache(max_entries=2, ttl_seconds=10)
+    keys = [SearchCache.key(PropertySearchParams(city=c)) for c in ("a", "b", "c")]
+    cache.put(keys[0], [(1, None)])
+    cache.put(keys[1], [(2, None)])
+    assert cache.get(keys[0]) == [(1, None)]  # keys[0] is now most recent
+    cache.put(keys[2], [(3, None)])
+    assert cache.get(keys[1]) is None
+    assert cache.stats()["evictions"] == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.services.search_cache.time.monotonic", lambda: now + 11)
+    assert cache.get(keys[0]) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+
+
+def test_writes_invalidate_only_matching_searches(client, db_session, cache):
+    headers = _auth_headers(db_session)
+    town = {"city": "town", "min_price": 200000}
+    elsewhere = {"city": "elsewhere"}
+
+    assert client.get("/properties/search", params=town).json() == []
+    assert client.get("/properties/search", params=elsewhere).json() == []
+    assert client.get("/properties/search", params=town).json() == []
+    assert cache.stats()["hits"] == 1
+
+    # The new listing matches the "town" search only
+    pid = client.post("/properties/", json=_property_payload(), headers=headers).json()["id"]
+    assert cache.stats()["invalidations"] == 1
+    assert [r["id"] for r in client.get("/properties/search", params=town).json()] == [pid]
+    assert client.get("/properties/search", params=elsewhere).json() == []
+    assert cache.stats()["hits"] == 2
+
+    # Cached hits load fresh rows
+    client.patch(f"/properties/{pid}", json={"title": "Renamed"}, headers=headers)
+    assert client.get("/properties/search", params=town).json()[0]["title"] == "Renamed"
+
+    # Moving out of the price band drops the cached page that held it
+    client.patch(f"/properties/{pid}", json={"price": 150000}, headers=headers)
+    assert client.get("/properties/search", params=town).json() == []
+
+    client.patch(f"/properties/{pid}", json={"price": 300000}, headers=headers)
+    client.delete(f"/properties/{pid}", headers=headers)
+    assert client.get("/properties/search", params=town).json() == []
+
+
+def test_relevance_cursor_survives_cache_hit(client, db_session, cache):
+    headers = _auth_headers(db_session)
+    for title in ("Garden flat", "Garden house", "Garden villa"):
+        client.post("/properties/", json={**_property_payload(), "title": title}, headers=headers)
+
+    params = {"search_query": "garden", "limit": 2, "cursor": ""}
+    first = client.get("/properties/search", params=params).json()
+    again = client.get("/properties/search", params=params).json()
+    assert again == first
+    rest = client.get(
+        "/properties/search", params={**params, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(first["items"]) + len(rest["items"]) == 3
@@ -0,0 +1,105 @@
+import pytest
+
+from app.config import settings
+from app.services import property_service as property_service_module
+from app.services.listing_index import ListingIndex
+from app.services.search_cache import HitCountCache
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+def _create(client, headers, n, **overrides):
+    for i in range(n):
+        payload = {**_property_payload(), "title": f"Nice House {i}", **overrides}
+        assert client.post("/properties/", json=payload, headers=headers).status_code == 201
+
+
+@pytest.fixture()
+def counts(monkeypatch):
+    cache = HitCountCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(property_service_module, "hit_counts", cache)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    return cache
+
+
+def test_total_is_exact_for_structured_filters(client, db_session):
+    headers = _auth_headers(db_session)
+    _create(client, headers, 5)
+    _create(client, headers, 2, city="Elsewhere")
+
+    body = client.get(
+        "/properties/search", params={"city": "town", "limit": 2, "include_total": True}
+    ).json()
+    assert len(body["items"]) == 2
+    assert (body["total"], body["total_exact"], body["next_cursor"]) == (5, True, None)
+
+    # Without the flag the response is still a plain list
+    assert isinstance(client.get("/properties/search").json(), list)
+
+
+def test_short_page_counts_without_a_second_query(client, db_session, monkeypatch):
+    headers = _auth_headers(db_session)
+    _create(client, headers, 3)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("count query should not run")
+
+    monkeypatch.setattr(property_service_module.PropertyService, "count_hits", fail)
+    body = client.get(
+        "/properties/search", params={"skip": 1, "include_total": True}
+    ).json()
+    assert (len(body["items"]), body["total"], body["total_exact"]) == (2, 3, True)
+
+
+def test_free_text_total_is_bounded(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_COUNT_LIMIT", 3)
+    headers = _auth_headers(db_session)
+    _create(client, headers, 5)
+
+    params = {"search_query": "lovely", "limit": 1, "include_total": True}
+    body = client.get("/properties/search", params=params).json()
+    assert (body["total"], body["total_exact"]) == (3, False)
+
+    body = client.post(
+        "/properties/search?include_total=true&fields=id,title",
+        json={"search_query": "lovely", "limit": 1, "cursor": ""},
+    ).json()
+    assert set(body["items"][0]) == {"id", "title"}
+    assert body["next_cursor"]
+    assert (body["total"], body["total_exact"]) == (3, False)
+
+    monkeypatch.setattr(settings, "SEARCH_COUNT_LIMIT", 10)
+    body = client.get("/properties/search", params=params).json()
+    assert (body["total"], body["total_exact"]) == (5, True)
+
+
+def test_cached_totals_are_invalidated_by_matching_writes(client, db_session, counts):
+    headers = _auth_headers(db_session)
+    _create(client, headers, 2)
+
+    params = {"city": "town", "limit": 1, "include_total": True}
+    assert client.get("/properties/search", params=params).json()["total"] == 2
+    assert client.get("/properties/search", params=params).json()["total"] == 2
+    assert counts.stats()["hits"] == 1
+
+    _create(client, headers, 1, city="Elsewhere")
+    assert client.get("/properties/search", params=params).json()["total"] == 2
+    assert counts.stats()["hits"] == 2
+
+    _create(client, headers, 1)
+    assert client.get("/properties/search", params=params).json()["total"] == 3
+
+
+def test_listing_index_counts(client, db_session, monkeypatch):
+    index = ListingIndex()
+    monkeypatch.setattr(property_service_module, "listing_index", index)
+    monkeypatch.setattr(settings, "LISTING_INDEX_ENABLED", True)
+    headers = _auth_headers(db_session)
+    _create(client, headers, 4)
+    _create(client, headers, 2, bedrooms=5)
+
+    body = client.get(
+        "/properties/search",
+        params={"min_bedrooms": 4, "limit": 1, "include_total": True},
+    ).json()
+    assert (body["total"], body["total_exact"]) == (2, True)
+    assert len(index) == 6
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.property import ListingType, PropertyStatus, PropertyType
+from app.services import property_service as property_service_module
+from app.services.similar_listings import FIELDS, SimilarListings
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def index(monkeypatch):
+    index = SimilarListings()
+    monkeypatch.setattr(property_service_module, "similar_listings", index)
+    return index
+
+
+def _create(client, headers, **overrides):
+    payload = {**_property_payload(), **overrides}
+    response = client.post("/properties/", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _similar(client, pid, **params):
+    response = client.get(f"/properties/{pid}/similar", params=params)
+    assert response.status_code == 200
+    return [p["id"] for p in response.json()]
+
+
+def _row(id, **values):
+    base = {name: None for name in FIELDS}
+    base.update(id=id, is_active=True, status=PropertyStatus.AVAILABLE)
+    return SimpleNamespace(**{**base, **values})
+
+
+def test_nearest_first_and_self_excluded():
+    index = SimilarListings()
+    house = dict(price=250_000, bedrooms=3, property_type=PropertyType.HOUSE)
+    index._load(
+        [
+            _row(1, **house),
+            _row(2, **{**house, "price": 260_000}),
+            _row(3, **{**house, "price": 2_500_000, "bedrooms": 7}),
+            _row(4, **house, is_active=False),
+            _row(5, **house, status=PropertyStatus.SOLD),
+        ]
+    )
+    assert index.similar_ids(_row(1, **house), k=10) == [2, 3]
+    assert index.similar_ids(_row(1, **house), k=1) == [2]
+
+
+def test_similar_endpoint_ranks_active_listings(client, db_session, index):
+    headers = _auth_headers(db_session)
+    source = _create(client, headers)
+    twin = _create(client, headers, price=255000)
+    villa = _create(
+        client,
+        headers,
+        price=4_000_000,
+        bedrooms=8,
+        square_feet=9000,
+        property_type=PropertyType.VILLA.value,
+        listing_type=ListingType.RENT.value,
+        latitude=40.0,
+        longitude=-70.0,
+    )
+    sold = _create(client, headers, price=250000)
+    client.patch(f"/properties/{sold}", json={"status": "sold"}, headers=headers)
+
+    assert _similar(client, source) == [twin, villa]
+    assert _similar(client, source, limit=1) == [twin]
+
+    body = client.get(f"/properties/{source}/similar", params={"fields": "price"}).json()
+    assert body[0] == {"id": twin, "price": 255000.0}
+
+
+def test_writes_update_the_matrix_incrementally(client, db_session, index, monkeypatch):
+    headers = _auth_headers(db_session)
+    source = _create(client, headers)
+    other = _create(client, headers, price=900000, bedrooms=6)
+    assert _similar(client, source) == [other]
+
+    def fail(db):
+        raise AssertionError("matrix should not be rebuilt")
+
+    monkeypatch.setattr(index, "rebuild", fail)
+    closer = _create(client, headers, price=251000)
+    assert _similar(client, source) == [closer, other]
+
+    client.patch(f"/properties/{closer}", json={"price": 5000000}, headers=headers)
+    assert _similar(client, source) == [other, closer]
+
+    client.delete(f"/properties/{other}", headers=headers)
+    assert _similar(client, source) == [closer]
+
+
+def test_similar_unknown_property(client, index):
+    assert client.get("/properties/999/similar").status_code == 404
@@ -0,0 +1,79 @@
+import pytest
+
+from app.models.property_view_count import PropertyViewCount
+from app.routers import properties as properties_router
+from app.services import property_service as property_service_module
+from app.services.view_counter import ViewCounter
+from app.tests.test_properties import _auth_headers, _property_payload
+
+
+@pytest.fixture()
+def counter(monkeypatch):
+    fresh = ViewCounter(half_life_seconds=3600, max_listings=100)
+    monkeypatch.setattr(properties_router, "view_counter", fresh)
+    monkeypatch.setattr(property_service_module, "view_counter", fresh)
+    return fresh
+
+
+def _stored_views(db):
+    db.expire_all()
+    return {row.property_id: row.view_count for row in db.query(PropertyViewCount)}
+
+
+def test_views_are_buffered_and_flushed_in_batches(client, db_session, counter):
+    headers = _auth_headers(db_session)
+    first = client.post("/properties/", json=_property_payload(), headers=headers).json()
+    second = client.post("/properties/", json=_property_payload(), headers=headers).json()
+    for _ in range(3):
+        etag = client.get(f"/properties/{first['id']}").headers["etag"]
+    client.get(f"/properties/{second['id']}")
+    # Revalidations and misses are not views
+    client.get(f"/properties/{first['id']}", headers={"If-None-Match": etag})
+    client.get("/properties/999999")
+
+    assert _stored_views(db_session) == {}
+    assert counter.flush(db_session) == 2
+    assert _stored_views(db_session) == {first["id"]: 3, second["id"]: 1}
+    assert counter.flush(db_session) == 0
+
+    client.get(f"/properties/{first['id']}")
+    counter.flush(db_session)
+    assert _stored_views(db_session)[first["id"]] == 4
+
+
+def test_trending_ranks_recent_views_of_listings_on_the_market(
+    client, db_session, counter
+):
+    headers = _auth_headers(db_session)
+    ids = [
+        client.post("/properties/", json=_property_payload(), headers=headers).json()["id"]
+        for _ in range(3)
+    ]
+    for property_id, views in zip(ids, (1, 4, 3)):
+        for _ in range(views):
+            client.get(f"/properties/{property_id}")
+    counter.flush(db_session)
+    client.get(f"/properties/{ids[0]}")
+    client.patch(f"/properties/{ids[1]}", json={"status": "sold"}, headers=headers)
+
+    trending = client.get("/properties/trending?limit=5").json()
+    assert [p["id"] for p in trending] == [ids[2], ids[0]]
+    # Flushed plus still buffered views
+    assert trending[1]["views"] == 2
+    assert trending[0]["trending_score"] == pytest.approx(3, rel=1e-3)
+
+
+def test_scores_decay_by_half_life(db_session):
+    counter = ViewCounter(half_life_seconds=10, max_listings=1)
+    for _ in range(4):
+        counter.record(1, now=counter._epoch)
+    for _ in range(2):
+        counter.record(2, now=counter._epoch + 20)
+    now = counter._epoch + 20
+    assert counter.trending(2, now=now) == [
+        (2, pytest.approx(2)),
+        (1, pytest.approx(1)),
+    ]
+    # A flush rebases the scores and keeps only the top max_listings
+    counter.flush(db_session, now=now)
+    assert counter.trending(2, now=now + 10) == [(2, pytest.approx(1))]
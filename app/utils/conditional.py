@@ -0,0 +1,92 @@
+"""
+HTTP validators (ETag / Last-Modified) and 304 handling for polled GETs.
+
+Routes compute ``Validators`` from a cheap version lookup (ids and
+timestamps, not full rows), return ``not_modified(...)`` when the client's
+copy is current, and otherwise stamp the headers onto the full response.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from starlette import status
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    # SQLite hands back naive datetimes; they are stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def validators(versions: Iterable[tuple], *extra) -> Validators:
+    """
+    Strong ETag over ``versions`` ((id, updated_at, created_at, ...) rows, in
+    response order) and anything else the body depends on (``extra``), with
+    the newest timestamp as Last-Modified.
+    """
+    digest = hashlib.sha1(repr(extra).encode())
+    newest = None
+    for row in versions:
+        digest.update(repr(tuple(row)).encode())
+        stamps = [_utc(v) for v in (newest, *row[1:]) if isinstance(v, datetime)]
+        if stamps:
+            newest = max(stamps)
+    return Validators(f'"{digest.hexdigest()}"', newest)
+
+
+def _etags(header: str):
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def is_conditional(request: Request) -> bool:
+    """Whether the request carries a validator worth checking before a full load."""
+    return (
+        "if-none-match" in request.headers or "if-modified-since" in request.headers
+    )
+
+
+def is_not_modified(
+    request: Request, current: Validators, by_date: bool = True
+) -> bool:
+    """
+    RFC 9110 evaluation: If-None-Match wins; If-Modified-Since otherwise.
+    Collections pass ``by_date=False``: an item dropping out of one does not
+    move its newest timestamp, so only the ETag can tell.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _etags(if_none_match)
+        return "*" in tags or current.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if by_date and if_modified_since and current.last_modified is not None:
+        try:
+            since = _utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return current.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, current: Validators) -> Response:
+    response.headers["ETag"] = current.etag
+    if current.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(
+            current.last_modified, usegmt=True
+        )
+    return response
+
+
+def not_modified(current: Validators) -> Response:
+    return set_validators(Response(status_code=status.HTTP_304_NOT_MODIFIED), current)
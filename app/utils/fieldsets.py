@@ -0,0 +1,97 @@
+"""
+Response path for property lists, with sparse fieldsets (``fields=id,title``).
+
+Services select just the requested columns as Core rows, which are dumped
+straight to JSON bytes by a TypeAdapter compiled once per distinct field
+set. This skips ORM instances, FastAPI's response_model validation and the
+stdlib JSON encoder.
+"""
+
+from functools import lru_cache
+from typing import List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+from typing_extensions import TypedDict
+
+from app.schemas.property import PropertyResponse
+
+FIELDS = tuple(PropertyResponse.model_fields)
+
+fields_query = Query(
+    None,
+    description="Comma-separated response fields, e.g. id,title,price,city "
+    "(default: all). id is always included.",
+)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Validated field names in PropertyResponse order; all of them by default."""
+    if fields is None:
+        return FIELDS
+    wanted = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(wanted.difference(FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    wanted.add("id")
+    return tuple(name for name in FIELDS if name in wanted)
+
+
+@lru_cache(maxsize=128)
+def _adapters(fields: Tuple[str, ...]):
+    # A TypedDict over the PropertyResponse annotations serialises plain dicts
+    # without a validation pass; the column projection already fixes the shape.
+    item = TypedDict(
+        "PropertyFields",
+        {name: PropertyResponse.model_fields[name].annotation for name in fields},
+    )
+    page = TypedDict(
+        "PropertyFieldsPage",
+        {
+            "items": List[item],
+            "next_cursor": Optional[str],
+            "total": int,
+            "total_exact": bool,
+        },
+        total=False,
+    )
+    return TypeAdapter(List[item]), TypeAdapter(page)
+
+
+def _as_dict(item, fields: Tuple[str, ...]) -> Mapping:
+    if isinstance(item, Row):
+        return item._asdict()
+    if isinstance(item, Mapping):
+        return item
+    return {name: getattr(item, name) for name in fields}
+
+
+def encode_properties(
+    properties, fields: Tuple[str, ...] = FIELDS, next_cursor=..., total=None
+) -> bytes:
+    """
+    JSON for Core rows (or mappings/objects) carrying ``fields``; a
+    PropertyPage shaped object when ``next_cursor`` is given (None included),
+    or a SearchPage one when ``total`` (a HitCount) is.
+    """
+    items, page = _adapters(fields)
+    values = [_as_dict(p, fields) for p in properties]
+    if next_cursor is ... and total is None:
+        return items.dump_json(values, warnings=False)
+    body = {"items": values, "next_cursor": None if next_cursor is ... else next_cursor}
+    if total is not None:
+        body.update(total=total.total, total_exact=total.exact)
+    return page.dump_json(body, warnings=False)
+
+
+def fieldset_response(
+    properties, fields: Tuple[str, ...] = FIELDS, next_cursor=..., total=None
+) -> Response:
+    return Response(
+        content=encode_properties(properties, fields, next_cursor, total),
+        media_type="application/json",
+    )
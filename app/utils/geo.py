@@ -0,0 +1,146 @@
+"""
+Integer geohash cells and bounding boxes for radius and viewport searches.
+
+A cell is the 52-bit Z-order (Morton) interleaving of 26-bit quantised
+longitude/latitude, i.e. a geohash stored as an integer. Every geohash prefix
+is then a contiguous integer range, so "is inside this cell" is a plain
+BETWEEN on a B-tree index on both SQLite and PostgreSQL, and the cell at a
+coarser level is just ``cell >> 2 * (CELL_BITS - level)``.
+"""
+
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+CELL_BITS = 26  # per axis: ~0.3m of latitude at full precision
+
+_AXIS_MAX = (1 << CELL_BITS) - 1
+
+
+def _quantise(value: float, low: float, high: float) -> int:
+    q = int((value - low) / (high - low) * (1 << CELL_BITS))
+    return min(max(q, 0), _AXIS_MAX)
+
+
+def _interleave(x: int, y: int, bits: int) -> int:
+    """Interleave ``bits`` bits of x (longitude, high bit first) and y (latitude)."""
+    code = 0
+    for i in range(bits - 1, -1, -1):
+        code = (code << 2) | (((x >> i) & 1) << 1) | ((y >> i) & 1)
+    return code
+
+
+def encode_cell(latitude: float, longitude: float) -> int:
+    return _interleave(
+        _quantise(longitude, -180.0, 180.0),
+        _quantise(latitude, -90.0, 90.0),
+        CELL_BITS,
+    )
+
+
+def bounding_boxes(
+    latitude: float, longitude: float, radius_km: float
+) -> List[Tuple[float, float, float, float]]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) boxes enclosing the circle. Two boxes
+    are returned when the circle crosses the antimeridian.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - math.degrees(angular)
+    max_lat = latitude + math.degrees(angular)
+    if min_lat <= -90 or max_lat >= 90:
+        # Circle contains a pole: every longitude is in range
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    delta_lon = math.degrees(
+        math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(latitude))))
+    )
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        return [
+            (min_lat, max_lat, min_lon + 360, 180.0),
+            (min_lat, max_lat, -180.0, max_lon),
+        ]
+    if max_lon > 180:
+        return [
+            (min_lat, max_lat, min_lon, 180.0),
+            (min_lat, max_lat, -180.0, max_lon - 360),
+        ]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def cell_ranges(
+    boxes: List[Tuple[float, float, float, float]], max_cells: int = 16
+) -> List[Tuple[int, int]]:
+    """
+    Inclusive cell-id ranges covering the boxes, using the finest cell size
+    that needs at most ``max_cells`` cells. Adjacent ranges are merged.
+    """
+    quantised = [
+        (
+            _quantise(min_lon, -180.0, 180.0),
+            _quantise(max_lon, -180.0, 180.0),
+            _quantise(min_lat, -90.0, 90.0),
+            _quantise(max_lat, -90.0, 90.0),
+        )
+        for min_lat, max_lat, min_lon, max_lon in boxes
+    ]
+
+    for level in range(CELL_BITS, -1, -1):
+        shift = CELL_BITS - level
+        cells = set()
+        for x0, x1, y0, y1 in quantised:
+            for x in range(x0 >> shift, (x1 >> shift) + 1):
+                for y in range(y0 >> shift, (y1 >> shift) + 1):
+                    cells.add(_interleave(x, y, level))
+                    if len(cells) > max_cells:
+                        break
+                if len(cells) > max_cells:
+                    break
+        if len(cells) <= max_cells:
+            break
+
+    span = 1 << (2 * shift)
+    ranges: List[Tuple[int, int]] = []
+    for cell in sorted(cells):
+        low = cell << (2 * shift)
+        if ranges and ranges[-1][1] + 1 == low:
+            ranges[-1] = (ranges[-1][0], low + span - 1)
+        else:
+            ranges.append((low, low + span - 1))
+    return ranges
+
+
+def viewport_boxes(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float
+) -> List[Tuple[float, float, float, float]]:
+    """Boxes for a map viewport; min_lon > max_lon means it spans the antimeridian."""
+    if min_lon > max_lon:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def _cell_count(boxes, level: int) -> int:
+    shift = CELL_BITS - level
+    count = 0
+    for min_lat, max_lat, min_lon, max_lon in boxes:
+        x = (_quantise(max_lon, -180.0, 180.0) >> shift) - (
+            _quantise(min_lon, -180.0, 180.0) >> shift
+        )
+        y = (_quantise(max_lat, -90.0, 90.0) >> shift) - (
+            _quantise(min_lat, -90.0, 90.0) >> shift
+        )
+        count += (x + 1) * (y + 1)
+    return count
+
+
+def cluster_level(boxes, zoom: int, max_cells: int = 1024) -> int:
+    """
+    Cell level for clustering a viewport at a web-map ``zoom``: cells about
+    an eighth of a map tile wide, made coarser until at most ``max_cells``
+    cells cover the boxes.
+    """
+    level = min(zoom + 3, CELL_BITS)
+    while level > 0 and _cell_count(boxes, level) > max_cells:
+        level -= 1
+    return level
@@ -0,0 +1,65 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+# Sort names backed by another column: prices sort in USD across currencies
+SORT_KEYS = {"price": "price_usd"}
+
+
+def sort_key(sort_by: str) -> str:
+    """Name of the column a ``sort_by`` value orders (and seeks) on."""
+    return SORT_KEYS.get(sort_by, sort_by)
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """Build an opaque keyset cursor from the last row of a page."""
+    payload = {"s": sort_by, "o": sort_order, "id": last_id, "v": value}
+    if isinstance(value, datetime):
+        payload["v"] = value.isoformat()
+        payload["t"] = "dt"
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: Optional[str], sort_by: str, sort_order: str
+) -> Optional[Tuple[Any, int]]:
+    """
+    Return the (sort value, id) to seek past, or None for the first page.
+
+    An empty cursor means "first page, cursor mode"; a cursor issued for a
+    different sort is rejected so pages never silently skip rows.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        value, last_id = payload["v"], int(payload["id"])
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort_by/sort_order",
+        )
+    return value, last_id
+
+
+def next_cursor(
+    items: Sequence[Any], limit: int, sort_by: str, sort_order: str
+) -> Optional[str]:
+    """Cursor for the page after ``items``, or None once a short page is seen."""
+    if len(items) < limit:
+        return None
+    last, column = items[-1], sort_key(sort_by)
+    if isinstance(last, Mapping):
+        return encode_cursor(sort_by, sort_order, last[column], last["id"])
+    return encode_cursor(sort_by, sort_order, getattr(last, column), last.id)
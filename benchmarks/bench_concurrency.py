@@ -0,0 +1,155 @@
+"""
+Mixed slow and fast requests on one event loop: sync Session vs AsyncSession.
+
+Usage:
+    python -m benchmarks.bench_concurrency --rows 200000 --seconds 10
+
+One event loop stands in for one uvicorn worker. Slow clients run uncached SQL
+searches back to back while single-listing fetches arrive at a fixed rate,
+first through
+PropertyService on a synchronous Session (how the async routes used to run,
+blocking the loop for every query) and then through AsyncPropertyService on
+an AsyncSession. Synthetic listings go to a throwaway SQLite file.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.schemas.property import PropertySearchParams
+from app.services.property_service import AsyncPropertyService, PropertyService
+from benchmarks.bench_listing_index import seed
+
+SLOW_SEARCH = PropertySearchParams(
+    city="abuja", min_bedrooms=2, sort_by="price", sort_order="asc", limit=50
+)
+
+
+async def run_clients(open_session, service, rows, seconds, slow_clients, fast_rate):
+    """
+    ``slow_clients`` back-to-back searches, plus single-listing fetches
+    arriving at ``fast_rate`` per second. Latency counts from arrival, so
+    time spent waiting for a blocked loop is included.
+    """
+    latencies = {"slow": [], "fast": []}
+    start = time.perf_counter()
+    deadline = start + seconds
+    rng = random.Random(7)
+
+    async def slow():
+        while time.perf_counter() < deadline:
+            arrived = time.perf_counter()
+            async with open_session() as db:
+                await service.search_properties_with_params(
+                    db, SLOW_SEARCH, include_total=True
+                )
+            latencies["slow"].append((time.perf_counter() - arrived) * 1000)
+            # The server reads the next request from the socket here
+            await asyncio.sleep(0)
+
+    async def fast(arrived, property_id):
+        async with open_session() as db:
+            await service.get_property(db, property_id)
+        latencies["fast"].append((time.perf_counter() - arrived) * 1000)
+
+    async def arrivals():
+        tasks = []
+        for n in range(int(seconds * fast_rate)):
+            arrived = start + n / fast_rate
+            await asyncio.sleep(max(0, arrived - time.perf_counter()))
+            tasks.append(asyncio.create_task(fast(arrived, rng.randrange(1, rows + 1))))
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(arrivals(), *(slow() for _ in range(slow_clients)))
+    return latencies
+
+
+class SyncSessionContext:
+    """``async with`` around a plain Session, as the old get_db dependency."""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    async def __aenter__(self):
+        self.db = self.factory()
+        return self.db
+
+    async def __aexit__(self, *exc):
+        self.db.close()
+
+
+def report(name, latencies, seconds):
+    for kind in ("fast", "slow"):
+        samples = sorted(latencies[kind])
+        if not samples:
+            print(f"{name:<14}{kind:<6}{'-':>10}")
+            continue
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(
+            f"{name:<14}{kind:<6}{len(samples) / seconds:>10.1f}"
+            f"{statistics.median(samples):>10.1f}{p99:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--slow-clients", type=int, default=4)
+    parser.add_argument("--fast-rate", type=float, default=200, help="fetches/s")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    seed(create_engine(f"sqlite:///{path}"), args.rows)
+    # Every slow request goes to SQL
+    settings.LISTING_INDEX_ENABLED = False
+    settings.SEARCH_CACHE_ENABLED = False
+
+    sync_factory = sessionmaker(
+        bind=create_engine(
+            f"sqlite:///{path}",
+            connect_args={"check_same_thread": False},
+            poolclass=NullPool,
+        )
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=32)
+    async_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    clients = (args.seconds, args.slow_clients, args.fast_rate)
+
+    print(f"{'session':<14}{'kind':<6}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    sync = asyncio.run(
+        run_clients(
+            lambda: SyncSessionContext(sync_factory),
+            PropertyService(),
+            args.rows,
+            *clients,
+        )
+    )
+    report("sync", sync, args.seconds)
+
+    async def run_async():
+        try:
+            return await run_clients(
+                async_factory, AsyncPropertyService(), args.rows, *clients
+            )
+        finally:
+            # Pooled aiosqlite connections each hold a worker thread
+            await async_engine.dispose()
+
+    report("async", asyncio.run(run_async()), args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Time POST /properties/import against one POST /properties/ per listing.
+
+Usage:
+    python -m benchmarks.bench_import --rows 10000
+
+Both paths run through PropertyService on a throwaway SQLite file.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app import models  # noqa: F401  (register all tables)
+from app.models.property import ListingType, PropertyType
+from app.models.user import User, UserRole
+from app.schemas.property import PropertyCreate
+from app.services.listing_import import read_listings
+from app.services.property_service import PropertyService
+from benchmarks.bench_listing_index import AMENITIES, CITIES, FEATURES
+
+
+def listings(rows: int):
+    rng = random.Random(7)
+    for i in range(rows):
+        yield {
+            "title": f"Imported {i}",
+            "price": round(rng.uniform(20_000, 2_000_000), 2),
+            "address": f"{i} Import Road",
+            "city": rng.choice(CITIES),
+            "state": "XX",
+            "zip_code": f"{rng.randrange(100000):05d}",
+            "latitude": rng.uniform(4.0, 13.0),
+            "longitude": rng.uniform(3.0, 14.0),
+            "property_type": rng.choice(list(PropertyType)).value,
+            "listing_type": rng.choice(list(ListingType)).value,
+            "bedrooms": rng.randrange(0, 7),
+            "features": rng.sample(FEATURES, rng.randrange(0, 4)),
+            "amenities": rng.sample(AMENITIES, rng.randrange(0, 3)),
+        }
+
+
+def session():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "agent@example.com", "password_hash": "x", "role": UserRole.SELLER}],
+        )
+    return sessionmaker(bind=engine)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+    service = PropertyService()
+
+    payload = "".join(json.dumps(row) + "\n" for row in listings(args.rows)).encode()
+    db = session()
+    start = time.perf_counter()
+    result = asyncio.run(
+        service.import_properties(db, read_listings(io.BytesIO(payload), "ndjson"), 1)
+    )
+    bulk = time.perf_counter() - start
+    print(f"bulk import: {result.created:,} listings in {bulk:.2f}s")
+
+    db = session()
+    start = time.perf_counter()
+    for row in listings(args.rows):
+        asyncio.run(service.create_property(db, PropertyCreate(**row), 1))
+    single = time.perf_counter() - start
+    print(f"one create per listing: {args.rows:,} listings in {single:.2f}s")
+    print(f"speedup: {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
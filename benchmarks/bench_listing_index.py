@@ -0,0 +1,165 @@
+"""
+Compare /properties/search on the SQL path against the in-memory listing index.
+
+Usage:
+    python -m benchmarks.bench_listing_index --rows 1000000
+
+Synthetic listings are written to a throwaway SQLite file (or DATABASE_URL via
+--url) and the same PropertySearchParams are timed through both paths.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app import models  # noqa: F401  (register all tables)
+from app.models.property import Property, PropertyType, ListingType, PropertyStatus
+from app.models.tag import rebuild_property_tags
+from app.models.user import User, UserRole
+from app.schemas.property import PropertySearchParams
+from app.services.listing_index import listing_index
+from app.services.property_service import PropertyService
+from app.utils.geo import encode_cell
+
+CITIES = ["Lagos", "Abuja", "Ibadan", "Kano", "Enugu", "Benin City", "Jos", "Owerri"]
+FEATURES = ["pool", "garage", "garden", "balcony", "fireplace", "basement"]
+AMENITIES = ["gym", "concierge", "parking", "security", "elevator"]
+
+QUERIES = {
+    "default page": {},
+    "city + listing_type": {"city": "lagos", "listing_type": ListingType.RENT},
+    "price band, sort price": {
+        "min_price": 200_000,
+        "max_price": 400_000,
+        "sort_by": "price",
+        "sort_order": "asc",
+    },
+    "beds/baths/type": {
+        "min_bedrooms": 3,
+        "min_bathrooms": 2,
+        "property_type": PropertyType.HOUSE,
+        "is_active": True,
+    },
+    "features pool+garage": {"features": ["pool", "garage"], "limit": 20},
+    "deep page": {"city": "abuja", "skip": 5000, "limit": 50},
+}
+
+
+def seed(engine, rows: int, agents: int = 500):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "email": f"agent{i}@example.com",
+                    "password_hash": "x",
+                    "role": UserRole.SELLER,
+                }
+                for i in range(agents)
+            ],
+        )
+        batch = []
+        for i in range(rows):
+            latitude, longitude = rng.uniform(4.0, 13.0), rng.uniform(3.0, 14.0)
+            batch.append(
+                {
+                    "title": f"Listing {i}",
+                    "description": "Synthetic benchmark listing",
+                    "price": round(rng.uniform(20_000, 2_000_000), 2),
+                    "currency": "USD",
+                    "address": f"{i} Benchmark Road",
+                    "city": rng.choice(CITIES),
+                    "state": "XX",
+                    "zip_code": f"{rng.randrange(100000):05d}",
+                    "country": "Nigeria",
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "geo_cell": encode_cell(latitude, longitude),
+                    "property_type": rng.choice(list(PropertyType)),
+                    "listing_type": rng.choice(list(ListingType)),
+                    "status": rng.choice(list(PropertyStatus)),
+                    "bedrooms": rng.randrange(0, 7),
+                    "bathrooms": rng.randrange(1, 9) / 2,
+                    "square_feet": rng.randrange(300, 8000),
+                    "lot_size": rng.uniform(0.05, 5.0),
+                    "year_built": rng.randrange(1950, 2024),
+                    "features": rng.sample(FEATURES, rng.randrange(0, 4)),
+                    "amenities": rng.sample(AMENITIES, rng.randrange(0, 3)),
+                    "agent_id": rng.randrange(1, agents + 1),
+                    "is_featured": rng.random() < 0.05,
+                    "is_active": rng.random() < 0.9,
+                    "created_at": base + timedelta(minutes=i),
+                }
+            )
+            if len(batch) == 20_000:
+                conn.execute(insert(Property), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Property), batch)
+        # Bulk inserts skip the ORM events that maintain the tag index
+        rebuild_property_tags(conn)
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None, help="existing, already seeded DB")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"seeded {args.rows:,} listings in {time.perf_counter() - start:.1f}s")
+
+    db = sessionmaker(bind=engine)()
+    service = PropertyService()
+
+    start = time.perf_counter()
+    listing_index.rebuild(db)
+    print(f"index built over {len(listing_index):,} listings in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<26}{'sql median ms':>16}{'index median ms':>18}{'speedup':>10}")
+    for name, filters in QUERIES.items():
+        params = PropertySearchParams(**filters)
+
+        def run(enabled: bool):
+            settings.LISTING_INDEX_ENABLED = enabled
+            asyncio.run(service.search_properties_with_params(db, params))
+            db.expunge_all()
+
+        sql_ms = statistics.median(timed(lambda: run(False), args.repeat))
+        index_ms = statistics.median(timed(lambda: run(True), args.repeat))
+        print(f"{name:<26}{sql_ms:>16.1f}{index_ms:>18.1f}{sql_ms / index_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
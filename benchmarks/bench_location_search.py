@@ -0,0 +1,93 @@
+"""
+Latency of /properties/search/location: full-scan Haversine vs geo_cell prefilter.
+
+Usage:
+    python -m benchmarks.bench_location_search --rows 100000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import and_, create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.property import Property
+from app.services.property_service import PropertyService
+from benchmarks.bench_listing_index import seed, timed
+
+SEARCHES = {
+    "Lagos 5 km": (6.52, 3.38, 5.0),
+    "Lagos 25 km": (6.52, 3.38, 25.0),
+    "Abuja 100 km": (9.07, 7.49, 100.0),
+}
+
+
+def full_scan(db, latitude, longitude, radius_km, limit=50):
+    """The pre-prefilter query: distance computed for every active row."""
+    distance = 6371 * func.acos(
+        func.cos(func.radians(latitude))
+        * func.cos(func.radians(Property.latitude))
+        * func.cos(func.radians(Property.longitude) - func.radians(longitude))
+        + func.sin(func.radians(latitude)) * func.sin(func.radians(Property.latitude))
+    )
+    sub = (
+        select(Property.id, distance.label("distance"))
+        .where(
+            and_(
+                Property.latitude.isnot(None),
+                Property.longitude.isnot(None),
+                Property.is_active == True,
+            )
+        )
+        .subquery()
+    )
+    query = (
+        select(sub)
+        .where(sub.c.distance <= radius_km)
+        .order_by(sub.c.distance)
+        .limit(limit)
+    )
+    return db.execute(query).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    service = PropertyService()
+
+    for rows in args.rows:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'geo.db')}")
+        seed(engine, rows)
+        db = sessionmaker(bind=engine)()
+        print(f"\n{rows:,} listings")
+        print(f"{'search':<16}{'hits':>6}{'full scan ms':>15}{'prefilter ms':>15}{'speedup':>10}")
+        for name, (lat, lon, radius) in SEARCHES.items():
+            hits = asyncio.run(
+                service.get_properties_by_location(db, lat, lon, radius, limit=50)
+            )
+            assert [r.id for r in hits] == [r.id for r in full_scan(db, lat, lon, radius)]
+            scan_ms = statistics.median(
+                timed(lambda: full_scan(db, lat, lon, radius), args.repeat)
+            )
+            cell_ms = statistics.median(
+                timed(
+                    lambda: asyncio.run(
+                        service.get_properties_by_location(db, lat, lon, radius, limit=50)
+                    ),
+                    args.repeat,
+                )
+            )
+            print(f"{name:<16}{len(hits):>6}{scan_ms:>15.1f}{cell_ms:>15.1f}{scan_ms / cell_ms:>9.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
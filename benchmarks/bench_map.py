@@ -0,0 +1,68 @@
+"""
+Map viewport markers (/properties/map): SQL grouping vs the listing index.
+
+Usage:
+    python -m benchmarks.bench_map --rows 200000
+
+Synthetic listings are written to a throwaway SQLite file (or DATABASE_URL via
+--url) and the same viewports are timed through both paths.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+
+os.environ.setdefault("TESTING", "true")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.services.listing_index import listing_index
+from app.services.property_service import PropertyService
+from benchmarks.bench_listing_index import seed, timed
+
+# (min_lat, max_lat, min_lon, max_lon, zoom) over the seeded area
+VIEWPORTS = {
+    "country, zoom 6": (4.0, 13.0, 3.0, 14.0, 6),
+    "city, zoom 11": (6.3, 6.7, 3.2, 3.6, 11),
+    "district, zoom 14": (6.4, 6.6, 3.3, 3.5, 14),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None, help="existing, already seeded DB")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        seed(engine, args.rows)
+
+    db = sessionmaker(bind=engine)()
+    service = PropertyService()
+    listing_index.rebuild(db)
+
+    def run(viewport):
+        return asyncio.run(service.get_map_markers(db, *viewport))
+
+    print(f"{'viewport':<18}{'listings':>10}{'markers':>9}{'sql ms':>10}{'index ms':>10}")
+    for name, viewport in VIEWPORTS.items():
+        settings.LISTING_INDEX_ENABLED = False
+        view = run(viewport)
+        sql = statistics.median(timed(lambda: run(viewport), args.repeat))
+        settings.LISTING_INDEX_ENABLED = True
+        index = statistics.median(timed(lambda: run(viewport), args.repeat))
+        markers = len(view.get("clusters", ())) + len(view.get("listings", ()))
+        print(f"{name:<18}{view['total']:>10,}{markers:>9}{sql:>10.1f}{index:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Encode time per 1000 listings: the response_model path over ORM objects vs
+Core rows through the precompiled TypeAdapter in app.utils.fieldsets.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 1000
+
+"before" mirrors what FastAPI does for response_model=List[PropertyResponse]:
+validate each ORM object, dump to Python in JSON mode, then json.dumps.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+
+os.environ.setdefault("TESTING", "true")
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.property import Property
+from app.schemas.property import PropertyResponse
+from app.services.property_service import _projection
+from app.utils.fieldsets import FIELDS, encode_properties
+from benchmarks.bench_listing_index import seed, timed
+
+CARD = ("id", "title", "price", "currency", "city", "overview_image", "bedrooms", "bathrooms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    seed(engine, args.rows, agents=10)
+    db = sessionmaker(bind=engine)()
+    response_model = TypeAdapter(list[PropertyResponse])
+
+    def orm_objects():
+        db.expunge_all()
+        return db.execute(select(Property).limit(args.rows)).scalars().all()
+
+    def core_rows(fields=FIELDS):
+        return db.execute(select(*_projection(fields)).limit(args.rows)).all()
+
+    def before_encode(objects):
+        validated = response_model.validate_python(objects, from_attributes=True)
+        content = response_model.dump_python(validated, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    objects, rows, card_rows = orm_objects(), core_rows(), core_rows(CARD)
+    assert json.loads(before_encode(objects)) == json.loads(encode_properties(rows))
+
+    per_k = 1000 / args.rows
+    cases = {
+        "fetch ORM objects": orm_objects,
+        "fetch Core rows": core_rows,
+        "encode: response_model + json": lambda: before_encode(objects),
+        "encode: TypeAdapter from rows": lambda: encode_properties(rows),
+        "encode: card fields only": lambda: encode_properties(card_rows, CARD),
+        "total before": lambda: before_encode(orm_objects()),
+        "total after": lambda: encode_properties(core_rows()),
+    }
+    print(f"{'step (per 1000 listings)':<34}{'median ms':>12}")
+    for name, fn in cases.items():
+        ms = statistics.median(timed(fn, args.repeat)) * per_k
+        print(f"{name:<34}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
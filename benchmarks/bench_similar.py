@@ -0,0 +1,74 @@
+"""
+Latency of the similar-listings lookup behind GET /properties/{id}/similar.
+
+Usage:
+    python -m benchmarks.bench_similar --rows 100000
+
+Synthetic listings are written to a throwaway SQLite file (or DATABASE_URL via
+--url); the feature matrix is built once and top-k lookups for random source
+listings are timed, plus the incremental update of a single row.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("TESTING", "true")
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.property import Property
+from app.services.similar_listings import similar_listings
+from benchmarks.bench_listing_index import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--url", default=None, help="existing, already seeded DB")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        seed(engine, args.rows)
+
+    db = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    similar_listings.rebuild(db)
+    print(
+        f"matrix {len(similar_listings):,} x {similar_listings.dimensions} "
+        f"built in {time.perf_counter() - start:.2f}s"
+    )
+
+    rng = random.Random(7)
+    ids = db.scalars(select(Property.id)).all()
+    sources = db.scalars(
+        select(Property).where(Property.id.in_(rng.sample(ids, 200)))
+    ).all()
+
+    lookups, updates = [], []
+    for i in range(args.lookups):
+        prop = sources[i % len(sources)]
+        start = time.perf_counter()
+        similar_listings.similar_ids(prop, args.k)
+        lookups.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        similar_listings.upsert(prop)
+        updates.append((time.perf_counter() - start) * 1000)
+
+    for name, samples in (("top-k lookup", lookups), ("row update", updates)):
+        p50, p99 = np.percentile(samples, [50, 99])
+        print(f"{name:<14} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()